@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Autômato de Palavras-Chave - Busca de várias palavras-chave numa passada
+Parte da skill organize-pdfs do Claude Code
+
+As palavras de todas as categorias viram uma única trie, compilada como
+uma regex (o motor de regex percorre a trie em C). O texto é comparado sem
+acentos e sem maiúsculas, e só palavras inteiras contam: 'bb' não casa em
+'abbey', 'inter' não casa em 'internet'. Uma palavra terminada em '*' casa
+como prefixo ('hack*' casa 'hacker').
+"""
+
+import re
+import unicodedata
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+
+# Acentos (marcas combinantes) que sobram depois da decomposição NFKD
+_ACENTOS = re.compile('[\u0300-\u036f]')
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sem acentos ('Itaú' -> 'itau', 'm³' -> 'm3')"""
+    texto = texto.lower()
+    if texto.isascii():
+        return texto
+    return _ACENTOS.sub('', unicodedata.normalize('NFKD', texto))
+
+
+class AutomatoPalavras:
+    """Conta, numa passada, as ocorrências das palavras-chave de cada categoria"""
+
+    # Fim de palavra: o próximo caractere não pode continuar a palavra
+    _FIM_LETRA = r'(?![^\W\d_])'
+    _FIM_DIGITO = r'(?!\d)'
+
+    def __init__(self, categorias: Dict[Hashable, Iterable[str]]):
+        """
+        Compila o autômato
+
+        Args:
+            categorias: categoria -> lista de palavras-chave (a ordem das
+                categorias é preservada nos resultados)
+        """
+        self.categorias = list(categorias)
+
+        # palavra normalizada -> categorias que a contêm
+        self.palavras: Dict[str, List[Hashable]] = {}
+        for categoria, palavras in categorias.items():
+            for palavra in palavras:
+                chave = ' '.join(normalizar(palavra).split())
+                if not chave:
+                    continue
+                destino = self.palavras.setdefault(chave, [])
+                if categoria not in destino:
+                    destino.append(categoria)
+
+        self._lista = list(self.palavras)
+        self._implicitas = self._calcular_implicitas()
+        self._regex = re.compile(self._montar_regex())
+
+    def _montar_regex(self) -> str:
+        """Monta a regex em forma de trie; cada folha tem um grupo vazio"""
+        trie = {}
+        for indice, palavra in enumerate(self._lista):
+            no = trie
+            for c in palavra:
+                no = no.setdefault(c, {})
+            no[None] = indice
+
+        def compilar(no) -> str:
+            alternativas = []
+            for c in sorted(k for k in no if k is not None):
+                if c == '*':
+                    continue
+                if c == ' ':
+                    prefixo = r'\s+'
+                else:
+                    prefixo = re.escape(c)
+                alternativas.append(prefixo + compilar(no[c]))
+
+            # Folhas por último: a regex prefere a palavra mais longa. A palavra
+            # inteira vem antes do prefixo ('contrato' antes de 'contrato*'):
+            # o prefixo casaria sempre, e a palavra inteira já o conta (ver
+            # _calcular_implicitas())
+            if None in no:
+                palavra = self._lista[no[None]]
+                ultimo = palavra[-1]
+                fim = self._FIM_DIGITO if ultimo.isdigit() else (self._FIM_LETRA if ultimo.isalpha() else '')
+                alternativas.append('()' + fim)
+                self._grupos.append(no[None])
+            if '*' in no:
+                alternativas.append('()')
+                self._grupos.append(no['*'][None])
+
+            if len(alternativas) == 1:
+                return alternativas[0]
+            return '(?:' + '|'.join(alternativas) + ')'
+
+        # Os grupos são numerados na ordem em que aparecem na regex
+        self._grupos = []
+        padrao = compilar(trie)
+        return padrao
+
+    def _calcular_implicitas(self) -> Dict[int, List[int]]:
+        """
+        Palavras contidas numa palavra mais longa
+
+        A regex devolve só a ocorrência mais longa ('banco inter'); as palavras
+        que começam dentro dela e terminam junto ou antes ('banco', 'inter')
+        são somadas à parte. Uma palavra que começa dentro de outra e termina
+        depois dela não é contada.
+        """
+        implicitas = {}
+        for i, longa in enumerate(self._lista):
+            base = longa.rstrip('*')
+            for j, curta in enumerate(self._lista):
+                if i == j:
+                    continue
+                prefixo = curta.endswith('*')
+                alvo = curta.rstrip('*')
+                inicio = base.find(alvo)
+                while inicio != -1:
+                    fim = inicio + len(alvo)
+                    comeca = inicio == 0 or not _continua_palavra(base[inicio - 1], base[inicio])
+                    if fim == len(base):
+                        termina = prefixo or not longa.endswith('*')
+                    else:
+                        termina = prefixo or not _continua_palavra(base[fim - 1], base[fim])
+                    if comeca and termina:
+                        implicitas.setdefault(i, []).append(j)
+                        break
+                    inicio = base.find(alvo, inicio + 1)
+        return implicitas
+
+    def contar(self, texto: str, normalizado: bool = False) -> Dict[Hashable, Dict[str, int]]:
+        """
+        Conta as ocorrências de cada palavra-chave, agrupadas por categoria
+
+        Args:
+            texto: Texto a analisar
+            normalizado: True se o texto já passou por normalizar()
+
+        Returns:
+            categoria -> {palavra: ocorrências}, só com categorias encontradas,
+            na ordem em que as categorias foram declaradas
+        """
+        if not normalizado:
+            texto = normalizar(texto)
+
+        ocorrencias = {}
+        self._varrer(texto, ocorrencias)
+        return self._por_categoria(ocorrencias)
+
+    def contador(self) -> 'ContagemIncremental':
+        """Contagem para texto que chega em pedaços (ex.: página a página)"""
+        return ContagemIncremental(self)
+
+    def _varrer(self, texto: str, ocorrencias: Dict[int, int], pos: int = 0,
+                limite: Optional[int] = None) -> int:
+        """
+        Soma em ocorrencias as palavras que começam a partir de pos
+
+        Args:
+            limite: Para na primeira ocorrência que começa em limite ou depois
+
+        Returns:
+            Posição de onde a varredura deve continuar
+        """
+        grupos = self._grupos
+
+        while True:
+            reinicio = None
+            for m in self._regex.finditer(texto, pos):
+                inicio = m.start()
+                if limite is not None and inicio >= limite:
+                    return max(pos, limite)
+
+                # Começou no meio de uma palavra: descarta e busca de novo a
+                # partir do caractere seguinte (pode haver palavra dentro)
+                if inicio > 0 and _continua_palavra(texto[inicio - 1], texto[inicio]):
+                    reinicio = inicio + 1
+                    break
+
+                indice = grupos[m.lastindex - 1]
+                ocorrencias[indice] = ocorrencias.get(indice, 0) + 1
+                pos = m.end()
+
+            if reinicio is None:
+                return pos if limite is None else max(pos, limite)
+            pos = reinicio
+
+    def _por_categoria(self, ocorrencias: Dict[int, int]) -> Dict[Hashable, Dict[str, int]]:
+        """Soma as palavras implícitas e agrupa as contagens por categoria"""
+        ocorrencias = dict(ocorrencias)
+        for indice, total in list(ocorrencias.items()):
+            for outro in self._implicitas.get(indice, ()):
+                ocorrencias[outro] = ocorrencias.get(outro, 0) + total
+
+        por_categoria = {}
+        for indice, total in ocorrencias.items():
+            palavra = self._lista[indice]
+            for categoria in self.palavras[palavra]:
+                por_categoria.setdefault(categoria, {})[palavra] = total
+
+        return {c: por_categoria[c] for c in self.categorias if c in por_categoria}
+
+    def categorias_encontradas(self, texto: str, normalizado: bool = False) -> Set[Hashable]:
+        """Categorias com pelo menos uma palavra-chave no texto"""
+        return set(self.contar(texto, normalizado))
+
+
+def _continua_palavra(anterior: str, atual: str) -> bool:
+    """True se os dois caracteres fazem parte da mesma palavra"""
+    return (anterior.isalpha() and atual.isalpha()) or (anterior.isdigit() and atual.isdigit())
+
+
+class ContagemIncremental:
+    """
+    Conta palavras-chave num texto que chega em pedaços, com memória limitada
+
+    Os últimos SOBREPOSICAO caracteres ficam guardados até o próximo pedaço,
+    então uma palavra que atravessa a divisa ('banco do' | 'brasil') é
+    contada uma vez só, como se o texto estivesse inteiro.
+    """
+
+    # Maior trecho que uma ocorrência pode ocupar
+    SOBREPOSICAO = 256
+
+    def __init__(self, automato: AutomatoPalavras):
+        self.automato = automato
+        self._ocorrencias = {}
+        self._buffer = ""
+        self._pos = 0
+
+    def alimentar(self, pedaco: str):
+        """Acrescenta um pedaço de texto (na ordem)"""
+        self._buffer += normalizar(pedaco)
+
+        limite = len(self._buffer) - self.SOBREPOSICAO
+        if limite <= self._pos:
+            return
+
+        retomar = self.automato._varrer(self._buffer, self._ocorrencias, self._pos, limite)
+
+        # Guarda um caractere antes do ponto de retomada (início de palavra)
+        corte = max(retomar - 1, 0)
+        self._buffer = self._buffer[corte:]
+        self._pos = retomar - corte
+
+    def finalizar(self) -> Dict[Hashable, Dict[str, int]]:
+        """Conta o que restou e devolve o mesmo formato de AutomatoPalavras.contar()"""
+        self.automato._varrer(self._buffer, self._ocorrencias, self._pos)
+        self._buffer = ""
+        self._pos = 0
+        return self.automato._por_categoria(self._ocorrencias)
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Mede a vazão do processamento com um corpus sintético
+Parte da skill organize-pdfs do Claude Code
+
+Gera um corpus determinístico (mesma semente -> mesmos arquivos, inclusive
+a data de modificação) com PDFs de texto parecidos com extratos, boletos,
+DANFEs, romaneios e CT-es, com CPFs/CNPJs válidos e inválidos, e arquivos
+que não são PDF. Cada alvo roda num processo separado, então o pico de
+memória medido é só dele. O resultado vai para um JSON que pode ser
+comparado com o de uma rodada anterior.
+
+Uso:
+    python3 benchmark.py [--documentos N] [--semente S] [--repeticoes R] [--saida ARQ]
+    python3 benchmark.py --comparar anterior.json atual.json
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import platform
+import subprocess
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from validacao_documentos import (
+    PESOS_CPF_1, PESOS_CPF_2, PESOS_CNPJ_1, PESOS_CNPJ_2,
+    formatar_cpf, formatar_cnpj
+)
+
+# Alvos medidos (cada um roda em um processo)
+ALVOS = ['pdf_processor', 'importador_universal', 'general_organizer', 'classificacao']
+
+# Data de modificação fixa dos arquivos do corpus (2025-01-15)
+MTIME_CORPUS = 1736942400
+
+BANCOS = ['Itaú Unibanco', 'Banco Bradesco', 'Banco do Brasil', 'Caixa Econômica Federal',
+          'Santander', 'Nubank', 'Banco Inter', 'Sicoob', 'Sicredi', 'Banco Safra']
+NOMES = ['Anderson Enside', 'Maria Souza', 'João Pereira', 'Madeireira Paraná Ltda',
+         'Transportes Rápido Sul', 'Comércio de Madeiras Araucária']
+CIDADES = ['Curitiba/PR', 'Ponta Grossa/PR', 'Guarapuava/PR', 'Lages/SC', 'São Paulo/SP']
+
+
+# ═══════════════════════════════════════════════════
+# CORPUS
+# ═══════════════════════════════════════════════════
+
+def _digito_cpf(digitos: List[int], pesos) -> int:
+    return (sum(d * p for d, p in zip(digitos, pesos)) * 10 % 11) % 10
+
+
+def _digito_cnpj(digitos: List[int], pesos) -> int:
+    resto = sum(d * p for d, p in zip(digitos, pesos)) % 11
+    return 0 if resto < 2 else 11 - resto
+
+
+def gerar_cpf(rnd: random.Random, valido: bool = True) -> str:
+    """CPF formatado; se não for válido, o último dígito está errado"""
+    d = [rnd.randrange(10) for _ in range(9)]
+    d.append(_digito_cpf(d, PESOS_CPF_1))
+    d.append(_digito_cpf(d, PESOS_CPF_2))
+    if not valido:
+        d[10] = (d[10] + 1 + rnd.randrange(9)) % 10
+    return formatar_cpf(''.join(map(str, d)))
+
+
+def gerar_cnpj(rnd: random.Random, valido: bool = True) -> str:
+    """CNPJ formatado (matriz 0001); se não for válido, o último dígito está errado"""
+    d = [rnd.randrange(10) for _ in range(8)] + [0, 0, 0, 1]
+    d.append(_digito_cnpj(d, PESOS_CNPJ_1))
+    d.append(_digito_cnpj(d, PESOS_CNPJ_2))
+    if not valido:
+        d[13] = (d[13] + 1 + rnd.randrange(9)) % 10
+    return formatar_cnpj(''.join(map(str, d)))
+
+
+def _valor(rnd: random.Random, maximo: int = 50000) -> str:
+    inteiro = rnd.randrange(1, maximo)
+    return f"{inteiro:,}".replace(',', '.') + f",{rnd.randrange(100):02d}"
+
+
+def _data(rnd: random.Random) -> str:
+    return f"{rnd.randrange(1, 29):02d}/{rnd.randrange(1, 13):02d}/2025"
+
+
+def _documento(rnd: random.Random) -> str:
+    """CPF ou CNPJ, válido na maior parte das vezes"""
+    valido = rnd.random() < 0.8
+    return gerar_cpf(rnd, valido) if rnd.random() < 0.5 else gerar_cnpj(rnd, valido)
+
+
+def _paginas_extrato(rnd: random.Random) -> List[str]:
+    banco = rnd.choice(BANCOS)
+    paginas = []
+    for p in range(rnd.randrange(1, 6)):
+        linhas = [f"{banco} - Extrato de conta corrente", f"Cliente: {rnd.choice(NOMES)}",
+                  f"CPF/CNPJ: {_documento(rnd)}", f"Página {p + 1}", "Data Lançamentos Valor Saldo"]
+        for _ in range(rnd.randrange(20, 45)):
+            linhas.append(f"{_data(rnd)} {rnd.choice(['PIX RECEBIDO', 'PIX ENVIADO', 'TED', 'TARIFA', 'BOLETO PAGO'])}"
+                          f" {rnd.choice(NOMES)} R$ {_valor(rnd, 9000)} {_valor(rnd)}")
+        linhas.append(f"Saldo em {_data(rnd)}: R$ {_valor(rnd)}")
+        paginas.append("\n".join(linhas))
+    return paginas
+
+
+def _paginas_boleto(rnd: random.Random) -> List[str]:
+    linha = ' '.join(''.join(str(rnd.randrange(10)) for _ in range(n)) for n in (5, 5, 5, 6, 5, 6, 1, 14))
+    return ["\n".join([
+        f"{rnd.choice(BANCOS)}", "Boleto bancário - Recibo do pagador",
+        f"Beneficiário: {rnd.choice(NOMES)} CNPJ {gerar_cnpj(rnd, rnd.random() < 0.9)}",
+        f"Pagador: {rnd.choice(NOMES)} CPF {gerar_cpf(rnd, rnd.random() < 0.9)}",
+        f"Vencimento {_data(rnd)}", f"Valor do documento R$ {_valor(rnd, 5000)}",
+        f"Linha digitável: {linha}", "Código de barras", "Autenticação mecânica"
+    ])]
+
+
+def _paginas_danfe(rnd: random.Random) -> List[str]:
+    linhas = ["DANFE - Documento Auxiliar da Nota Fiscal Eletrônica", "NF-e Nº " + str(rnd.randrange(1, 99999)),
+              f"Emitente: {rnd.choice(NOMES)} CNPJ {gerar_cnpj(rnd, rnd.random() < 0.9)}",
+              f"Destinatário: {rnd.choice(NOMES)} CNPJ/CPF {_documento(rnd)}",
+              f"Data de emissão {_data(rnd)}", f"{rnd.choice(CIDADES)}"]
+    for _ in range(rnd.randrange(3, 25)):
+        linhas.append(f"Madeira serrada pinus {rnd.randrange(1, 40)},{rnd.randrange(100):02d} m³ "
+                      f"R$ {_valor(rnd, 3000)}")
+    linhas.append(f"Valor total da nota R$ {_valor(rnd, 90000)}")
+    return ["\n".join(linhas)]
+
+
+def _paginas_romaneio(rnd: random.Random) -> List[str]:
+    linhas = ["ROMANEIO DE CARGA - MADEIRA EM TORA", f"Fornecedor: {rnd.choice(NOMES)}",
+              f"CNPJ {gerar_cnpj(rnd, rnd.random() < 0.9)}", f"Data {_data(rnd)}",
+              "Tora Diâmetro Comprimento Cubagem m3"]
+    for i in range(rnd.randrange(15, 60)):
+        linhas.append(f"{i + 1} {rnd.randrange(20, 80)} cm {rnd.randrange(2, 6)},{rnd.randrange(10):d}0 m "
+                      f"{rnd.randrange(0, 3)},{rnd.randrange(1000):03d} m3")
+    linhas.append(f"Total cubagem {rnd.randrange(20, 60)},{rnd.randrange(1000):03d} m³")
+    return ["\n".join(linhas)]
+
+
+def _paginas_cte(rnd: random.Random) -> List[str]:
+    return ["\n".join([
+        "DACTE - Conhecimento de Transporte Eletrônico", f"CT-e Nº {rnd.randrange(1, 99999)}",
+        f"Transportadora: {rnd.choice(NOMES)} CNPJ {gerar_cnpj(rnd, rnd.random() < 0.9)}",
+        f"Remetente: {rnd.choice(NOMES)} {_documento(rnd)}",
+        f"Motorista: {rnd.choice(NOMES)} CPF {gerar_cpf(rnd, rnd.random() < 0.9)}",
+        f"Origem {rnd.choice(CIDADES)} Destino {rnd.choice(CIDADES)}",
+        f"Carga: madeira serrada Peso {rnd.randrange(5000, 40000)} kg",
+        f"Valor do frete R$ {_valor(rnd, 15000)}", f"Data {_data(rnd)}"
+    ])]
+
+
+MODELOS_PDF = {
+    'extrato': _paginas_extrato,
+    'boleto': _paginas_boleto,
+    'danfe': _paginas_danfe,
+    'romaneio': _paginas_romaneio,
+    'cte': _paginas_cte,
+}
+
+
+def pdf_texto(paginas: List[str]) -> bytes:
+    """PDF mínimo com uma página de texto (Helvetica) por item"""
+    def escapar(linha: str) -> str:
+        return linha.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    n = len(paginas)
+    objetos = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(n))}] /Count {n} >>".encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    for i, texto in enumerate(paginas):
+        ops = ['BT', '/F1 9 Tf', '11 TL', '30 810 Td']
+        ops += [f'({escapar(linha)}) Tj T*' for linha in texto.split('\n')]
+        ops.append('ET')
+        conteudo = '\n'.join(ops).encode('cp1252', errors='replace')
+        objetos.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>'.encode())
+        objetos.append(b'<< /Length %d >>\nstream\n' % len(conteudo) + conteudo + b'\nendstream')
+
+    saida = bytearray(b'%PDF-1.4\n')
+    posicoes = []
+    for i, objeto in enumerate(objetos):
+        posicoes.append(len(saida))
+        saida += f'{i + 1} 0 obj\n'.encode() + objeto + b'\nendobj\n'
+    xref = len(saida)
+    saida += f'xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n'.encode()
+    for posicao in posicoes:
+        saida += f'{posicao:010d} 00000 n \n'.encode()
+    saida += f'trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return bytes(saida)
+
+
+def _outro_arquivo(rnd: random.Random, i: int):
+    """Arquivo que não é PDF: (nome, conteúdo)"""
+    tipo = rnd.choice(['txt', 'csv', 'log', 'py', 'jpg', 'mp4', 'zip', 'xlsx'])
+    if tipo == 'txt':
+        return f"anotacao_{i}.txt", f"Comprovante PIX para {rnd.choice(NOMES)} R$ {_valor(rnd)}\n".encode()
+    if tipo == 'csv':
+        linhas = ["nome;cpf;valor"] + [f"{rnd.choice(NOMES)};{gerar_cpf(rnd, rnd.random() < 0.9)};{_valor(rnd)}"
+                                         for _ in range(rnd.randrange(10, 200))]
+        return f"cadastro_cliente_{i}.csv", "\n".join(linhas).encode('utf-8')
+    if tipo == 'log':
+        linhas = [f"2025-01-{rnd.randrange(1, 29):02d} {rnd.choice(['ok', 'failed login', 'blocked', 'GET /'])} "
+                  f"10.0.{rnd.randrange(256)}.{rnd.randrange(256)}" for _ in range(rnd.randrange(50, 400))]
+        return f"acesso_{i}.log", "\n".join(linhas).encode()
+    if tipo == 'py':
+        return f"script_{i}.py", b"import os\nprint(os.getcwd())\n" * rnd.randrange(1, 50)
+    nome = {'jpg': f"Screenshot_{i}.jpg", 'mp4': f"reuniao_{i}.mp4",
+            'zip': f"backup_{i}.zip", 'xlsx': f"fluxo_caixa_{i}.xlsx"}[tipo]
+    return nome, rnd.randbytes(rnd.randrange(1024, 64 * 1024))
+
+
+def gerar_corpus(pasta: Path, documentos: int = 200, semente: int = 42) -> Dict:
+    """
+    Gera o corpus sintético (determinístico)
+
+    Args:
+        pasta: Pasta de saída (criada se não existir)
+        documentos: Número de arquivos (~75% PDFs)
+        semente: Semente do gerador
+
+    Returns:
+        Resumo: total, pdfs, paginas e contagem por modelo
+    """
+    rnd = random.Random(semente)
+    pasta.mkdir(parents=True, exist_ok=True)
+    resumo = {'arquivos': documentos, 'pdfs': 0, 'paginas': 0, 'por_modelo': {}}
+
+    for i in range(documentos):
+        if rnd.random() < 0.75:
+            modelo = rnd.choice(list(MODELOS_PDF))
+            paginas = MODELOS_PDF[modelo](rnd)
+            nome, conteudo = f"{modelo}_{i:05d}.pdf", pdf_texto(paginas)
+            resumo['pdfs'] += 1
+            resumo['paginas'] += len(paginas)
+        else:
+            modelo = 'outro'
+            nome, conteudo = _outro_arquivo(rnd, i)
+
+        resumo['por_modelo'][modelo] = resumo['por_modelo'].get(modelo, 0) + 1
+        caminho = pasta / nome
+        caminho.write_bytes(conteudo)
+        os.utime(caminho, (MTIME_CORPUS, MTIME_CORPUS))
+
+    return resumo
+
+
+# ═══════════════════════════════════════════════════
+# MEDIÇÃO
+# ═══════════════════════════════════════════════════
+
+def _pico_rss_mb():
+    """Pico de memória residente do processo (MB)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux devolve KB; macOS, bytes
+    return round(pico / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    """Percentil por posto mais próximo"""
+    if not ordenados:
+        return 0.0
+    indice = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados) + 0.5)) - 1))
+    return ordenados[indice]
+
+
+def medir_alvo(alvo: str, pasta: Path, repeticoes: int = 1) -> Dict:
+    """
+    Mede um alvo no processo atual
+
+    Returns:
+        documentos, paginas, segundos, vazão, latências (ms) e pico de RSS
+    """
+    arquivos = sorted(p for p in pasta.iterdir() if p.is_file())
+
+    if alvo == 'pdf_processor':
+        from pdf_processor import PDFProcessor
+        arquivos = [a for a in arquivos if a.suffix == '.pdf']
+
+        def executar(arquivo):
+            return PDFProcessor(str(arquivo)).processar().get('paginas_lidas', 0)
+    elif alvo == 'importador_universal':
+        from importador_universal import ImportadorUniversal
+        importador = ImportadorUniversal(pasta)
+
+        def executar(arquivo):
+            importador.analisar_arquivo(arquivo)
+            return 0
+    elif alvo == 'general_organizer':
+        from general_organizer import GeneralOrganizer
+
+        def executar(arquivo):
+            GeneralOrganizer(str(arquivo)).determinar_destino()
+            return 0
+    elif alvo == 'classificacao':
+        from classificacao import classificar, ler_amostra
+        # Nome, tamanho e amostra lidos antes: mede só o custo de classificar()
+        arquivos = [(a.name, a.stat().st_size, ler_amostra(a)) for a in arquivos]
+
+        def executar(entrada):
+            classificar(*entrada)
+            return 0
+    else:
+        raise ValueError(f"Alvo desconhecido: {alvo}")
+
+    # Aquecimento: imports preguiçosos e autômatos compilados fora da medição
+    if arquivos:
+        executar(arquivos[0])
+
+    latencias = []
+    paginas = 0
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for arquivo in arquivos:
+            t0 = time.perf_counter()
+            paginas += executar(arquivo)
+            latencias.append(time.perf_counter() - t0)
+    segundos = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'documentos': len(latencias),
+        'paginas': paginas,
+        'segundos': round(segundos, 4),
+        'documentos_por_s': round(len(latencias) / segundos, 2) if segundos else None,
+        'paginas_por_s': round(paginas / segundos, 2) if segundos and paginas else None,
+        'latencia_ms': {
+            'p50': round(_percentil(latencias, 50) * 1000, 3),
+            'p99': round(_percentil(latencias, 99) * 1000, 3),
+            'max': round(latencias[-1] * 1000, 3) if latencias else 0.0
+        },
+        'pico_rss_mb': _pico_rss_mb()
+    }
+
+
+def _commit_atual():
+    """Commit do git do diretório dos scripts (None fora de um repositório)"""
+    try:
+        saida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+                               capture_output=True, text=True, timeout=10)
+        return saida.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def executar_benchmark(documentos: int = 200, semente: int = 42, repeticoes: int = 1,
+                       alvos: List[str] = None, pasta_corpus: str = None) -> Dict:
+    """Gera o corpus e mede cada alvo em um processo separado"""
+    from validacao_documentos import TEM_NUMPY
+
+    with tempfile.TemporaryDirectory(prefix='enside_bench_') as temporaria:
+        pasta = Path(pasta_corpus) if pasta_corpus else Path(temporaria)
+        print(f"📦 Gerando corpus ({documentos} arquivos, semente {semente}) em {pasta}", file=sys.stderr)
+        corpus = gerar_corpus(pasta, documentos, semente)
+
+        resultados = {}
+        for alvo in alvos or ALVOS:
+            print(f"⏱️  Medindo {alvo}...", file=sys.stderr)
+            processo = subprocess.run(
+                [sys.executable, __file__, '--alvo', alvo, '--corpus', str(pasta),
+                 '--repeticoes', str(repeticoes)],
+                capture_output=True, text=True
+            )
+            if processo.returncode != 0:
+                print(processo.stderr, file=sys.stderr)
+                resultados[alvo] = {'erro': processo.stderr.strip().splitlines()[-1:]}
+                continue
+            resultados[alvo] = json.loads(processo.stdout)
+
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_atual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'numpy': TEM_NUMPY,
+        'semente': semente,
+        'repeticoes': repeticoes,
+        'corpus': corpus,
+        'resultados': resultados
+    }
+
+
+def comparar(anterior: Dict, atual: Dict):
+    """Imprime a variação de vazão e latência entre duas rodadas"""
+    print(f"{'alvo':<22} {'docs/s':>22} {'p50 ms':>22} {'p99 ms':>22}")
+
+    def variacao(a, b):
+        if not a or b is None:
+            return f"{b}"
+        return f"{a:.4g} → {b:.4g} ({(b - a) / a * 100:+.0f}%)"
+
+    for alvo, atual_alvo in atual['resultados'].items():
+        anterior_alvo = anterior['resultados'].get(alvo)
+        if not anterior_alvo or 'erro' in anterior_alvo or 'erro' in atual_alvo:
+            continue
+        print(f"{alvo:<22} "
+              f"{variacao(anterior_alvo['documentos_por_s'], atual_alvo['documentos_por_s']):>22} "
+              f"{variacao(anterior_alvo['latencia_ms']['p50'], atual_alvo['latencia_ms']['p50']):>22} "
+              f"{variacao(anterior_alvo['latencia_ms']['p99'], atual_alvo['latencia_ms']['p99']):>22}")
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark com corpus sintético de documentos')
+    parser.add_argument('--documentos', type=int, default=200, help='Arquivos no corpus (padrão: 200)')
+    parser.add_argument('--semente', type=int, default=42, help='Semente do corpus (padrão: 42)')
+    parser.add_argument('--repeticoes', type=int, default=1, help='Passadas pelo corpus por alvo')
+    parser.add_argument('--alvos', nargs='+', choices=ALVOS, help='Alvos a medir (padrão: todos)')
+    parser.add_argument('--corpus', help='Pasta do corpus (padrão: temporária)')
+    parser.add_argument('--saida', help='Arquivo JSON de resultado (padrão: stdout)')
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTERIOR', 'ATUAL'),
+                        help='Comparar dois resultados salvos')
+    parser.add_argument('--alvo', choices=ALVOS, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.comparar:
+        with open(args.comparar[0], encoding='utf-8') as a, open(args.comparar[1], encoding='utf-8') as b:
+            comparar(json.load(a), json.load(b))
+        return
+
+    # Processo filho: mede um alvo num corpus já gerado
+    if args.alvo:
+        print(json.dumps(medir_alvo(args.alvo, Path(args.corpus), args.repeticoes)))
+        return
+
+    resultado = executar_benchmark(args.documentos, args.semente, args.repeticoes,
+                                   args.alvos, args.corpus)
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+
+    if args.saida:
+        Path(args.saida).write_text(texto + "\n", encoding='utf-8')
+        print(f"✅ Resultado salvo em {args.saida}", file=sys.stderr)
+    else:
+        print(texto)
+
+    for alvo, r in resultado['resultados'].items():
+        if 'erro' not in r:
+            print(f"   {alvo}: {r['documentos_por_s']} docs/s, p50 {r['latencia_ms']['p50']} ms, "
+                  f"p99 {r['latencia_ms']['p99']} ms, pico {r['pico_rss_mb']} MB", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Cache de Extração - Guarda texto e informações já extraídas de PDFs
+Parte da skill organize-pdfs do Claude Code
+
+A chave é o hash SHA-256 do conteúdo + versão do extrator, então um PDF
+que não mudou nunca é reprocessado. Resultados negativos (PDF protegido,
+sem texto, erro de leitura) também são guardados.
+"""
+
+import json
+import hashlib
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+# Local padrão do cache
+CACHE_PADRAO = Path.home() / ".cache" / "enside" / "extracao_pdf.sqlite"
+
+# Tamanho máximo padrão (texto comprimido + info)
+MAX_BYTES_PADRAO = 512 * 1024 * 1024
+
+
+class CacheExtracao:
+    """Cache persistente (SQLite) de resultados do PDFProcessor"""
+
+    # Bloco de leitura para o hash
+    BLOCO_HASH = 1024 * 1024
+
+    # Verificar o limite de tamanho a cada N gravações
+    INTERVALO_LIMPEZA = 64
+
+    def __init__(self, caminho: Optional[str] = None, max_bytes: int = MAX_BYTES_PADRAO):
+        """
+        Abre (ou cria) o cache
+
+        Args:
+            caminho: Arquivo SQLite (padrão: ~/.cache/enside/extracao_pdf.sqlite)
+            max_bytes: Tamanho máximo; os itens menos usados são removidos
+        """
+        self.caminho = Path(caminho) if caminho else CACHE_PADRAO
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._gravacoes = 0
+
+        # Vários workers do modo lote podem abrir o mesmo arquivo
+        self.conn = sqlite3.connect(str(self.caminho), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS extracoes (
+                hash TEXT NOT NULL,
+                versao TEXT NOT NULL,
+                texto BLOB,
+                info TEXT NOT NULL,
+                erro TEXT,
+                tamanho INTEGER NOT NULL,
+                acesso REAL NOT NULL,
+                PRIMARY KEY (hash, versao)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_acesso ON extracoes (acesso)")
+        self.conn.commit()
+
+    @classmethod
+    def hash_arquivo(cls, caminho) -> str:
+        """Calcula o SHA-256 do conteúdo do arquivo"""
+        h = hashlib.sha256()
+        with open(caminho, 'rb') as f:
+            while True:
+                bloco = f.read(cls.BLOCO_HASH)
+                if not bloco:
+                    break
+                h.update(bloco)
+        return h.hexdigest()
+
+    def obter(self, hash_conteudo: str, versao: str) -> Optional[Dict]:
+        """
+        Busca um resultado no cache
+
+        Returns:
+            Dict com 'texto', 'info' e 'erro', ou None se não houver
+        """
+        linha = self.conn.execute(
+            "SELECT texto, info, erro FROM extracoes WHERE hash = ? AND versao = ?",
+            (hash_conteudo, versao)
+        ).fetchone()
+
+        if linha is None:
+            return None
+
+        self.conn.execute(
+            "UPDATE extracoes SET acesso = ? WHERE hash = ? AND versao = ?",
+            (time.time(), hash_conteudo, versao)
+        )
+        self.conn.commit()
+
+        texto, info, erro = linha
+        return {
+            'texto': zlib.decompress(texto).decode('utf-8') if texto else "",
+            'info': json.loads(info),
+            'erro': erro
+        }
+
+    def gravar(self, hash_conteudo: str, versao: str, texto: str, info: Dict,
+               erro: Optional[str] = None):
+        """
+        Grava um resultado (positivo ou negativo) no cache
+
+        Args:
+            hash_conteudo: Hash do conteúdo do PDF
+            versao: Versão do extrator
+            texto: Texto extraído ("" para resultados negativos)
+            info: Informações derivadas (cpfs, cnpjs, banco, ...)
+            erro: Motivo da falha, se houver
+        """
+        texto_comprimido = zlib.compress(texto.encode('utf-8')) if texto else None
+        info_json = json.dumps(info, ensure_ascii=False)
+        tamanho = len(texto_comprimido or b'') + len(info_json)
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO extracoes (hash, versao, texto, info, erro, tamanho, acesso) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (hash_conteudo, versao, texto_comprimido, info_json, erro, tamanho, time.time())
+        )
+        self.conn.commit()
+
+        self._gravacoes += 1
+        if self._gravacoes % self.INTERVALO_LIMPEZA == 1:
+            self.limpar()
+
+    def tamanho_total(self) -> int:
+        """Tamanho total ocupado pelos itens do cache"""
+        return self.conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM extracoes").fetchone()[0]
+
+    def limpar(self) -> int:
+        """
+        Remove os itens menos usados até o cache caber em 90% do limite
+
+        Returns:
+            Número de itens removidos
+        """
+        total = self.tamanho_total()
+        if total <= self.max_bytes:
+            return 0
+
+        excesso = total - int(self.max_bytes * 0.9)
+        liberado = 0
+        remover = []
+        cursor = self.conn.execute("SELECT hash, versao, tamanho FROM extracoes ORDER BY acesso")
+        for hash_conteudo, versao, tamanho in cursor:
+            remover.append((hash_conteudo, versao))
+            liberado += tamanho
+            if liberado >= excesso:
+                break
+
+        self.conn.executemany("DELETE FROM extracoes WHERE hash = ? AND versao = ?", remover)
+        self.conn.commit()
+        return len(remover)
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conn.close()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Cadastro de Pessoas - De qual pessoa/empresa é cada CPF/CNPJ
+Parte da skill organize-pdfs do Claude Code
+
+Guarda CPF/CNPJ -> pasta de triagem num arquivo binário compacto, aberto
+com mmap (carrega em milissegundos, mesmo com milhares de cadastros):
+
+    cabeçalho | chaves (uint64, ordenadas) | pasta de cada chave (uint32)
+              | início de cada nome de pasta (uint32) | nomes (UTF-8)
+
+A chave é o número do documento * 2 (+ 1 para CNPJ), para CPF e CNPJ
+com os mesmos dígitos não se confundirem; a consulta é uma busca binária
+nas chaves. O arquivo é gerado a partir das planilhas de cadastro:
+
+    python3 cadastro_pessoas.py importar clientes.xlsx fornecedores.csv
+    python3 cadastro_pessoas.py consultar 529.982.247-25
+"""
+
+import bisect
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from validacao_documentos import (formatar_cnpj, formatar_cpf, ler_linhas_planilha, somente_digitos,
+                                  validar_documentos)
+
+# Local padrão do cadastro (pode ser trocado com ENSIDE_CADASTRO)
+CADASTRO_PADRAO = Path.home() / ".cache" / "enside" / "cadastro_pessoas.bin"
+
+# Cabeçalho: marca, versão, número de chaves, número de pastas (ocupa 32 bytes)
+_CABECALHO = struct.Struct('<8sIII')
+_TAMANHO_CABECALHO = 32
+_MARCA = b'ENSCAD\0\0'
+_VERSAO = 1
+
+# Nomes de coluna procurados na importação (comparados sem acento e em minúsculas)
+COLUNAS_DOCUMENTO = ('cpf', 'cnpj', 'cpf/cnpj', 'cpf_cnpj', 'documento', 'doc')
+COLUNAS_NOME = ('nome', 'razao social', 'razao_social', 'cliente', 'fornecedor', 'empresa')
+COLUNAS_PASTA = ('pasta',)
+
+
+def caminho_cadastro() -> Path:
+    """Caminho do cadastro"""
+    return Path(os.environ.get('ENSIDE_CADASTRO', CADASTRO_PADRAO))
+
+
+def chave_documento(documento) -> Optional[int]:
+    """Chave de um CPF (11 dígitos) ou CNPJ (14 dígitos), com ou sem pontuação"""
+    digitos = somente_digitos(documento)
+    if len(digitos) == 11:
+        return int(digitos) * 2
+    if len(digitos) == 14:
+        return int(digitos) * 2 + 1
+    return None
+
+
+def documento_da_chave(chave: int) -> str:
+    """CPF/CNPJ formatado a partir da chave"""
+    numero, cnpj = divmod(chave, 2)
+    return formatar_cnpj(str(numero).zfill(14)) if cnpj else formatar_cpf(str(numero).zfill(11))
+
+
+def _sem_acento(texto: str) -> str:
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+
+
+def _limpar_pasta(texto) -> str:
+    """Só letras, números e '_' (sem '/', '..' nem acentos): a pasta fica dentro da triagem"""
+    return re.sub(r'[^A-Za-z0-9]+', '_', _sem_acento(str(texto or ''))).strip('_')
+
+
+def nome_pasta(documento: str, nome: str) -> str:
+    """Pasta de triagem de um cadastro: 'João da Silva' -> 'CPF_JOAO_DA_SILVA'"""
+    prefixo = 'CNPJ' if len(somente_digitos(documento)) == 14 else 'CPF'
+    nome = _limpar_pasta(nome).upper()
+    return f"{prefixo}_{nome or somente_digitos(documento)}"
+
+
+class CadastroPessoas:
+    """Cadastro CPF/CNPJ -> pasta de triagem, lido do disco com mmap"""
+
+    def __init__(self, caminho: Optional[str] = None):
+        """
+        Abre o cadastro (um cadastro inexistente fica vazio)
+
+        Args:
+            caminho: Arquivo do cadastro (padrão: ~/.cache/enside/cadastro_pessoas.bin)
+        """
+        self.caminho = Path(caminho) if caminho else caminho_cadastro()
+        self._mmap = None
+        self._chaves = self._pastas = self._inicios = None
+        self._nomes = b''
+        self._cache_nomes: Dict[int, str] = {}
+        # Identidade do arquivo aberto (ver cadastro_padrao()); None se não existe
+        self.assinatura: Optional[Tuple[int, int, int]] = None
+
+        try:
+            with open(self.caminho, 'rb') as f:
+                self.assinatura = _assinatura(os.fstat(f.fileno()))
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # Sem arquivo (ou arquivo vazio): nenhum cadastro
+            return
+
+        marca, versao, n_chaves, n_pastas = _CABECALHO.unpack_from(self._mmap, 0)
+        if marca != _MARCA or versao != _VERSAO:
+            self.fechar()
+            raise ValueError(f"{self.caminho} não é um cadastro de pessoas (versão {_VERSAO})")
+
+        memoria = memoryview(self._mmap)
+        posicao = _TAMANHO_CABECALHO
+        self._chaves = memoria[posicao:posicao + 8 * n_chaves].cast('Q')
+        posicao += 8 * n_chaves
+        self._pastas = memoria[posicao:posicao + 4 * n_chaves].cast('I')
+        posicao += 4 * n_chaves
+        self._inicios = memoria[posicao:posicao + 4 * (n_pastas + 1)].cast('I')
+        posicao += 4 * (n_pastas + 1)
+        self._nomes = memoria[posicao:]
+
+    def __len__(self) -> int:
+        return len(self._chaves) if self._chaves is not None else 0
+
+    def pasta(self, documento) -> Optional[str]:
+        """Pasta de triagem do dono do CPF/CNPJ (None se não estiver cadastrado)"""
+        if not len(self):
+            return None
+        chave = chave_documento(documento)
+        if chave is None:
+            return None
+        posicao = bisect.bisect_left(self._chaves, chave)
+        if posicao == len(self._chaves) or self._chaves[posicao] != chave:
+            return None
+        return self._nome(self._pastas[posicao])
+
+    def _nome(self, indice: int) -> str:
+        nome = self._cache_nomes.get(indice)
+        if nome is None:
+            nome = bytes(self._nomes[self._inicios[indice]:self._inicios[indice + 1]]).decode('utf-8')
+            self._cache_nomes[indice] = nome
+        return nome
+
+    def entradas(self) -> Iterator[Tuple[str, str]]:
+        """(documento formatado, pasta) de todos os cadastros, em ordem de chave"""
+        for posicao in range(len(self)):
+            yield documento_da_chave(self._chaves[posicao]), self._nome(self._pastas[posicao])
+
+    def como_dict(self) -> Dict[int, str]:
+        """{chave: pasta} de todos os cadastros"""
+        return {self._chaves[p]: self._nome(self._pastas[p]) for p in range(len(self))}
+
+    @staticmethod
+    def gravar(caminho, cadastros: Dict[int, str]):
+        """Grava {chave: pasta} no formato do cadastro (troca o arquivo de uma vez)"""
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+
+        chaves = array('Q', sorted(cadastros))
+        indices: Dict[str, int] = {}
+        pastas = array('I', (indices.setdefault(cadastros[c], len(indices)) for c in chaves))
+        nomes = [nome.encode('utf-8') for nome in indices]  # na ordem dos índices
+        inicios = array('I', [0])
+        for nome in nomes:
+            inicios.append(inicios[-1] + len(nome))
+
+        temporario = caminho.with_name(caminho.name + '.tmp')
+        with open(temporario, 'wb') as f:
+            f.write(_CABECALHO.pack(_MARCA, _VERSAO, len(chaves), len(nomes)).ljust(_TAMANHO_CABECALHO, b'\0'))
+            f.write(chaves.tobytes())
+            f.write(pastas.tobytes())
+            f.write(inicios.tobytes())
+            f.write(b''.join(nomes))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+
+    def fechar(self):
+        """Libera o mmap"""
+        for visao in (self._chaves, self._pastas, self._inicios, self._nomes):
+            if isinstance(visao, memoryview):
+                visao.release()
+        self._chaves = self._pastas = self._inicios = None
+        self._nomes = b''
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def _achar_coluna(colunas, pedida: Optional[str], candidatas: Tuple[str, ...]) -> Optional[str]:
+    """Coluna pedida ou a primeira cujo nome (sem acento, minúsculo) está em candidatas"""
+    if pedida:
+        if pedida not in colunas:
+            raise ValueError(f"Coluna '{pedida}' não encontrada (colunas: {', '.join(colunas)})")
+        return pedida
+    for coluna in colunas:
+        if _sem_acento(str(coluna)).strip().lower() in candidatas:
+            return coluna
+    return None
+
+
+def importar_planilhas(arquivos: Iterable, caminho: Optional[str] = None,
+                       coluna_documento: Optional[str] = None, coluna_nome: Optional[str] = None,
+                       coluna_pasta: Optional[str] = None, substituir: bool = False) -> Dict[str, int]:
+    """
+    Acrescenta ao cadastro os CPFs/CNPJs das planilhas (.csv, .xlsx)
+
+    A pasta de cada documento vem da coluna de pasta, se houver (limpa como
+    em nome_pasta(): caminhos absolutos ou '..' não saem da triagem), ou do
+    nome (ver nome_pasta()). Documentos inválidos são ignorados; um documento
+    repetido fica com a última pasta lida.
+
+    Args:
+        arquivos: Planilhas de cadastro
+        caminho: Arquivo do cadastro (padrão: caminho_cadastro())
+        coluna_documento, coluna_nome, coluna_pasta: Nomes das colunas (padrão:
+            procuradas em COLUNAS_DOCUMENTO, COLUNAS_NOME e COLUNAS_PASTA)
+        substituir: Descartar o cadastro atual em vez de acrescentar
+
+    Returns:
+        {'lidos', 'invalidos', 'alterados', 'total'}
+    """
+    caminho = Path(caminho) if caminho else caminho_cadastro()
+
+    cadastros: Dict[int, str] = {}
+    if not substituir:
+        atual = CadastroPessoas(caminho)
+        cadastros = atual.como_dict()
+        atual.fechar()
+
+    contagem = {'lidos': 0, 'invalidos': 0, 'alterados': 0}
+    for arquivo in arquivos:
+        colunas, linhas = ler_linhas_planilha(Path(arquivo))
+        col_documento = _achar_coluna(colunas, coluna_documento, COLUNAS_DOCUMENTO)
+        if col_documento is None:
+            raise ValueError(f"{arquivo}: coluna de CPF/CNPJ não encontrada (use --coluna-documento)")
+        col_nome = _achar_coluna(colunas, coluna_nome, COLUNAS_NOME)
+        col_pasta = _achar_coluna(colunas, coluna_pasta, COLUNAS_PASTA)
+
+        linhas = [linha for linha in linhas if linha.get(col_documento) not in (None, '')]
+        contagem['lidos'] += len(linhas)
+        validacoes = validar_documentos([linha[col_documento] for linha in linhas])
+
+        for linha, validacao in zip(linhas, validacoes):
+            if not validacao['valido']:
+                contagem['invalidos'] += 1
+                continue
+            documento = validacao['formatado']
+            pasta = _limpar_pasta(linha.get(col_pasta)) if col_pasta else None
+            pasta = pasta or nome_pasta(documento, linha.get(col_nome) if col_nome else '')
+            chave = chave_documento(documento)
+            if cadastros.get(chave) != pasta:
+                contagem['alterados'] += 1
+                cadastros[chave] = pasta
+
+    CadastroPessoas.gravar(caminho, cadastros)
+    contagem['total'] = len(cadastros)
+    return contagem
+
+
+# Cadastro compartilhado pelos organizadores
+_cadastro = None
+_lock_cadastro = threading.Lock()
+
+
+def _assinatura(st) -> Tuple[int, int, int]:
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def cadastro_padrao() -> CadastroPessoas:
+    """
+    Cadastro padrão do processo (aberto na primeira consulta)
+
+    Um stat por chamada: se o arquivo foi trocado (ex.: `importar` com o
+    daemon rodando), o cadastro novo é aberto. O antigo não é fechado aqui;
+    quem ainda o usa continua com ele até soltá-lo.
+    """
+    global _cadastro
+    try:
+        assinatura = _assinatura(os.stat(caminho_cadastro()))
+    except FileNotFoundError:
+        assinatura = None
+    with _lock_cadastro:
+        if _cadastro is None or _cadastro.assinatura != assinatura:
+            _cadastro = CadastroPessoas()
+        return _cadastro
+
+
+def main():
+    """Função principal"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Cadastro CPF/CNPJ -> pasta de triagem')
+    parser.add_argument('--cadastro', help='Arquivo do cadastro (padrão: ~/.cache/enside/cadastro_pessoas.bin)')
+    sub = parser.add_subparsers(dest='acao', required=True)
+
+    importar = sub.add_parser('importar', help='Acrescentar os documentos de planilhas (.csv, .xlsx)')
+    importar.add_argument('planilhas', nargs='+')
+    importar.add_argument('--coluna-documento', help='Coluna com o CPF/CNPJ')
+    importar.add_argument('--coluna-nome', help='Coluna com o nome da pessoa/empresa')
+    importar.add_argument('--coluna-pasta', help='Coluna com a pasta de triagem (em vez do nome)')
+    importar.add_argument('--substituir', action='store_true', help='Descartar o cadastro atual')
+
+    consultar = sub.add_parser('consultar', help='Mostrar a pasta de CPFs/CNPJs')
+    consultar.add_argument('documentos', nargs='+')
+
+    sub.add_parser('listar', help='Listar o cadastro (JSONL)')
+
+    args = parser.parse_args()
+
+    if args.acao == 'importar':
+        try:
+            contagem = importar_planilhas(args.planilhas, args.cadastro, args.coluna_documento,
+                                          args.coluna_nome, args.coluna_pasta, args.substituir)
+        except Exception as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"📇 {contagem['lidos']} lidos, {contagem['invalidos']} inválidos, "
+              f"{contagem['alterados']} novos/alterados; {contagem['total']} no cadastro", file=sys.stderr)
+        return
+
+    cadastro = CadastroPessoas(args.cadastro)
+    if args.acao == 'consultar':
+        for documento in args.documentos:
+            print(json.dumps({'documento': documento, 'pasta': cadastro.pasta(documento)}, ensure_ascii=False))
+    else:
+        for documento, pasta in cadastro.entradas():
+            print(json.dumps({'documento': documento, 'pasta': pasta}, ensure_ascii=False))
+    cadastro.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Classificação - Tabelas e núcleo de classificação comuns aos organizadores
+Parte da skill organize-pdfs do Claude Code
+
+Uma só cópia das tabelas de extensões e palavras-chave usadas pelo
+importador universal, pelo organizador geral e pelo processador de PDFs.
+Na importação do módulo elas viram índices invertidos: extensão -> tipo,
+tipo -> grupo e palavra normalizada -> categorias (um único
+AutomatoPalavras com bancos, tipos de documento e assuntos). Classificar
+um arquivo é então um lookup de dict e uma passada de regex pelo nome e
+pela amostra de texto:
+
+    >>> c = classificar('Extrato Itaú jan.pdf', 48213)
+    >>> c['tipo'], c['tipo_documento'], c['banco']
+    ('pdf', 'extrato', 'itau')
+
+Uso (microbenchmark do custo por arquivo):
+    python3 classificacao.py [PASTA] [--amostra BYTES] [--repeticoes N]
+"""
+
+import sys
+import time
+from pathlib import PurePath
+from typing import Dict, Hashable, Optional
+
+from automato_palavras import AutomatoPalavras
+
+
+# ═══════════════════════════════════════════════════
+# TABELAS
+# ═══════════════════════════════════════════════════
+
+# Tipo de arquivo -> extensões (sem o ponto)
+TIPOS_EXTENSAO = {
+    # Documentos
+    'pdf': ['pdf'],
+    'documento': ['doc', 'docx', 'odt', 'rtf'],
+    'texto': ['txt'],
+    'planilha': ['xls', 'xlsx', 'ods', 'csv'],
+    'apresentacao': ['ppt', 'pptx', 'odp'],
+
+    # Mídia
+    'imagem': ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'webp', 'heic'],
+    'video': ['mp4', 'mov', 'avi', 'mkv', 'wmv', 'flv', 'webm', 'm4v'],
+    'audio': ['mp3', 'wav', 'aac', 'flac', 'm4a', 'ogg'],
+
+    # Código, dados e afins
+    'codigo': ['py', 'js', 'html', 'css', 'java', 'cpp', 'c', 'sh', 'rb', 'go', 'php'],
+    'compactado': ['zip', 'rar', '7z', 'tar', 'gz', 'bz2'],
+    'dados': ['json', 'xml', 'yaml', 'yml', 'sql', 'db'],
+    'log': ['log'],
+}
+
+# Grupo do organizador geral -> tipos (tipo fora daqui: 'outros')
+GRUPOS = {
+    'documentos': ['pdf', 'documento', 'texto'],
+    'planilhas': ['planilha'],
+    'apresentacoes': ['apresentacao'],
+    'imagens': ['imagem'],
+    'videos': ['video'],
+    'audio': ['audio'],
+    'codigo': ['codigo'],
+    'compactados': ['compactado'],
+    'dados': ['dados'],
+}
+
+# Tipos com texto que vale ler (ver classificar(): 'ler_conteudo')
+TIPOS_COM_TEXTO = {'pdf', 'texto', 'codigo', 'log', 'dados'}
+
+# PDFs maiores que isto não são abertos
+LIMITE_PDF = 200 * 1024 * 1024
+
+# Bancos brasileiros conhecidos
+BANCOS = {
+    'itau': ['itau', 'itaú', 'banco itau', 'banco itaú'],
+    'bradesco': ['bradesco', 'banco bradesco'],
+    'santander': ['santander', 'banco santander'],
+    'bb': ['banco do brasil', 'bb', 'banco brasil'],
+    'caixa': ['caixa', 'caixa econômica', 'caixa economica', 'cef'],
+    'nubank': ['nubank', 'nu pagamentos'],
+    'inter': ['inter', 'banco inter'],
+    'sicoob': ['sicoob'],
+    'sicredi': ['sicredi'],
+    'safra': ['safra', 'banco safra']
+}
+
+# Tipos de documento (o de mais palavras diferentes ganha; empate: o primeiro)
+TIPOS_DOCUMENTO = {
+    'extrato': ['extrato', 'saldo', 'lançamentos', 'lancamentos', 'movimentação', 'movimentacao'],
+    'comprovante': ['comprovante', 'transferência', 'transferencia', 'pix', 'ted', 'doc'],
+    'cartao': ['cartão', 'cartao', 'fatura', 'crédito', 'credito', 'débito', 'debito'],
+    'contrato': ['contrato', 'partes', 'cláusula', 'clausula', 'contratante', 'contratado'],
+    'nota_fiscal': ['nota fiscal', 'nf-e', 'nfe', 'danfe', 'invoice'],
+    'romaneio': ['romaneio', 'madeira', 'm³', 'm3', 'tora', 'cubagem'],
+    'frete': ['frete', 'transporte', 'carga', 'ctrc', 'conhecimento'],
+    'boleto': ['boleto', 'código de barras', 'codigo de barras', 'linha digitável', 'linha digitavel'],
+    'recibo': ['recibo', 'recebi', 'pagamento']
+}
+
+# Tipos do organizador geral, só pelo nome do arquivo: ganha o primeiro
+# da tabela que aparecer; 'palavra*' também casa plurais e derivados
+# ('Contratos_2025', 'termos', 'reports')
+TIPOS_NOME = {
+    'contrato': ['contrato*', 'acordo*', 'termo*'],
+    'nota_fiscal': ['nota fiscal*', 'nf-e*', 'nfe*', 'danfe*'],
+    'extrato': ['extrato*', 'saldo*', 'movimentação*'],
+    'comprovante': ['comprovante*', 'recibo*', 'pagamento*'],
+    'fatura': ['fatura*', 'boleto*'],
+    'relatorio': ['relatório*', 'relatorio*', 'report*'],
+}
+
+# Assuntos das regras de destino do importador ('palavras' em REGRAS_DESTINO)
+ASSUNTOS = {
+    # Bancário
+    'banco': ['extrato', 'saldo', 'banco', 'itau', 'bradesco', 'santander', 'bb', 'caixa', 'nubank'],
+    'comprovante': ['comprovante', 'pix', 'ted', 'doc', 'transferencia'],
+    'cartao': ['cartao', 'fatura', 'credito', 'debito'],
+    'boleto': ['boleto', 'codigo de barras', 'linha digitavel'],
+
+    # Documentos
+    'cpf': ['cpf', 'cadastro de pessoa'],
+    'rg': ['rg', 'identidade'],
+    'cnh': ['cnh', 'carteira', 'habilitacao'],
+    'contrato': ['contrato', 'acordo', 'termo'],
+    'nota_fiscal': ['nota fiscal', 'nf-e', 'nfe', 'danfe'],
+
+    # Segurança
+    'fraude': ['fraude', 'golpe', 'suspeito', 'fraudulent', 'scam'],
+    'hacking': ['hack*', 'exploit*', 'vulnerability', 'backdoor', 'rootkit', 'malware', 'inject*'],
+    'log_seguranca': ['attack*', 'intrusion', 'failed login', 'unauthorized', 'blocked', 'suspicious ip'],
+
+    # Outros
+    'frete': ['frete', 'cte', 'transporte', 'motorista'],
+    'madeira': ['madeira', 'romaneio', 'm3', 'tora', 'cubagem'],
+    'cliente': ['cliente', 'cadastro cliente'],
+    'fornecedor': ['fornecedor', 'supplier'],
+}
+
+
+# ═══════════════════════════════════════════════════
+# ÍNDICES (montados uma vez, na importação)
+# ═══════════════════════════════════════════════════
+
+# extensão -> tipo
+TIPO_POR_EXTENSAO: Dict[str, str] = {
+    extensao: tipo for tipo, extensoes in TIPOS_EXTENSAO.items() for extensao in extensoes
+}
+
+# tipo -> grupo do organizador geral
+GRUPO_POR_TIPO: Dict[str, str] = {tipo: grupo for grupo, tipos in GRUPOS.items() for tipo in tipos}
+
+
+def _categorias() -> Dict[Hashable, list]:
+    """Categorias do autômato: ('banco', b), ('tipo', t), ('assunto', a) e ('nome', n), nessa ordem"""
+    categorias = {}
+    for grupo, tabela in (('banco', BANCOS), ('tipo', TIPOS_DOCUMENTO), ('assunto', ASSUNTOS),
+                          ('nome', TIPOS_NOME)):
+        for nome, palavras in tabela.items():
+            categorias[(grupo, nome)] = palavras
+    return categorias
+
+
+# Palavra normalizada -> categorias (AUTOMATO.palavras), numa regex só
+AUTOMATO = AutomatoPalavras(_categorias())
+
+
+# ═══════════════════════════════════════════════════
+# CLASSIFICAÇÃO
+# ═══════════════════════════════════════════════════
+
+def tipo_extensao(extensao: str) -> str:
+    """Tipo do arquivo pela extensão ('.PDF', 'pdf' -> 'pdf'; desconhecida -> 'outro')"""
+    return TIPO_POR_EXTENSAO.get(extensao.lower().lstrip('.'), 'outro')
+
+
+def banco_encontrado(contagem: Dict) -> Optional[str]:
+    """Primeiro banco (ordem de BANCOS) numa contagem de AUTOMATO.contar()"""
+    for grupo, nome in contagem:
+        if grupo == 'banco':
+            return nome
+    return None
+
+
+def tipo_documento_encontrado(contagem: Dict) -> Optional[str]:
+    """Tipo de documento com mais palavras diferentes numa contagem de AUTOMATO.contar()"""
+    pontos = {nome: len(palavras) for (grupo, nome), palavras in contagem.items() if grupo == 'tipo'}
+    return max(pontos, key=pontos.get) if pontos else None
+
+
+def tipo_nome_encontrado(contagem: Dict) -> Optional[str]:
+    """Primeiro tipo (ordem de TIPOS_NOME) numa contagem de AUTOMATO.contar()"""
+    for grupo, nome in contagem:
+        if grupo == 'nome':
+            return nome
+    return None
+
+
+def classificar(nome: str, tamanho: Optional[int] = None, amostra: str = '') -> Dict:
+    """
+    Classifica um arquivo pelo nome, tamanho e um trecho do conteúdo
+
+    As palavras-chave são procuradas no nome sem a extensão e na amostra,
+    numa passada só do autômato compartilhado.
+
+    Args:
+        nome: Nome do arquivo (um caminho também serve)
+        tamanho: Tamanho em bytes (None se não se sabe)
+        amostra: Texto já lido do arquivo ('' para classificar só pelo nome)
+
+    Returns:
+        Dict com extensao (sem ponto), tipo (pela extensão), grupo (do
+        organizador geral), ler_conteudo (se vale ler o arquivo),
+        palavras (categoria -> {palavra: ocorrências}), assuntos (conjunto
+        de categorias de ASSUNTOS), tipo_documento, banco e tipo_nome
+        (do organizador geral; o nome e a amostra contam) ou None
+    """
+    caminho = PurePath(nome)
+    extensao = caminho.suffix.lower()[1:]
+    tipo = TIPO_POR_EXTENSAO.get(extensao, 'outro')
+
+    ler_conteudo = tipo in TIPOS_COM_TEXTO and tamanho != 0 and (
+        tipo != 'pdf' or tamanho is None or tamanho <= LIMITE_PDF)
+
+    texto = caminho.stem + ' ' + amostra if amostra else caminho.stem
+    contagem = AUTOMATO.contar(texto)
+
+    return {
+        'extensao': extensao,
+        'tipo': tipo,
+        'grupo': GRUPO_POR_TIPO.get(tipo, 'outros'),
+        'ler_conteudo': ler_conteudo,
+        'palavras': contagem,
+        'assuntos': {assunto for grupo, assunto in contagem if grupo == 'assunto'},
+        'tipo_documento': tipo_documento_encontrado(contagem),
+        'banco': banco_encontrado(contagem),
+        'tipo_nome': tipo_nome_encontrado(contagem),
+    }
+
+
+# ═══════════════════════════════════════════════════
+# MICROBENCHMARK
+# ═══════════════════════════════════════════════════
+
+def medir(entradas, repeticoes: int = 1) -> Dict:
+    """
+    Custo de classificar() por arquivo
+
+    Args:
+        entradas: Lista de (nome, tamanho, amostra), já lidas (a leitura não entra na medida)
+
+    Returns:
+        arquivos, segundos e microssegundos por arquivo (média, p50, p99)
+    """
+    latencias = []
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for nome, tamanho, amostra in entradas:
+            t0 = time.perf_counter()
+            classificar(nome, tamanho, amostra)
+            latencias.append(time.perf_counter() - t0)
+    segundos = time.perf_counter() - inicio
+
+    latencias.sort()
+
+    def us(p):
+        return round(latencias[min(len(latencias) - 1, int(p / 100 * len(latencias)))] * 1e6, 1) if latencias else 0.0
+
+    return {
+        'arquivos': len(latencias),
+        'segundos': round(segundos, 4),
+        'us_por_arquivo': round(segundos / len(latencias) * 1e6, 1) if latencias else 0.0,
+        'p50_us': us(50),
+        'p99_us': us(99),
+    }
+
+
+def ler_amostra(caminho, limite: int = 5000) -> str:
+    """Primeiros caracteres de um arquivo de texto, em minúsculas ('' para PDFs e binários)"""
+    if tipo_extensao(caminho.suffix) not in TIPOS_COM_TEXTO - {'pdf'} or limite <= 0:
+        return ''
+    try:
+        with open(caminho, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read(limite).lower()
+    except OSError:
+        return ''
+
+
+def main():
+    """Função principal"""
+    import json
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description='Mede o custo por arquivo de classificar()')
+    parser.add_argument('pasta', nargs='?',
+                        help='Pasta com os arquivos (padrão: só nomes de um corpus sintético)')
+    parser.add_argument('--amostra', type=int, default=5000,
+                        help='Bytes lidos de cada arquivo de texto como amostra (padrão: 5000)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Passadas pelas entradas (padrão: 5)')
+
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    AutomatoPalavras(_categorias())
+    compilacao_ms = round((time.perf_counter() - t0) * 1000, 2)
+
+    if args.pasta:
+        arquivos = sorted(p for p in Path(args.pasta).rglob('*') if p.is_file())
+        entradas = [(a.name, a.stat().st_size, ler_amostra(a, args.amostra)) for a in arquivos]
+    else:
+        modelos = ['Extrato Itaú {}.pdf', 'comprovante_pix_{}.pdf', 'DANFE {}.pdf', 'romaneio_{}.pdf',
+                   'Screenshot {}.png', 'reuniao_{}.mp4', 'backup_{}.zip', 'fluxo_caixa_{}.xlsx',
+                   'script_{}.py', 'contrato social {}.docx', 'IMG_{}.HEIC', 'sem_extensao_{}']
+        entradas = [(modelos[i % len(modelos)].format(i), 1024 * (i % 300), '') for i in range(2400)]
+
+    resultado = medir(entradas, args.repeticoes)
+    resultado['compilacao_ms'] = compilacao_ms
+    resultado['palavras'] = len(AUTOMATO.palavras)
+    resultado['extensoes'] = len(TIPO_POR_EXTENSAO)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    print(f"   {resultado['us_por_arquivo']} µs/arquivo (p50 {resultado['p50_us']}, p99 {resultado['p99_us']}), "
+          f"autômato compilado em {compilacao_ms} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
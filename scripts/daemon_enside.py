@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Daemon ENSIDE - Mantém o processador de PDFs e o organizador carregados
+Parte da skill organize-pdfs do Claude Code
+
+O servidor escuta num socket Unix e responde pedidos de processar e/ou
+organizar documentos, sem pagar a inicialização do Python e o import do
+PyPDF2 a cada arquivo. O cliente tem a mesma saída do pdf_processor.py e
+do file_organizer.py; se o servidor não estiver rodando, executa no
+próprio processo.
+
+Uso:
+    python3 daemon_enside.py servidor [--sem-registro]
+    python3 daemon_enside.py processar <caminho_do_pdf> [--triagem | --fluxo] [--metricas]
+    python3 daemon_enside.py organizar '<json_info_pdf>' [--dry-run] [--posicionamento MODO] [--sem-registro]
+    python3 daemon_enside.py processar-organizar <caminho_do_pdf> [--dry-run] [--posicionamento MODO] [--sem-registro]
+    python3 daemon_enside.py status | parar
+
+As cópias ficam no registro de operações: o servidor abre uma execução
+enquanto roda (sem servidor, uma por pedido) e o id vem no resultado
+('execucao'), para file_organizer.py --undo.
+"""
+
+import os
+import sys
+import json
+import socket
+import threading
+from pathlib import Path
+from typing import Dict
+
+# Socket padrão (pode ser trocado com ENSIDE_SOCKET)
+SOCKET_PADRAO = Path.home() / ".cache" / "enside" / "enside.sock"
+
+
+def caminho_socket() -> Path:
+    """Caminho do socket do servidor"""
+    return Path(os.environ.get('ENSIDE_SOCKET', SOCKET_PADRAO))
+
+
+# Uma conexão de cache por thread (o SQLite não compartilha conexões)
+_local = threading.local()
+
+
+def _cache():
+    """Cache de extração, se ENSIDE_CACHE_EXTRACAO estiver definido"""
+    caminho_cache = os.environ.get('ENSIDE_CACHE_EXTRACAO')
+    if not caminho_cache:
+        return None
+    if getattr(_local, 'cache', None) is None:
+        from pdf_processor import abrir_cache
+        _local.cache = abrir_cache(caminho_cache)
+    return _local.cache
+
+
+def executar(pedido: Dict, registro=None) -> Dict:
+    """
+    Executa um pedido no processo atual
+
+    Args:
+        pedido: {'acao': 'processar' | 'organizar' | 'processar-organizar', ...}
+        registro: RegistroOperacoes opcional das cópias feitas
+
+    Returns:
+        Resultado da ação (mesmo JSON dos scripts de linha de comando)
+    """
+    from pdf_processor import PDFProcessor
+
+    acao = pedido.get('acao')
+    dry_run = bool(pedido.get('dry_run'))
+    opcoes = pedido.get('opcoes', {})
+    posicionamento = pedido.get('posicionamento', 'copia')
+
+    if acao == 'processar':
+        return PDFProcessor(pedido['arquivo'], cache=_cache(), **opcoes).processar()
+
+    if acao == 'organizar':
+        return _organizar(pedido['info'], dry_run, posicionamento, registro)
+
+    if acao == 'processar-organizar':
+        info = PDFProcessor(pedido['arquivo'], cache=_cache(), **opcoes).processar()
+        return {'info': info, 'resultado': _organizar(info, dry_run, posicionamento, registro)}
+
+    raise ValueError(f"Ação desconhecida: {acao}")
+
+
+def _organizar(info: Dict, dry_run: bool, posicionamento: str, registro) -> Dict:
+    from file_organizer import FileOrganizer
+
+    organizer = FileOrganizer(info, dry_run=dry_run, posicionamento=posicionamento, registro=registro)
+    organizer.determinar_destinos()
+    resultado = organizer.mover_arquivo()
+    if registro is not None and not dry_run:
+        resultado['execucao'] = registro.execucao
+    return resultado
+
+
+# ═══════════════════════════════════════════════════
+# SERVIDOR
+# ═══════════════════════════════════════════════════
+
+def servidor(caminho: Path, registrar: bool = True):
+    """
+    Inicia o servidor (bloqueia até receber 'parar')
+
+    Args:
+        registrar: Registrar as cópias numa execução do registro de
+            operações, aberta agora e fechada ao parar
+    """
+    import socketserver
+    from registro_operacoes import RegistroOperacoes
+
+    # Carregar tudo antes do primeiro pedido
+    from pdf_processor import PDFProcessor
+    import file_organizer  # noqa: F401
+    PDFProcessor.automato()
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    if caminho.exists():
+        if _servidor_ativo(caminho):
+            print(f"❌ Servidor já está rodando em {caminho}", file=sys.stderr)
+            sys.exit(1)
+        caminho.unlink()
+
+    class Tratador(socketserver.StreamRequestHandler):
+        def handle(self):
+            for linha in self.rfile:
+                try:
+                    pedido = json.loads(linha)
+                    if pedido.get('acao') == 'status':
+                        resposta = {'ok': True, 'resultado': {'pid': os.getpid()}}
+                    elif pedido.get('acao') == 'parar':
+                        resposta = {'ok': True, 'resultado': 'parando'}
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    else:
+                        resposta = {'ok': True, 'resultado': executar(pedido, registro)}
+                except Exception as e:
+                    resposta = {'ok': False, 'erro': str(e)}
+
+                self.wfile.write(json.dumps(resposta, ensure_ascii=False).encode('utf-8') + b'\n')
+                self.wfile.flush()
+
+    class Servidor(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    registro = RegistroOperacoes(comando=' '.join(sys.argv)) if registrar else None
+
+    with Servidor(str(caminho), Tratador) as srv:
+        os.chmod(caminho, 0o600)
+        print(f"🚀 Servidor ENSIDE ouvindo em {caminho} (pid {os.getpid()})", file=sys.stderr)
+        if registro is not None:
+            print(f"↩️  Execução {registro.execucao} (desfazer: file_organizer.py --undo {registro.execucao})",
+                  file=sys.stderr)
+        try:
+            srv.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if caminho.exists():
+                caminho.unlink()
+            if registro is not None:
+                registro.fechar()
+
+    print("Servidor encerrado", file=sys.stderr)
+
+
+def _servidor_ativo(caminho: Path) -> bool:
+    """Verifica se há um servidor respondendo no socket"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(str(caminho))
+        return True
+    except OSError:
+        return False
+
+
+# ═══════════════════════════════════════════════════
+# CLIENTE
+# ═══════════════════════════════════════════════════
+
+def enviar(pedido: Dict, caminho: Path = None) -> Dict:
+    """
+    Envia um pedido ao servidor
+
+    Returns:
+        Resposta {'ok': bool, 'resultado' | 'erro'}
+
+    Raises:
+        ConnectionError: Se o servidor não estiver rodando
+    """
+    caminho = caminho or caminho_socket()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(str(caminho))
+            s.sendall(json.dumps(pedido, ensure_ascii=False).encode('utf-8') + b'\n')
+            with s.makefile('rb') as f:
+                linha = f.readline()
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise ConnectionError(f"Servidor não está rodando em {caminho}") from e
+
+    if not linha:
+        raise ConnectionError("Servidor fechou a conexão sem responder")
+    return json.loads(linha)
+
+
+def pedir(pedido: Dict, registrar: bool = True) -> Dict:
+    """
+    Envia ao servidor ou, se não houver servidor, executa no próprio processo
+
+    No próprio processo, as cópias vão para uma execução nova do registro
+    de operações (se registrar e não for dry-run).
+    """
+    try:
+        return enviar(pedido)
+    except ConnectionError:
+        pass
+
+    registro = None
+    try:
+        if registrar and not pedido.get('dry_run') and pedido.get('acao') != 'processar':
+            from registro_operacoes import RegistroOperacoes
+            registro = RegistroOperacoes(comando=' '.join(sys.argv))
+        return {'ok': True, 'resultado': executar(pedido, registro)}
+    except Exception as e:
+        return {'ok': False, 'erro': str(e)}
+    finally:
+        if registro is not None:
+            registro.fechar()
+
+
+def main():
+    """Função principal"""
+    args = sys.argv[1:]
+    dry_run = '--dry-run' in args
+    if dry_run:
+        args.remove('--dry-run')
+    registrar = '--sem-registro' not in args
+    if not registrar:
+        args.remove('--sem-registro')
+
+    opcoes = {}
+    for opcao in ('--triagem', '--fluxo', '--metricas'):
+        if opcao in args:
+            args.remove(opcao)
+            opcoes[opcao[2:]] = True
+
+    posicionamento = 'copia'
+    if '--posicionamento' in args:
+        posicao = args.index('--posicionamento')
+        if posicao + 1 >= len(args):
+            print("--posicionamento precisa de um valor (reflink, hardlink, symlink ou copia)", file=sys.stderr)
+            sys.exit(1)
+        posicionamento = args[posicao + 1]
+        del args[posicao:posicao + 2]
+
+    if not args:
+        print(__doc__.split('Uso:')[1].rstrip())
+        sys.exit(1)
+
+    acao = args[0]
+
+    if acao == 'servidor':
+        servidor(caminho_socket(), registrar)
+        return
+
+    if acao in ('status', 'parar'):
+        try:
+            resposta = enviar({'acao': acao})
+        except ConnectionError as e:
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(resposta['resultado'], ensure_ascii=False))
+        return
+
+    if acao not in ('processar', 'organizar', 'processar-organizar') or len(args) != 2:
+        print(__doc__.split('Uso:')[1].rstrip())
+        sys.exit(1)
+
+    if acao == 'organizar':
+        try:
+            pedido = {'acao': acao, 'info': json.loads(args[1]), 'dry_run': dry_run,
+                      'posicionamento': posicionamento}
+        except json.JSONDecodeError as e:
+            print(f"Erro ao parsear JSON: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not isinstance(pedido['info'], dict):
+            print("Erro: o JSON precisa ser um objeto (saída do pdf_processor.py)", file=sys.stderr)
+            sys.exit(1)
+        if pedido['info'].get('arquivo'):
+            # O pdf_processor.py guarda o caminho como recebeu (pode ser relativo)
+            pedido['info']['arquivo'] = os.path.abspath(pedido['info']['arquivo'])
+    else:
+        # Caminho absoluto: o servidor pode ter outro diretório de trabalho
+        pedido = {'acao': acao, 'arquivo': os.path.abspath(args[1]), 'dry_run': dry_run, 'opcoes': opcoes,
+                  'posicionamento': posicionamento}
+
+    resposta = pedir(pedido, registrar)
+
+    if not resposta['ok']:
+        print(json.dumps({'erro': resposta['erro'], 'arquivo': pedido.get('arquivo')}, indent=2,
+                         ensure_ascii=False), file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps(resposta['resultado'], indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Diário de Importação - Lembra o que já foi analisado/movido
+Parte da skill organize-pdfs do Claude Code
+
+Cada arquivo é identificado por (dispositivo, inode, tamanho, mtime): uma
+importação interrompida pode ser repetida e só o que falta é feito. Um
+arquivo que falhou só é tentado de novo depois de mudar (tamanho ou mtime
+diferentes).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Local padrão do diário
+DIARIO_PADRAO = Path.home() / ".cache" / "enside" / "diario_importacao.sqlite"
+
+# Estados de um arquivo
+ANALISADO = 'analisado'
+MOVIDO = 'movido'
+FALHOU = 'falhou'
+
+
+class DiarioImportacao:
+    """Diário persistente (SQLite) do estado de cada arquivo importado"""
+
+    # Gravações acumuladas antes de um commit (ou SEGUNDOS_COMMIT, o que vier antes)
+    LOTE_COMMIT = 200
+    SEGUNDOS_COMMIT = 1.0
+
+    def __init__(self, caminho: Optional[str] = None):
+        """
+        Abre (ou cria) o diário
+
+        Args:
+            caminho: Arquivo SQLite (padrão: ~/.cache/enside/diario_importacao.sqlite)
+        """
+        self.caminho = Path(caminho) if caminho else DIARIO_PADRAO
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+
+        # As threads do pipeline compartilham a conexão (protegida pelo lock)
+        self._lock = threading.Lock()
+        self._pendentes = 0
+        self._ultimo_commit = time.monotonic()
+
+        # origem -> chave do arquivo no momento da análise (o arquivo some ao ser movido)
+        self._chaves: Dict[str, Tuple[int, int, int, int]] = {}
+
+        self.conn = sqlite3.connect(str(self.caminho), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS arquivos (
+                dispositivo INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                tamanho INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                estado TEXT NOT NULL,
+                origem TEXT NOT NULL,
+                destino TEXT,
+                erro TEXT,
+                atualizado REAL NOT NULL,
+                PRIMARY KEY (dispositivo, inode)
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def chave(arquivo) -> Tuple[int, int, int, int]:
+        """(dispositivo, inode, tamanho, mtime_ns) do arquivo"""
+        st = os.stat(arquivo)
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+    def consultar(self, arquivo) -> Optional[Dict]:
+        """
+        Estado registrado do arquivo
+
+        Returns:
+            {'estado', 'destino', 'erro'} ou None se o arquivo é novo ou
+            mudou desde o registro
+        """
+        try:
+            dispositivo, inode, tamanho, mtime_ns = self.chave(arquivo)
+        except OSError:
+            return None
+
+        with self._lock:
+            linha = self.conn.execute(
+                "SELECT tamanho, mtime_ns, estado, destino, erro FROM arquivos "
+                "WHERE dispositivo = ? AND inode = ?",
+                (dispositivo, inode)
+            ).fetchone()
+
+        if linha is None or linha[0] != tamanho or linha[1] != mtime_ns:
+            return None
+
+        if linha[2] == ANALISADO:
+            # Falta mover: guardar a chave para registrar depois
+            self._chaves[str(arquivo)] = (dispositivo, inode, tamanho, mtime_ns)
+
+        return {'estado': linha[2], 'destino': linha[3], 'erro': linha[4]}
+
+    def registrar(self, arquivo, estado: str, destino: Optional[str] = None,
+                  erro: Optional[str] = None):
+        """
+        Registra o estado de um arquivo
+
+        A chave é lida na primeira vez (antes de mover); depois de MOVIDO ou
+        FALHOU a entrada em memória é descartada.
+        """
+        origem = str(arquivo)
+        chave = self._chaves.get(origem)
+        if chave is None:
+            try:
+                chave = self.chave(arquivo)
+            except OSError:
+                return
+
+        if estado == ANALISADO:
+            self._chaves[origem] = chave
+        else:
+            self._chaves.pop(origem, None)
+
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO arquivos "
+                "(dispositivo, inode, tamanho, mtime_ns, estado, origem, destino, erro, atualizado) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*chave, estado, origem, destino, erro, time.time())
+            )
+            self._pendentes += 1
+            agora = time.monotonic()
+            if self._pendentes >= self.LOTE_COMMIT or agora - self._ultimo_commit >= self.SEGUNDOS_COMMIT:
+                self.conn.commit()
+                self._pendentes = 0
+                self._ultimo_commit = agora
+
+    def esquecer(self, arquivo):
+        """Descarta a chave em memória de um arquivo que não será registrado de novo (dry-run)"""
+        self._chaves.pop(str(arquivo), None)
+
+    def resumo(self) -> Dict[str, int]:
+        """Número de arquivos em cada estado"""
+        with self._lock:
+            return dict(self.conn.execute("SELECT estado, COUNT(*) FROM arquivos GROUP BY estado"))
+
+    def fechar(self):
+        """Grava o que estiver pendente e fecha o diário"""
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Estado das Pastas - Lembra as pastas de destino e o que há nelas durante uma execução
+Parte da skill organize-pdfs do Claude Code
+
+Numa importação grande, milhares de arquivos vão para as mesmas poucas
+dezenas de pastas. Em vez de mkdir + exists por arquivo:
+
+    - cada pasta é criada (ou descoberta) com um único mkdir
+    - uma pasta criada agora começa vazia; uma que já existia é listada
+      uma vez, na primeira verificação de colisão
+    - os arquivos que nós mesmos colocamos são anotados com registrar()
+
+Os nomes são comparados como o sistema de arquivos compara: sempre na
+forma NFC e, se ele ignora maiúsculas (APFS/HFS+ padrão no macOS),
+também sem maiúsculas. "Foo.pdf" ou um "é" decomposto contam como o
+arquivo que já está lá.
+
+Vale para uma execução: mudanças feitas por outros programas nas pastas
+de destino durante a execução não são vistas.
+"""
+
+import os
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+
+class EstadoPastas:
+    """Cache das pastas de destino e dos nomes de arquivo em cada uma"""
+
+    def __init__(self):
+        # pasta -> nomes das entradas (None = existe, mas ainda não foi listada)
+        self._pastas: Dict[str, Optional[Set[str]]] = {}
+        self._lock = threading.Lock()
+
+        # Se o sistema de arquivos ignora maiúsculas: por pasta e por st_dev
+        self._insensiveis: Dict[object, bool] = {}
+
+    def _ignora_maiusculas(self, pasta: str) -> bool:
+        """Se o sistema de arquivos da pasta ignora maiúsculas (um teste por dispositivo)"""
+        insensivel = self._insensiveis.get(pasta)
+        if insensivel is None:
+            insensivel = self._insensiveis[pasta] = self._testar_maiusculas(pasta)
+        return insensivel
+
+    def _testar_maiusculas(self, pasta: str) -> bool:
+        # Subir até uma pasta existente com letras no nome
+        atual = os.path.abspath(pasta)
+        while True:
+            nome = os.path.basename(atual)
+            if nome.swapcase() != nome:
+                try:
+                    st = os.stat(atual)
+                    break
+                except OSError:
+                    pass
+            pai = os.path.dirname(atual)
+            if pai == atual:
+                return False
+            atual = pai
+
+        insensivel = self._insensiveis.get(st.st_dev)
+        if insensivel is None:
+            try:
+                trocado = os.stat(os.path.join(os.path.dirname(atual), nome.swapcase()))
+                insensivel = os.path.samestat(st, trocado)
+            except OSError:
+                insensivel = False
+            self._insensiveis[st.st_dev] = insensivel
+        return insensivel
+
+    def _normalizar(self, pasta: str, nome: str) -> str:
+        """Nome como o sistema de arquivos da pasta o compara"""
+        nome = unicodedata.normalize('NFC', nome)
+        return nome.casefold() if self._ignora_maiusculas(pasta) else nome
+
+    def chave(self, caminho):
+        """(pasta, nome normalizado): dois caminhos com a mesma chave são o mesmo arquivo"""
+        caminho = Path(caminho)
+        pasta = os.fspath(caminho.parent)
+        return pasta, self._normalizar(pasta, caminho.name)
+
+    def garantir(self, pasta):
+        """Cria a pasta (e as pastas-pai) se preciso; um mkdir por pasta nova"""
+        pasta = os.fspath(pasta)
+        if pasta in self._pastas:
+            return
+
+        try:
+            os.mkdir(pasta)
+            nomes = set()
+        except FileExistsError:
+            if not os.path.isdir(pasta):
+                raise
+            nomes = None
+        except FileNotFoundError:
+            # Criar a pasta-pai e tentar de novo (outra thread pode criar esta antes)
+            self.garantir(os.path.dirname(pasta))
+            self.garantir(pasta)
+            return
+
+        with self._lock:
+            self._pastas.setdefault(pasta, nomes)
+            if nomes is not None:
+                # A pasta nova aparece na listagem da pasta-pai
+                pai = self._pastas.get(os.path.dirname(pasta))
+                if pai is not None:
+                    pai.add(self._normalizar(os.path.dirname(pasta), os.path.basename(pasta)))
+
+    def _nomes(self, pasta: str) -> Set[str]:
+        """Nomes normalizados das entradas da pasta (listada na primeira consulta)"""
+        nomes = self._pastas.get(pasta)
+        if nomes is None:
+            try:
+                nomes = {self._normalizar(pasta, nome) for nome in os.listdir(pasta)}
+            except (FileNotFoundError, NotADirectoryError):
+                # Ainda não existe (ex.: dry-run): não lembrar, pode ser criada depois
+                return set()
+            with self._lock:
+                # Outra thread pode ter listado (ou registrado algo) antes
+                atual = self._pastas.get(pasta)
+                if atual is None:
+                    self._pastas[pasta] = nomes
+                else:
+                    nomes = atual
+        return nomes
+
+    def existe(self, caminho) -> bool:
+        """Se já existe uma entrada com esse caminho (sem stat por arquivo)"""
+        pasta, nome = self.chave(caminho)
+        return nome in self._nomes(pasta)
+
+    def registrar(self, caminho):
+        """Anota um arquivo criado por nós (mover, copiar, link)"""
+        pasta, nome = self.chave(caminho)
+        nomes = self._pastas.get(pasta)
+        if nomes is not None:
+            with self._lock:
+                nomes.add(nome)
+
+    def descartar(self, caminho):
+        """Anota um arquivo removido por nós"""
+        pasta, nome = self.chave(caminho)
+        nomes = self._pastas.get(pasta)
+        if nomes is not None:
+            with self._lock:
+                nomes.discard(nome)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Estatísticas - Contadores da organização e registro de eventos em JSONL
+Parte da skill organize-pdfs do Claude Code
+
+Os contadores ficam separados por thread (cada thread só escreve no seu
+pedaço, sem lock) e são somados quando alguém lê; a thread que termina
+junta o seu pedaço numa base comum (encerrar_thread). O detalhe de cada
+arquivo não fica em memória: vai para um arquivo JSONL, uma linha por
+evento, escrita na hora. Quem não pede eventos usa SEM_EVENTOS.
+"""
+
+import json
+import sys
+import threading
+import time
+from typing import Dict, Hashable, List
+
+
+class Contadores:
+    """Contadores somados por thread; a memória não cresce com o número de arquivos"""
+
+    def __init__(self):
+        self._local = threading.local()
+        # Pedaço (dict) de cada thread viva que já contou algo
+        self._pedacos: List[Dict[Hashable, int]] = []
+        # Soma dos pedaços das threads que já terminaram
+        self._base: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def _pedaco(self) -> Dict[Hashable, int]:
+        pedaco = getattr(self._local, 'pedaco', None)
+        if pedaco is None:
+            pedaco = self._local.pedaco = {}
+            with self._lock:
+                self._pedacos.append(pedaco)
+        return pedaco
+
+    def somar(self, nome: str, n: int = 1, grupo: str = None):
+        """Soma n ao contador nome (ou ao item grupo do contador, ex.: por_tipo/pdf)"""
+        pedaco = self._pedaco()
+        chave = nome if grupo is None else (nome, grupo)
+        pedaco[chave] = pedaco.get(chave, 0) + n
+
+    def encerrar_thread(self):
+        """Junta o pedaço da thread atual à base (chamar ao fim de uma thread de trabalho)"""
+        pedaco = getattr(self._local, 'pedaco', None)
+        if pedaco is None:
+            return
+        self._local.pedaco = None
+        with self._lock:
+            for chave, n in pedaco.items():
+                self._base[chave] = self._base.get(chave, 0) + n
+            self._pedacos.remove(pedaco)
+
+    def _somados(self) -> Dict[Hashable, int]:
+        with self._lock:
+            pedacos = list(self._pedacos)
+            total = dict(self._base)
+        for pedaco in pedacos:
+            for chave, n in list(pedaco.items()):
+                total[chave] = total.get(chave, 0) + n
+        return total
+
+    def valor(self, nome: str) -> int:
+        """Valor atual de um contador"""
+        return self._somados().get(nome, 0)
+
+    def como_dict(self) -> Dict:
+        """Todos os contadores ({'movidos': 10, 'por_tipo': {'pdf': 7, ...}, ...})"""
+        resultado: Dict = {}
+        for chave, n in self._somados().items():
+            if isinstance(chave, tuple):
+                nome, grupo = chave
+                resultado.setdefault(nome, {})[grupo] = n
+            else:
+                resultado[chave] = n
+        return resultado
+
+
+class EventosJSONL:
+    """Escreve um evento por linha (JSON) conforme os arquivos são processados"""
+
+    def __init__(self, caminho: str):
+        """
+        Args:
+            caminho: Arquivo JSONL (acrescenta ao final) ou '-' para stdout;
+                com '-', o stdout fica só para os eventos e os prints de
+                progresso vão para o stderr até fechar() (crie antes de
+                imprimir e feche depois do último print)
+        """
+        self._lock = threading.Lock()
+        self._stdout_original = None
+        if caminho == '-':
+            self._arquivo = self._stdout_original = sys.stdout
+            sys.stdout = sys.stderr
+            self._fechar = False
+        else:
+            self._arquivo = open(caminho, 'a', encoding='utf-8', buffering=1)
+            self._fechar = True
+
+    def registrar(self, evento: str, **campos):
+        """Escreve {'evento': evento, 'hora': ..., **campos}"""
+        linha = json.dumps({'evento': evento, 'hora': round(time.time(), 3), **campos},
+                           ensure_ascii=False)
+        with self._lock:
+            self._arquivo.write(linha + '\n')
+
+    def fechar(self):
+        with self._lock:
+            if self._fechar:
+                self._arquivo.close()
+            else:
+                self._arquivo.flush()
+            # Devolve o stdout (se ninguém o trocou de novo depois)
+            if self._stdout_original is not None and sys.stdout is sys.stderr:
+                sys.stdout = self._stdout_original
+            self._stdout_original = None
+
+
+class _SemEventos:
+    """Registro de eventos desligado"""
+
+    def registrar(self, evento: str, **campos):
+        pass
+
+    def fechar(self):
+        pass
+
+
+# Usado quando ninguém pediu eventos
+SEM_EVENTOS = _SemEventos()
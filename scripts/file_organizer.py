@@ -4,14 +4,23 @@ File Organizer - Move arquivos PDFs para a estrutura ENSIDE_ORGANIZADO
 Parte da skill organize-pdfs do Claude Code
 """
 
+import os
 import sys
 import json
-import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
 import re
 
+from cadastro_pessoas import CadastroPessoas, cadastro_padrao
+from estado_pastas import EstadoPastas
+from mover_arquivos import ESTRATEGIAS_COPIA, copiar_arquivo
+from registro_operacoes import RegistroOperacoes, SEM_REGISTRO, desfazer
+
+# Atributo estendido com o caminho da cópia canônica de cada arquivo colocado
+ATRIBUTO_CANONICO = 'user.enside.canonico'
+
 
 class FileOrganizer:
     """Organiza arquivos PDF na estrutura ENSIDE_ORGANIZADO"""
@@ -33,19 +42,40 @@ class FileOrganizer:
         'safra': 'Safra'
     }
 
-    def __init__(self, pdf_info: Dict, dry_run: bool = False):
+    # Pastas de triagem de documentos fora do cadastro de pessoas
+    TRIAGEM_CPF_PADRAO = "CPF_ANDERSON"
+    TRIAGEM_CNPJ_PADRAO = "CNPJ_EMPRESA_ENSIDE"
+
+    def __init__(self, pdf_info: Dict, dry_run: bool = False, pastas: Optional[EstadoPastas] = None,
+                 posicionamento: str = 'copia', cadastro: Optional[CadastroPessoas] = None,
+                 registro=None):
         """
         Inicializa o organizador
 
         Args:
             pdf_info: Informações extraídas do PDF
             dry_run: Se True, apenas simula sem mover arquivos
+            pastas: Estado das pastas de destino compartilhado entre vários
+                arquivos (evita mkdir/exists repetidos)
+            posicionamento: Como pôr o arquivo nos demais destinos a partir da
+                cópia canônica: 'reflink', 'hardlink', 'symlink' ou 'copia'
+                (cada um cai para os seguintes se o sistema de arquivos não aceitar)
+            cadastro: Cadastro CPF/CNPJ -> pasta de triagem (padrão: cadastro_padrao())
+            registro: RegistroOperacoes opcional (recuperação de quedas e --undo)
         """
+        if posicionamento not in ESTRATEGIAS_COPIA:
+            raise ValueError(f"Posicionamento desconhecido: {posicionamento}")
         self.pdf_info = pdf_info
         self.dry_run = dry_run
+        self.pastas = pastas if pastas is not None else EstadoPastas()
+        self.posicionamento = posicionamento
+        self.cadastro = cadastro if cadastro is not None else cadastro_padrao()
+        self.registro = registro if registro is not None else SEM_REGISTRO
         self.arquivo_origem = Path(pdf_info['arquivo'])
         self.destinos = []
         self.log = []
+        self.resultado: Optional[Dict] = None  # preenchido por planejar()/executar_passo()
+        self._canonico: Optional[Path] = None
 
     def determinar_destinos(self) -> list:
         """Determina para quais pastas o arquivo deve ir"""
@@ -92,14 +122,23 @@ class FileOrganizer:
         if self.pdf_info.get('tipo_documento') == 'nota_fiscal' and self._e_entrada():
             destinos.append(self.BASE_PATH / "08_FORNECEDORES" / "Notas_Fiscais")
 
-        self.destinos = list(set(str(d) for d in destinos))  # Remove duplicatas
+        self.destinos = list(dict.fromkeys(str(d) for d in destinos))  # Remove duplicatas
         return self.destinos
 
+    def _ordem_posicionamento(self) -> list:
+        """Destinos com o da cópia canônica primeiro (o primeiro fora da triagem por pessoa)"""
+        triagem = str(self.BASE_PATH / "00_TRIAGEM_POR_PESSOA")
+        fora_triagem = [d for d in self.destinos if not d.startswith(triagem)]
+        if not fora_triagem:
+            return list(self.destinos)
+        canonico = fora_triagem[0]
+        return [canonico] + [d for d in self.destinos if d != canonico]
+
     def _destino_triagem_cpf(self, cpf: str) -> Optional[Path]:
         """Determina destino na triagem por CPF"""
-        # Aqui você pode mapear CPFs conhecidos
-        # Por enquanto, vou para CPF_ANDERSON como padrão
-        base = self.BASE_PATH / "00_TRIAGEM_POR_PESSOA" / "CPF_ANDERSON"
+        # Pasta do dono do CPF no cadastro de pessoas (ver cadastro_pessoas.py)
+        pasta = self.cadastro.pasta(cpf) or self.TRIAGEM_CPF_PADRAO
+        base = self.BASE_PATH / "00_TRIAGEM_POR_PESSOA" / pasta
 
         tipo = self.pdf_info.get('tipo_documento')
 
@@ -116,7 +155,8 @@ class FileOrganizer:
 
     def _destino_triagem_cnpj(self, cnpj: str) -> Optional[Path]:
         """Determina destino na triagem por CNPJ"""
-        base = self.BASE_PATH / "00_TRIAGEM_POR_PESSOA" / "CNPJ_EMPRESA_ENSIDE"
+        pasta = self.cadastro.pasta(cnpj) or self.TRIAGEM_CNPJ_PADRAO
+        base = self.BASE_PATH / "00_TRIAGEM_POR_PESSOA" / pasta
 
         tipo = self.pdf_info.get('tipo_documento')
 
@@ -256,72 +296,311 @@ class FileOrganizer:
 
     def mover_arquivo(self) -> Dict:
         """Move o arquivo para os destinos determinados"""
+        for passo in self.planejar():
+            self.executar_passo(passo)
+        return self.resultado
+
+    def planejar(self) -> List[Dict]:
+        """
+        Escolhe o caminho final em cada destino, sem copiar nada
+
+        Cria as pastas (fora do dry-run) e reserva os nomes no estado das
+        pastas, para que outros arquivos planejados antes da cópia não
+        escolham o mesmo nome.
+
+        Returns:
+            Passos para executar_passo(), o da cópia canônica primeiro:
+            {'pasta', 'arquivo', 'canonico'} ou {'pasta', 'erro'}
+        """
         if not self.destinos:
             self.determinar_destinos()
 
-        resultado = {
+        self.resultado = {
             'sucesso': [],
             'erros': [],
-            'destinos': self.destinos
+            'destinos': self.destinos,
+            'canonico': None,
+            'posicionamento': {}
         }
+        self._canonico = None
 
         novo_nome = self.gerar_nome_arquivo()
+        passos = []
 
-        for destino_str in self.destinos:
+        for destino_str in self._ordem_posicionamento():
             destino = Path(destino_str)
 
             try:
                 # Criar pasta se não existir
                 if not self.dry_run:
-                    destino.mkdir(parents=True, exist_ok=True)
+                    self.pastas.garantir(destino)
 
                 # Caminho completo do destino
                 arquivo_destino = destino / novo_nome
 
                 # Verificar se já existe
-                if arquivo_destino.exists():
-                    # Adicionar timestamp
+                if self.pastas.existe(arquivo_destino):
+                    # Adicionar timestamp (e um número, se ainda colidir)
                     timestamp = datetime.now().strftime('%H%M%S')
                     nome_sem_ext = arquivo_destino.stem
                     arquivo_destino = destino / f"{nome_sem_ext}_{timestamp}.pdf"
+                    contador = 2
+                    while self.pastas.existe(arquivo_destino):
+                        arquivo_destino = destino / f"{nome_sem_ext}_{timestamp}_{contador}.pdf"
+                        contador += 1
 
-                # Mover arquivo
-                if self.dry_run:
-                    msg = f"[DRY RUN] {self.arquivo_origem} -> {arquivo_destino}"
-                    print(msg, file=sys.stderr)
-                    self.log.append(msg)
-                    resultado['sucesso'].append(str(arquivo_destino))
-                else:
-                    shutil.copy2(self.arquivo_origem, arquivo_destino)
-                    msg = f"✓ Movido para: {arquivo_destino}"
-                    print(msg, file=sys.stderr)
-                    self.log.append(msg)
-                    resultado['sucesso'].append(str(arquivo_destino))
-
+                self.pastas.registrar(arquivo_destino)
+                passos.append({'pasta': destino, 'arquivo': arquivo_destino, 'canonico': not passos})
             except Exception as e:
-                msg = f"✗ Erro ao mover para {destino}: {e}"
+                passos.append({'pasta': destino, 'erro': e, 'canonico': not passos})
+
+        return passos
+
+    def executar_passo(self, passo: Dict):
+        """Copia (ou liga) o arquivo num destino planejado; o resultado vai para self.resultado"""
+        resultado = self.resultado
+        destino = passo['pasta']
+
+        # A primeira cópia (canônica) sai da origem por reflink ou cópia; as
+        # demais, da canônica, com a estratégia pedida e as seguintes
+        estrategias = ESTRATEGIAS_COPIA[ESTRATEGIAS_COPIA.index(self.posicionamento):]
+
+        try:
+            if 'erro' in passo:
+                raise passo['erro']
+            arquivo_destino = passo['arquivo']
+
+            # Mover arquivo
+            if self.dry_run:
+                msg = f"[DRY RUN] {self.arquivo_origem} -> {arquivo_destino}"
+                print(msg, file=sys.stderr)
+                self.log.append(msg)
+                resultado['sucesso'].append(str(arquivo_destino))
+                if self._canonico is None:
+                    self._canonico = arquivo_destino
+            else:
+                if self._canonico is None:
+                    fonte = self.arquivo_origem
+                    estrategias = [e for e in estrategias if e in ('reflink', 'copia')]
+                else:
+                    fonte = self._canonico
+                with self.registro.operacao('copiar', fonte, arquivo_destino,
+                                            tamanho=os.path.getsize(fonte)) as conclusao:
+                    metodo = conclusao['metodo'] = copiar_arquivo(fonte, arquivo_destino, estrategias)
+                if self._canonico is None:
+                    self._canonico = arquivo_destino
+                _anotar_canonico(arquivo_destino, self._canonico)
+                resultado['posicionamento'][str(arquivo_destino)] = metodo
+                msg = f"✓ Movido para: {arquivo_destino}" + (f" ({metodo})" if metodo != 'copia' else "")
                 print(msg, file=sys.stderr)
                 self.log.append(msg)
-                resultado['erros'].append({'destino': str(destino), 'erro': str(e)})
+                resultado['sucesso'].append(str(arquivo_destino))
 
-        return resultado
+        except Exception as e:
+            msg = f"✗ Erro ao mover para {destino}: {e}"
+            print(msg, file=sys.stderr)
+            self.log.append(msg)
+            resultado['erros'].append({'destino': str(destino), 'erro': str(e)})
+
+        if self._canonico is not None:
+            resultado['canonico'] = str(self._canonico)
+
+
+def _anotar_canonico(caminho: Path, canonico: Path):
+    """Grava no arquivo (atributo estendido) onde está a cópia canônica, se o sistema permitir"""
+    if not hasattr(os, 'setxattr'):
+        return
+    try:
+        os.setxattr(caminho, ATRIBUTO_CANONICO, os.fsencode(canonico))
+    except OSError:
+        pass
+
+
+def canonico_de(caminho) -> Optional[str]:
+    """Cópia canônica registrada num arquivo colocado pelo organizador (ou None)"""
+    if os.path.islink(caminho):
+        return os.path.realpath(caminho)
+    if not hasattr(os, 'getxattr'):
+        return None
+    try:
+        return os.fsdecode(os.getxattr(caminho, ATRIBUTO_CANONICO))
+    except OSError:
+        return None
+
+
+def ler_jsonl(origem: str) -> Iterator[Dict]:
+    """
+    Lê resultados do PDFProcessor, um JSON por linha ('-' lê da entrada padrão)
+
+    Linhas que não são um objeto JSON viram {'erro': ...}, para manter uma
+    saída por entrada.
+    """
+    arquivo = sys.stdin if origem == '-' else open(origem, 'r', encoding='utf-8')
+    try:
+        for linha in arquivo:
+            linha = linha.strip()
+            if not linha:
+                continue
+            try:
+                info = json.loads(linha)
+            except json.JSONDecodeError as e:
+                yield {'erro': f"JSON inválido: {e}"}
+                continue
+            if isinstance(info, dict):
+                yield info
+            else:
+                yield {'erro': f"Esperado um objeto JSON, veio {type(info).__name__}"}
+    finally:
+        if arquivo is not sys.stdin:
+            arquivo.close()
+
+
+def organizar_lote(infos: Iterable[Dict], dry_run: bool = False, posicionamento: str = 'copia',
+                   janela: int = 256, registro=None) -> Iterator[Dict]:
+    """
+    Organiza vários documentos (resultados do PDFProcessor), um resultado por entrada
+
+    Lê `janela` documentos por vez: planeja os destinos de todos, executa as
+    cópias agrupadas por pasta de destino (as canônicas antes das demais) e
+    devolve os resultados na ordem de entrada. A memória depende da janela,
+    não do tamanho do lote; o estado das pastas é compartilhado pelo lote.
+    Com registro (RegistroOperacoes), cada cópia fica no diário da execução.
+
+    Yields:
+        {'arquivo': ..., **resultado de mover_arquivo()} ou {'arquivo': ..., 'erro': ...}
+    """
+    if janela < 1:
+        raise ValueError(f"janela precisa ser pelo menos 1 (veio {janela})")
+
+    pastas = EstadoPastas()
+    infos = iter(infos)
+
+    while True:
+        bloco = list(islice(infos, janela))
+        if not bloco:
+            break
+
+        organizadores: List[Optional[FileOrganizer]] = []
+        falhas: Dict[int, str] = {}
+        passos = []
+        for posicao, info in enumerate(bloco):
+            organizer = None
+            if 'erro' in info and 'nome_arquivo' not in info:
+                # O PDFProcessor não conseguiu ler o documento
+                falhas[posicao] = info['erro']
+            else:
+                try:
+                    organizer = FileOrganizer(info, dry_run=dry_run, pastas=pastas,
+                                              posicionamento=posicionamento, registro=registro)
+                    organizer.determinar_destinos()
+                    for passo in organizer.planejar():
+                        passos.append((not passo['canonico'], str(passo['pasta']), posicao, passo))
+                except Exception as e:
+                    falhas[posicao] = str(e)
+                    organizer = None
+            organizadores.append(organizer)
+
+        # Canônicas primeiro (as demais cópias saem delas), depois pasta por pasta
+        passos.sort(key=lambda p: p[:3])
+        for _, _, posicao, passo in passos:
+            organizadores[posicao].executar_passo(passo)
+
+        for posicao, info in enumerate(bloco):
+            if posicao in falhas:
+                yield {'arquivo': info.get('arquivo'), 'erro': falhas[posicao]}
+            else:
+                yield {'arquivo': info.get('arquivo'), **organizadores[posicao].resultado}
+
+
+def main_lote(argv: List[str]) -> int:
+    """Modo lote: lê JSONL do pdf_processor.py --lote e escreve um resultado JSON por linha"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='file_organizer.py --lote',
+        description='Organiza vários documentos (entrada e saída JSONL)'
+    )
+    parser.add_argument('entrada', nargs='?', default='-',
+                        help="Arquivo JSONL do pdf_processor.py --lote ('-' ou omitido: stdin)")
+    parser.add_argument('--dry-run', action='store_true', help='Simular sem copiar arquivos')
+    parser.add_argument('--posicionamento', choices=ESTRATEGIAS_COPIA, default='copia',
+                        help='Como pôr o arquivo nos destinos além do canônico (padrão: copia)')
+    parser.add_argument('--janela', type=int, default=256,
+                        help='Documentos planejados juntos (padrão: 256)')
+    parser.add_argument('--sem-registro', action='store_true',
+                        help='Não registrar as cópias (sem recuperação de quedas nem undo)')
+
+    args = parser.parse_args(argv)
+    if args.janela < 1:
+        parser.error('--janela precisa ser pelo menos 1')
+
+    registro = None
+    if not args.dry_run and not args.sem_registro:
+        registro = RegistroOperacoes(comando=' '.join(sys.argv))
+        print(f"↩️  Execução {registro.execucao} (desfazer: file_organizer.py --undo {registro.execucao})",
+              file=sys.stderr)
+
+    falhas = 0
+    try:
+        for resultado in organizar_lote(ler_jsonl(args.entrada), dry_run=args.dry_run,
+                                        posicionamento=args.posicionamento, janela=args.janela,
+                                        registro=registro):
+            if 'erro' in resultado or resultado['erros']:
+                falhas += 1
+            print(json.dumps(resultado, ensure_ascii=False), flush=True)
+    finally:
+        if registro is not None:
+            registro.fechar()
+
+    return 1 if falhas else 0
 
 
 def main():
     """Função principal"""
+    if len(sys.argv) >= 2 and sys.argv[1] in ('--lote', '--batch'):
+        sys.exit(main_lote(sys.argv[2:]))
+
+    if len(sys.argv) >= 2 and sys.argv[1] == '--undo':
+        if len(sys.argv) != 3:
+            print("--undo precisa do id da execução", file=sys.stderr)
+            sys.exit(1)
+        try:
+            contagem = desfazer(sys.argv[2])
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"Erro: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps({'execucao': sys.argv[2], **contagem}, indent=2, ensure_ascii=False))
+        return
+
     if len(sys.argv) < 2:
-        print("Uso: python3 file_organizer.py <json_info_pdf> [--dry-run]")
+        print("Uso: python3 file_organizer.py <json_info_pdf> [--dry-run] [--posicionamento reflink|hardlink|symlink|copia] [--sem-registro]")
+        print("     python3 file_organizer.py --lote [ARQ_JSONL|-] [--dry-run] [--posicionamento MODO] [--janela N]")
+        print("     python3 file_organizer.py --undo EXECUCAO")
         print("\nExemplo:")
         print('  python3 file_organizer.py \'{"arquivo": "doc.pdf", "banco": "itau", "tipo_documento": "extrato"}\'')
         sys.exit(1)
 
     json_info = sys.argv[1]
     dry_run = '--dry-run' in sys.argv
+    sem_registro = '--sem-registro' in sys.argv
 
+    posicionamento = 'copia'
+    if '--posicionamento' in sys.argv:
+        posicao = sys.argv.index('--posicionamento') + 1
+        if posicao >= len(sys.argv) or sys.argv[posicao] not in ESTRATEGIAS_COPIA:
+            print(f"--posicionamento precisa de um de: {', '.join(ESTRATEGIAS_COPIA)}", file=sys.stderr)
+            sys.exit(1)
+        posicionamento = sys.argv[posicao]
+
+    registro = None
     try:
         pdf_info = json.loads(json_info)
 
-        organizer = FileOrganizer(pdf_info, dry_run=dry_run)
+        if not dry_run and not sem_registro:
+            registro = RegistroOperacoes(comando=' '.join(sys.argv))
+
+        organizer = FileOrganizer(pdf_info, dry_run=dry_run, posicionamento=posicionamento,
+                                  registro=registro)
         organizer.determinar_destinos()
 
         print(f"\n📄 Arquivo: {pdf_info.get('nome_arquivo')}", file=sys.stderr)
@@ -332,6 +611,10 @@ def main():
 
         print("\n🔄 Movendo arquivo...", file=sys.stderr)
         resultado = organizer.mover_arquivo()
+        if registro is not None:
+            registro.fechar()
+            resultado['execucao'] = registro.execucao
+            registro = None
 
         # Imprimir resultado como JSON
         print(json.dumps(resultado, indent=2, ensure_ascii=False))
@@ -342,6 +625,9 @@ def main():
     except Exception as e:
         print(f"Erro: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if registro is not None:
+            registro.fechar()
 
 
 if __name__ == "__main__":
@@ -5,13 +5,19 @@ Parte da skill organize-pdfs do Claude Code
 """
 
 import sys
-import shutil
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 import mimetypes
 import re
 
+from classificacao import classificar
+from estado_pastas import EstadoPastas
+from estatisticas import Contadores, EventosJSONL, SEM_EVENTOS
+from mover_arquivos import mover_arquivo
+from registro_operacoes import RegistroOperacoes, SEM_REGISTRO, desfazer
+from regras_destino import TabelaRegras
+
 
 class GeneralOrganizer:
     """Organizador geral de arquivos (não só PDFs)"""
@@ -19,41 +25,64 @@ class GeneralOrganizer:
     BASE_PATH = Path("/Users/Shared/ENSIDE_ORGANIZADO")
     WORKSPACE = Path.home() / "WORKSPACE"
 
-    # Mapeamento de extensões para categorias
-    EXTENSOES = {
-        # Documentos
-        'documentos': ['.pdf', '.doc', '.docx', '.odt', '.txt', '.rtf'],
-        'planilhas': ['.xls', '.xlsx', '.ods', '.csv'],
-        'apresentacoes': ['.ppt', '.pptx', '.odp'],
-
-        # Imagens
-        'imagens': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.heic'],
+    # Regras de destino, em ordem de prioridade (ver regras_destino.py).
+    # 'categoria' é o grupo da extensão e 'tipo' o tipo pelo nome (TIPOS_NOME
+    # em classificacao.py); 'nome_contem' procura no nome sem extensão.
+    REGRAS_DESTINO = [
+        # PDFs podem ir para vários lugares
+        {'descricao': 'Nota fiscal', 'extensao': ['.pdf'], 'tipo': ['nota_fiscal'],
+         'destino': '{BASE}/07_CLIENTES/Notas_Fiscais/{ano}'},
+        {'descricao': 'Extrato', 'extensao': ['.pdf'], 'tipo': ['extrato'],
+         'destino': '{BASE}/05_BANCOS/Extratos'},
+        {'descricao': 'Comprovante', 'extensao': ['.pdf'], 'tipo': ['comprovante'],
+         'destino': '{BASE}/05_BANCOS/Comprovantes'},
+        {'descricao': 'Contrato', 'extensao': ['.pdf'], 'tipo': ['contrato'],
+         'destino': '{BASE}/02_DOCUMENTOS_EMPRESA/Contratos'},
+        {'descricao': 'PDF', 'extensao': ['.pdf'],
+         'destino': '{BASE}/01_DOCUMENTOS_PESSOAIS'},
 
-        # Videos
-        'videos': ['.mp4', '.mov', '.avi', '.mkv', '.wmv', '.flv', '.webm'],
+        # Planilhas
+        {'descricao': 'Planilha financeira', 'categoria': ['planilhas'], 'nome_contem': ['financeiro', 'fluxo'],
+         'destino': '{BASE}/06_FINANCEIRO/Relatorios'},
+        {'descricao': 'Planilha de clientes', 'categoria': ['planilhas'], 'nome_contem': ['cliente'],
+         'destino': '{BASE}/07_CLIENTES/Cadastros'},
+        {'descricao': 'Planilha de fornecedores', 'categoria': ['planilhas'], 'nome_contem': ['fornecedor'],
+         'destino': '{BASE}/08_FORNECEDORES/Cadastros'},
+        {'descricao': 'Planilha', 'categoria': ['planilhas'],
+         'destino': '{WORKSPACE}/Documentos_PDF'},
 
-        # Audio
-        'audio': ['.mp3', '.wav', '.aac', '.flac', '.m4a', '.ogg'],
+        # Imagens
+        {'descricao': 'Logo/banner', 'categoria': ['imagens'], 'nome_contem': ['logo', 'banner'],
+         'destino': '{WORKSPACE}/Projetos/Assets'},
+        {'descricao': 'Imagem', 'categoria': ['imagens'],
+         'destino': '{WORKSPACE}/Documentos_PDF/Imagens'},
 
         # Código
-        'codigo': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.sh', '.rb', '.go'],
+        {'descricao': 'Python', 'categoria': ['codigo'], 'extensao': ['.py'],
+         'destino': '{WORKSPACE}/Python'},
+        {'descricao': 'Web', 'categoria': ['codigo'], 'extensao': ['.html', '.css', '.js'],
+         'destino': '{WORKSPACE}/HTML'},
+        {'descricao': 'Shell', 'categoria': ['codigo'], 'extensao': ['.sh'],
+         'destino': '{WORKSPACE}/Scripts'},
+        {'descricao': 'Código', 'categoria': ['codigo'],
+         'destino': '{WORKSPACE}/Projetos'},
+
+        # Dados/Config
+        {'descricao': 'Configuração', 'categoria': ['dados'], 'extensao': ['.json', '.yaml', '.yml'],
+         'destino': '{WORKSPACE}/Config'},
+        {'descricao': 'Dados', 'categoria': ['dados'],
+         'destino': '{WORKSPACE}/Projetos'},
 
         # Compactados
-        'compactados': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'],
-
-        # Dados
-        'dados': ['.json', '.xml', '.yaml', '.yml', '.sql', '.db'],
-    }
-
-    # Palavras-chave para classificação
-    PALAVRAS_CHAVE = {
-        'contrato': ['contrato', 'acordo', 'termo'],
-        'nota_fiscal': ['nota fiscal', 'nf-e', 'nfe', 'danfe'],
-        'extrato': ['extrato', 'saldo', 'movimentação'],
-        'comprovante': ['comprovante', 'recibo', 'pagamento'],
-        'fatura': ['fatura', 'boleto'],
-        'relatorio': ['relatório', 'relatorio', 'report'],
-    }
+        {'descricao': 'Compactado', 'categoria': ['compactados'],
+         'destino': '{WORKSPACE}/Downloads'},
+
+        # Outros
+        {'descricao': 'Outros', 'destino': '{WORKSPACE}/Documentos_PDF'},
+    ]
+
+    # Tabela de REGRAS_DESTINO (ver tabela())
+    _tabela = None
 
     def __init__(self, arquivo_path: str, destino_sugerido: Optional[str] = None):
         """
@@ -71,107 +100,60 @@ class GeneralOrganizer:
 
     def _analisar_arquivo(self) -> Dict:
         """Analisa o arquivo e extrai informações"""
+        try:
+            stat = self.arquivo.stat()
+        except OSError:
+            stat = None
+        classificacao = classificar(self.arquivo.name, stat.st_size if stat else None)
         return {
             'nome': self.arquivo.name,
             'nome_sem_ext': self.nome,
             'extensao': self.extensao,
-            'tamanho_kb': self.arquivo.stat().st_size / 1024 if self.arquivo.exists() else 0,
-            'data_modificacao': datetime.fromtimestamp(self.arquivo.stat().st_mtime).strftime('%Y-%m-%d') if self.arquivo.exists() else None,
-            'categoria': self._identificar_categoria(),
-            'tipo': self._identificar_tipo(),
+            'tamanho_kb': stat.st_size / 1024 if stat else 0,
+            'data_modificacao': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d') if stat else None,
+            'categoria': classificacao['grupo'],
+            'tipo': classificacao['tipo_nome'],
         }
 
-    def _identificar_categoria(self) -> str:
-        """Identifica a categoria do arquivo pela extensão"""
-        for categoria, extensoes in self.EXTENSOES.items():
-            if self.extensao in extensoes:
-                return categoria
-        return 'outros'
-
-    def _identificar_tipo(self) -> Optional[str]:
-        """Identifica o tipo baseado no nome do arquivo"""
-        nome_lower = self.nome.lower()
-
-        for tipo, palavras in self.PALAVRAS_CHAVE.items():
-            for palavra in palavras:
-                if palavra in nome_lower:
-                    return tipo
+    @classmethod
+    def tabela(cls) -> TabelaRegras:
+        """Tabela de REGRAS_DESTINO (compilada uma vez por processo)"""
+        if cls.__dict__.get('_tabela') is None:
+            cls._tabela = TabelaRegras(cls.REGRAS_DESTINO, campo_indice='categoria')
+        return cls._tabela
 
-        return None
+    def _entradas_regras(self):
+        """Campos e textos avaliados pela tabela de regras"""
+        campos = {'extensao': self.extensao, 'categoria': self.info['categoria'], 'tipo': self.info['tipo']}
+        return campos, {'nome': self.nome.lower()}, set()
 
     def determinar_destino(self) -> Path:
-        """Determina o melhor destino para o arquivo"""
+        """Determina o melhor destino para o arquivo (ver REGRAS_DESTINO)"""
 
         # Se tem destino sugerido, usa ele
         if self.destino_sugerido:
             return self.BASE_PATH / self.destino_sugerido
 
-        categoria = self.info['categoria']
-        tipo = self.info['tipo']
-
-        # PDFs podem ir para vários lugares
-        if self.extensao == '.pdf':
-            if tipo == 'nota_fiscal':
-                return self.BASE_PATH / "07_CLIENTES" / "Notas_Fiscais" / str(datetime.now().year)
-            elif tipo == 'extrato':
-                return self.BASE_PATH / "05_BANCOS" / "Extratos"
-            elif tipo == 'comprovante':
-                return self.BASE_PATH / "05_BANCOS" / "Comprovantes"
-            elif tipo == 'contrato':
-                return self.BASE_PATH / "02_DOCUMENTOS_EMPRESA" / "Contratos"
-            else:
-                return self.BASE_PATH / "01_DOCUMENTOS_PESSOAIS"
+        tabela = self.tabela()
+        indice = tabela.avaliar(*self._entradas_regras())
+        return Path(tabela.destino(indice, BASE=self.BASE_PATH, WORKSPACE=self.WORKSPACE))
 
-        # Planilhas
-        elif categoria == 'planilhas':
-            if 'financeiro' in self.nome.lower() or 'fluxo' in self.nome.lower():
-                return self.BASE_PATH / "06_FINANCEIRO" / "Relatorios"
-            elif 'cliente' in self.nome.lower():
-                return self.BASE_PATH / "07_CLIENTES" / "Cadastros"
-            elif 'fornecedor' in self.nome.lower():
-                return self.BASE_PATH / "08_FORNECEDORES" / "Cadastros"
-            else:
-                return self.WORKSPACE / "Documentos_PDF"
-
-        # Imagens
-        elif categoria == 'imagens':
-            if 'logo' in self.nome.lower() or 'banner' in self.nome.lower():
-                return self.WORKSPACE / "Projetos" / "Assets"
-            else:
-                return self.WORKSPACE / "Documentos_PDF" / "Imagens"
+    def explicar_destino(self) -> Dict:
+        """Explica qual regra escolheu o destino (modo --explicar)"""
+        explicacao = self.tabela().explicar(*self._entradas_regras())
+        explicacao['arquivo'] = str(self.arquivo)
+        explicacao['destino'] = str(self.determinar_destino())
+        return explicacao
 
-        # Código
-        elif categoria == 'codigo':
-            if self.extensao == '.py':
-                return self.WORKSPACE / "Python"
-            elif self.extensao in ['.html', '.css', '.js']:
-                return self.WORKSPACE / "HTML"
-            elif self.extensao == '.sh':
-                return self.WORKSPACE / "Scripts"
-            else:
-                return self.WORKSPACE / "Projetos"
-
-        # Dados/Config
-        elif categoria == 'dados':
-            if self.extensao in ['.json', '.yaml', '.yml']:
-                return self.WORKSPACE / "Config"
-            else:
-                return self.WORKSPACE / "Projetos"
-
-        # Compactados
-        elif categoria == 'compactados':
-            return self.WORKSPACE / "Downloads"
-
-        # Outros
-        else:
-            return self.WORKSPACE / "Documentos_PDF"
-
-    def organizar(self, dry_run: bool = False) -> Dict:
+    def organizar(self, dry_run: bool = False, pastas: Optional[EstadoPastas] = None,
+                  registro=None) -> Dict:
         """
         Organiza o arquivo movendo para o destino correto
 
         Args:
             dry_run: Se True, apenas simula sem mover
+            pastas: Estado das pastas compartilhado pela execução (ver organizar_pasta())
+            registro: RegistroOperacoes opcional (recuperação de quedas e --undo)
 
         Returns:
             Dict com resultado da operação
@@ -183,16 +165,18 @@ class GeneralOrganizer:
             }
 
         destino_pasta = self.determinar_destino()
+        if pastas is None:
+            pastas = EstadoPastas()
 
         # Criar pasta se não existir
         if not dry_run:
-            destino_pasta.mkdir(parents=True, exist_ok=True)
+            pastas.garantir(destino_pasta)
 
         # Nome do arquivo no destino
         arquivo_destino = destino_pasta / self.arquivo.name
 
         # Se já existe, adicionar timestamp
-        if arquivo_destino.exists():
+        if pastas.existe(arquivo_destino):
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             arquivo_destino = destino_pasta / f"{self.nome}_{timestamp}{self.extensao}"
 
@@ -211,7 +195,9 @@ class GeneralOrganizer:
                 resultado['sucesso'] = True
                 resultado['mensagem'] = 'Simulação OK'
             else:
-                shutil.move(str(self.arquivo), str(arquivo_destino))
+                with (registro or SEM_REGISTRO).operacao('mover', self.arquivo, arquivo_destino):
+                    mover_arquivo(self.arquivo, arquivo_destino)
+                pastas.registrar(arquivo_destino)
                 print(f"✓ Movido: {self.arquivo.name} → {destino_pasta}")
                 resultado['sucesso'] = True
                 resultado['mensagem'] = 'Arquivo movido com sucesso'
@@ -223,16 +209,19 @@ class GeneralOrganizer:
         return resultado
 
 
-def organizar_pasta(pasta: str, dry_run: bool = False) -> Dict:
+def organizar_pasta(pasta: str, dry_run: bool = False, eventos=None, registro=None) -> Dict:
     """
     Organiza todos os arquivos de uma pasta
 
     Args:
         pasta: Caminho da pasta
         dry_run: Se True, apenas simula
+        eventos: EventosJSONL opcional; recebe o resultado de cada arquivo
+            assim que ele é organizado
+        registro: RegistroOperacoes opcional (recuperação de quedas e --undo)
 
     Returns:
-        Dict com estatísticas
+        Dict com estatísticas (total, sucesso, erros, por_categoria)
     """
     pasta_path = Path(pasta)
 
@@ -241,34 +230,31 @@ def organizar_pasta(pasta: str, dry_run: bool = False) -> Dict:
             'erro': f'Pasta não encontrada: {pasta}'
         }
 
-    estatisticas = {
-        'total': 0,
-        'sucesso': 0,
-        'erros': 0,
-        'por_categoria': {},
-        'arquivos': []
-    }
+    if eventos is None:
+        eventos = SEM_EVENTOS
+    contadores = Contadores()
+
+    # Pastas de destino criadas/listadas uma vez para a pasta toda
+    pastas = EstadoPastas()
 
     # Listar todos os arquivos
     for arquivo in pasta_path.iterdir():
         if arquivo.is_file() and not arquivo.name.startswith('.'):
-            estatisticas['total'] += 1
+            contadores.somar('total')
 
             organizer = GeneralOrganizer(str(arquivo))
-            resultado = organizer.organizar(dry_run=dry_run)
+            resultado = organizer.organizar(dry_run=dry_run, pastas=pastas, registro=registro)
 
             if resultado['sucesso']:
-                estatisticas['sucesso'] += 1
-
-                categoria = resultado['categoria']
-                if categoria not in estatisticas['por_categoria']:
-                    estatisticas['por_categoria'][categoria] = 0
-                estatisticas['por_categoria'][categoria] += 1
+                contadores.somar('sucesso')
+                contadores.somar('por_categoria', grupo=resultado['categoria'])
             else:
-                estatisticas['erros'] += 1
+                contadores.somar('erros')
 
-            estatisticas['arquivos'].append(resultado)
+            eventos.registrar('organizado' if resultado['sucesso'] else 'erro', **resultado)
 
+    estatisticas = {'total': 0, 'sucesso': 0, 'erros': 0, 'por_categoria': {}}
+    estatisticas.update(contadores.como_dict())
     return estatisticas
 
 
@@ -278,36 +264,84 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='Organiza arquivos automaticamente')
-    parser.add_argument('caminho', help='Arquivo ou pasta para organizar')
+    parser.add_argument('caminho', nargs='?', help='Arquivo ou pasta para organizar')
     parser.add_argument('--dry-run', action='store_true', help='Apenas simular, não mover arquivos')
     parser.add_argument('--destino', help='Categoria de destino sugerida')
+    parser.add_argument('--explicar', action='store_true',
+                        help='Só mostrar qual regra escolheria o destino de cada arquivo')
+    parser.add_argument('--eventos', metavar='ARQ',
+                        help='Registrar o resultado de cada arquivo em JSONL (- para stdout)')
+    parser.add_argument('--undo', metavar='EXECUCAO',
+                        help='Desfazer uma execução anterior (só com o registro de operações)')
+    parser.add_argument('--sem-registro', action='store_true',
+                        help='Não registrar as operações (sem recuperação de quedas nem --undo)')
 
     args = parser.parse_args()
 
+    if args.undo:
+        try:
+            contagem = desfazer(args.undo)
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"Erro: {e}")
+            sys.exit(1)
+        print(json.dumps({'execucao': args.undo, **contagem}, indent=2, ensure_ascii=False))
+        return
+
+    if not args.caminho:
+        parser.error('informe o arquivo ou pasta para organizar')
+
     caminho = Path(args.caminho)
+    registro = None
+    if not args.dry_run and not args.sem_registro and caminho.exists() and not args.explicar:
+        registro = RegistroOperacoes(comando=' '.join(sys.argv))
+
+    if args.explicar and caminho.exists():
+        arquivos = [caminho] if caminho.is_file() else sorted(
+            a for a in caminho.iterdir() if a.is_file() and not a.name.startswith('.'))
+        for arquivo in arquivos:
+            print(json.dumps(GeneralOrganizer(str(arquivo)).explicar_destino(), indent=2, ensure_ascii=False))
+        return
 
     if caminho.is_file():
         # Organizar um arquivo
         organizer = GeneralOrganizer(str(caminho), args.destino)
-        resultado = organizer.organizar(dry_run=args.dry_run)
+        try:
+            resultado = organizer.organizar(dry_run=args.dry_run, registro=registro)
+        finally:
+            if registro is not None:
+                registro.fechar()
+        if registro is not None:
+            resultado['execucao'] = registro.execucao
         print(json.dumps(resultado, indent=2, ensure_ascii=False))
 
     elif caminho.is_dir():
         # Organizar uma pasta
+        eventos = EventosJSONL(args.eventos) if args.eventos else None
+
         print(f"\n📁 Organizando pasta: {caminho}")
         print(f"{'[DRY RUN]' if args.dry_run else ''}\n")
 
-        estatisticas = organizar_pasta(str(caminho), dry_run=args.dry_run)
-
-        print(f"\n📊 Estatísticas:")
-        print(f"  Total de arquivos: {estatisticas['total']}")
-        print(f"  Sucesso: {estatisticas['sucesso']}")
-        print(f"  Erros: {estatisticas['erros']}")
-        print(f"\n📂 Por categoria:")
-        for cat, count in estatisticas['por_categoria'].items():
-            print(f"  {cat}: {count} arquivos")
-
-        print(json.dumps(estatisticas, indent=2, ensure_ascii=False))
+        try:
+            estatisticas = organizar_pasta(str(caminho), dry_run=args.dry_run, eventos=eventos,
+                                           registro=registro)
+            if registro is not None:
+                estatisticas['execucao'] = registro.execucao
+
+            # Antes de fechar os eventos: com --eventos -, ainda vai para o stderr
+            print(f"\n📊 Estatísticas:")
+            print(f"  Total de arquivos: {estatisticas['total']}")
+            print(f"  Sucesso: {estatisticas['sucesso']}")
+            print(f"  Erros: {estatisticas['erros']}")
+            print(f"\n📂 Por categoria:")
+            for cat, count in estatisticas['por_categoria'].items():
+                print(f"  {cat}: {count} arquivos")
+
+            print(json.dumps(estatisticas, indent=2, ensure_ascii=False))
+        finally:
+            if eventos is not None:
+                eventos.fechar()
+            if registro is not None:
+                registro.fechar()
 
     else:
         print(f"Erro: Caminho não encontrado: {caminho}")
@@ -6,352 +6,868 @@ Analisa automaticamente e move para o local correto
 
 import sys
 import os
-import shutil
+import errno
 from pathlib import Path
 from datetime import datetime
 import re
 import subprocess
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from classificacao import classificar, tipo_extensao
+from diario_importacao import DiarioImportacao, ANALISADO, MOVIDO, FALHOU
+from estado_pastas import EstadoPastas
+from estatisticas import Contadores, EventosJSONL, SEM_EVENTOS
+from vigia_pastas import VigiaPasta
+from mover_arquivos import mover_arquivo
+from indice_conteudo import IndiceConteudo
+from regras_destino import TabelaRegras
+from registro_operacoes import RegistroOperacoes, SEM_REGISTRO, desfazer
 
 BASE = Path("/Users/Shared/ENSIDE_ORGANIZADO")
 WORKSPACE = Path.home() / "WORKSPACE"
 
-# Estatísticas
-stats = {
-    'total': 0,
-    'movidos': 0,
-    'erros': 0,
-    'por_tipo': {},
-    'arquivos': []
-}
+# Marca de fim de fila entre os estágios do pipeline
+_FIM = object()
+
+
+# Camadas da classificação, da mais barata para a mais cara (ver ImportadorUniversal._amostrar())
+CAMADAS = ('nome', 'extensao_tamanho', 'metadados', 'inicio', 'texto_completo')
+
+# Confiança a partir da qual as camadas seguintes não são lidas
+LIMIAR_CONFIANCA = 0.85
+
+# Campos do dicionário /Info do PDF usados na camada de metadados
+_CAMPOS_INFO_PDF = ('/Title', '/Subject', '/Keywords', '/Author')
+
+# Camada de texto completo: máximo de páginas e de caracteres lidos
+MAX_PAGINAS_TEXTO = 30
+LIMITE_TEXTO = 100_000
+
+
+def _camadas_conteudo(limiar, primeira='metadados'):
+    """
+    Camadas de conteúdo lidas com esse limiar, a partir de primeira
+
+    O texto completo só entra com limiar acima do padrão: no padrão a
+    leitura para na primeira página / nos primeiros 5 KB.
+    """
+    fim = len(CAMADAS) if limiar > LIMIAR_CONFIANCA else CAMADAS.index('texto_completo')
+    return CAMADAS[CAMADAS.index(primeira):fim]
+
+
+def _camadas_pdf(caminho, nome_lower, limiar):
+    """
+    Camadas de conteúdo de um PDF: metadados, primeira página e texto completo
+    (ver _camadas_conteudo())
+
+    O PDF é aberto uma vez só; para na primeira camada com confiança >=
+    limiar (roda no pool de processos ou numa thread de leitura).
+
+    Returns:
+        (conteudo, camada, indice, confianca) da última camada lida ou None
+        se o PDF não pôde ser aberto
+    """
+    arquivo = Path(caminho)
+    partes = []
+    resultado = None
+    try:
+        import PyPDF2
+        with open(caminho, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            for camada in _camadas_conteudo(limiar):
+                if camada == 'metadados':
+                    meta = reader.metadata or {}
+                    texto = ' '.join(str(meta[campo]) for campo in _CAMPOS_INFO_PDF if meta.get(campo))
+                elif camada == 'inicio':
+                    texto = reader.pages[0].extract_text()[:5000] if len(reader.pages) > 0 else ''
+                else:
+                    texto = ''
+                    for pagina in reader.pages[1:MAX_PAGINAS_TEXTO]:
+                        texto += ' ' + pagina.extract_text()
+                        if len(texto) >= LIMITE_TEXTO:
+                            break
+                partes.append(texto.lower()[:LIMITE_TEXTO])
+                conteudo = ' '.join(p for p in partes if p)
+                indice, confianca = ImportadorUniversal.avaliar_camada(camada, arquivo, 'pdf', nome_lower, conteudo)
+                resultado = (conteudo, camada, indice, confianca)
+                if confianca >= limiar:
+                    break
+    except Exception:
+        pass
+    return resultado
+
+
+def varrer_arquivos(raiz, excluir=(), max_profundidade=None, progresso=None, intervalo=1000):
+    """
+    Percorre a pasta com os.scandir, entregando os arquivos conforme são achados
+
+    Pastas ocultas e excluídas são podadas antes de entrar nelas, o tipo de
+    cada entrada vem do próprio scandir (sem stat extra na maioria dos
+    sistemas de arquivos) e links para pastas não são seguidos.
+
+    Args:
+        raiz: Pasta inicial
+        excluir: Nomes de pastas a ignorar (ex.: 'node_modules')
+        max_profundidade: 0 = só a raiz, 1 = raiz e subpastas diretas...
+            (None = sem limite)
+        progresso: Função chamada com (arquivos, pastas, terminou) a cada
+            intervalo arquivos e no fim
+        intervalo: Arquivos entre duas chamadas de progresso
+
+    Yields:
+        Path de cada arquivo (não oculto)
+    """
+    excluir = set(excluir)
+    pilha = [(os.fspath(raiz), 0)]
+    arquivos = 0
+    pastas = 0
+
+    while pilha:
+        pasta, profundidade = pilha.pop()
+        pastas += 1
+        try:
+            with os.scandir(pasta) as it:
+                entradas = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"   ⚠️  Sem acesso a {pasta}: {e}", file=sys.stderr)
+            continue
+
+        subpastas = []
+        for entrada in entradas:
+            if entrada.name.startswith('.'):
+                continue
+            try:
+                if entrada.is_dir(follow_symlinks=False):
+                    if entrada.name not in excluir and (max_profundidade is None or profundidade < max_profundidade):
+                        subpastas.append(entrada.path)
+                elif entrada.is_file():
+                    arquivos += 1
+                    yield Path(entrada.path)
+                    if progresso and arquivos % intervalo == 0:
+                        progresso(arquivos, pastas, False)
+            except OSError:
+                continue
+
+        # Pilha: empilhar ao contrário mantém a ordem alfabética
+        pilha.extend((subpasta, profundidade + 1) for subpasta in reversed(subpastas))
+
+    if progresso:
+        progresso(arquivos, pastas, True)
+
+
+def _mostrar_progresso(arquivos, pastas, terminou):
+    """Progresso da varredura (stderr, para não misturar com a importação)"""
+    if terminou:
+        print(f"   🔎 Varredura concluída: {arquivos} arquivos em {pastas} pastas", file=sys.stderr)
+    else:
+        print(f"   🔎 {arquivos} arquivos encontrados ({pastas} pastas)...", file=sys.stderr)
+
+
+def _iniciar_estagio(funcao, entrada, saida, threads, ao_errar, ao_terminar=None):
+    """
+    Inicia as threads de um estágio do pipeline
+
+    Cada thread tira itens de entrada, aplica funcao e põe o resultado (se
+    não for None) em saida. Um erro num item vai para ao_errar(item, erro)
+    e não para o estágio. Quando a última thread recebe _FIM, repassa o
+    _FIM para o próximo estágio. ao_terminar() roda em cada thread antes
+    de ela sair.
+    """
+    restantes = [threads]
+    lock = threading.Lock()
+
+    def trabalhar():
+        try:
+            processar_fila()
+        finally:
+            if ao_terminar is not None:
+                ao_terminar()
+
+    def processar_fila():
+        while True:
+            item = entrada.get()
+            if item is _FIM:
+                entrada.put(_FIM)  # acorda as outras threads do estágio
+                with lock:
+                    restantes[0] -= 1
+                    ultima = restantes[0] == 0
+                if ultima and saida is not None:
+                    saida.put(_FIM)
+                return
+
+            try:
+                resultado = funcao(item)
+            except Exception as e:
+                print(f"   ✗ Erro: {e}")
+                ao_errar(item, e)
+                continue
+
+            if resultado is not None and saida is not None:
+                saida.put(resultado)
+
+    lista = [threading.Thread(target=trabalhar, daemon=True) for _ in range(threads)]
+    for thread in lista:
+        thread.start()
+    return lista
+
 
 class ImportadorUniversal:
     """Importa e organiza qualquer arquivo/pasta automaticamente"""
 
-    # Mapeamento de extensões
-    EXTENSOES = {
-        # Documentos
-        'pdf': 'pdf',
-        'doc': 'documento', 'docx': 'documento', 'odt': 'documento', 'txt': 'texto',
-
-        # Planilhas
-        'xls': 'planilha', 'xlsx': 'planilha', 'ods': 'planilha', 'csv': 'planilha',
-
-        # Apresentações
-        'ppt': 'apresentacao', 'pptx': 'apresentacao', 'odp': 'apresentacao',
-
-        # Imagens
-        'jpg': 'imagem', 'jpeg': 'imagem', 'png': 'imagem', 'gif': 'imagem',
-        'bmp': 'imagem', 'svg': 'imagem', 'webp': 'imagem', 'heic': 'imagem',
-
-        # Vídeos
-        'mp4': 'video', 'mov': 'video', 'avi': 'video', 'mkv': 'video',
-        'wmv': 'video', 'flv': 'video', 'webm': 'video', 'm4v': 'video',
-
-        # Áudio
-        'mp3': 'audio', 'wav': 'audio', 'aac': 'audio', 'flac': 'audio',
-        'm4a': 'audio', 'ogg': 'audio',
-
-        # Código
-        'py': 'codigo', 'js': 'codigo', 'html': 'codigo', 'css': 'codigo',
-        'java': 'codigo', 'cpp': 'codigo', 'c': 'codigo', 'sh': 'codigo',
-        'rb': 'codigo', 'go': 'codigo', 'php': 'codigo',
-
-        # Compactados
-        'zip': 'compactado', 'rar': 'compactado', '7z': 'compactado',
-        'tar': 'compactado', 'gz': 'compactado', 'bz2': 'compactado',
-
-        # Dados
-        'json': 'dados', 'xml': 'dados', 'yaml': 'dados', 'yml': 'dados',
-        'sql': 'dados', 'db': 'dados',
-
-        # Logs
-        'log': 'log',
-    }
-
-    # Palavras-chave para classificação
-    PALAVRAS_CHAVE = {
-        # Bancário
-        'banco': ['extrato', 'saldo', 'banco', 'itau', 'bradesco', 'santander', 'bb', 'caixa', 'nubank'],
-        'comprovante': ['comprovante', 'pix', 'ted', 'doc', 'transferencia'],
-        'cartao': ['cartao', 'fatura', 'credito', 'debito'],
-        'boleto': ['boleto', 'codigo de barras', 'linha digitavel'],
-
-        # Documentos
-        'cpf': ['cpf', 'cadastro de pessoa'],
-        'rg': ['rg', 'identidade'],
-        'cnh': ['cnh', 'carteira', 'habilitacao'],
-        'contrato': ['contrato', 'acordo', 'termo'],
-        'nota_fiscal': ['nota fiscal', 'nf-e', 'nfe', 'danfe'],
-
-        # Segurança
-        'fraude': ['fraude', 'golpe', 'suspeito', 'fraudulent', 'scam'],
-        'hacking': ['hack', 'exploit', 'vulnerability', 'backdoor', 'rootkit', 'malware', 'inject'],
-        'log_seguranca': ['attack', 'intrusion', 'failed login', 'unauthorized', 'blocked', 'suspicious ip'],
-
-        # Outros
-        'frete': ['frete', 'cte', 'transporte', 'motorista'],
-        'madeira': ['madeira', 'romaneio', 'm3', 'tora', 'cubagem'],
-        'cliente': ['cliente', 'cadastro cliente'],
-        'fornecedor': ['fornecedor', 'supplier'],
-    }
-
-    def __init__(self, caminho):
-        self.caminho = Path(caminho)
+    # Trechos do nome que indicam captura de tela
+    _PRINTS = ['screenshot', 'screen shot', 'captura', 'print']
+
+    # Regras de destino, em ordem de prioridade (ver regras_destino.py).
+    # 'tipo' é o da extensão e 'palavras' são ASSUNTOS (ver classificacao.py); 'nome_contem' e
+    # 'texto_contem' procuram trechos no nome e no nome + conteúdo.
+    REGRAS_DESTINO = [
+        # ═══ SEGURANÇA E FRAUDES (Prioridade máxima!) ═══
+        {'descricao': 'Fraude em imagem', 'palavras': ['fraude'], 'tipo': ['imagem'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Evidencias/Screenshots'},
+        {'descricao': 'Fraude em print', 'palavras': ['fraude'], 'nome_contem': ['screenshot', 'print'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Evidencias/Screenshots'},
+        {'descricao': 'Fraude em vídeo', 'palavras': ['fraude'], 'tipo': ['video'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Evidencias/Videos'},
+        {'descricao': 'Fraude', 'palavras': ['fraude'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Fraudes/Investigacao'},
+
+        {'descricao': 'Script suspeito', 'palavras': ['hacking'], 'tipo': ['codigo'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Analise_Seguranca/Scripts_Suspeitos'},
+        {'descricao': 'Vídeo de hacking', 'palavras': ['hacking'], 'tipo': ['video'],
+         'destino': '{BASE}/11_VIDEOS/Seguranca/Hackers'},
+        {'descricao': 'Log de hacking', 'palavras': ['hacking'], 'tipo': ['log'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Analise_Seguranca/Logs'},
+        {'descricao': 'Hacking', 'palavras': ['hacking'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Hacking/Tentativas_Invasao'},
+
+        {'descricao': 'Log de segurança', 'palavras': ['log_seguranca'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Hacking/Logs_Acesso'},
 
-    def analisar_arquivo(self, arquivo):
+        # Cheques
+        {'descricao': 'Cheque suspeito', 'texto_contem': [['cheque'], ['estranho', 'suspeito', 'devolvido']],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Cheques/Suspeitos'},
+        {'descricao': 'Cheque', 'texto_contem': ['cheque'],
+         'destino': '{BASE}/13_SEGURANCA_FRAUDES/Cheques/Analise'},
+
+        # ═══ SCREENSHOTS / PRINTS ═══
+        {'descricao': 'Print de erro', 'tipo': ['imagem'], 'nome_contem': _PRINTS, 'texto_contem': ['erro', 'bug'],
+         'destino': '{BASE}/12_PRINTS_TELA/Erros'},
+        {'descricao': 'Print de comprovante', 'tipo': ['imagem'], 'nome_contem': _PRINTS,
+         'texto_contem': ['comprovante'],
+         'destino': '{BASE}/12_PRINTS_TELA/Evidencias/Comprovantes'},
+        {'descricao': 'Print', 'tipo': ['imagem'], 'nome_contem': _PRINTS,
+         'destino': '{BASE}/12_PRINTS_TELA/2025'},
+
+        # ═══ VÍDEOS ═══
+        {'descricao': 'Vídeo tutorial', 'tipo': ['video'], 'texto_contem': ['tutorial', 'aula', 'curso'],
+         'destino': '{BASE}/11_VIDEOS/Tutoriais'},
+        {'descricao': 'Vídeo de reunião', 'tipo': ['video'], 'texto_contem': ['reuniao', 'meeting'],
+         'destino': '{BASE}/11_VIDEOS/Reunioes'},
+        {'descricao': 'Vídeo de apresentação', 'tipo': ['video'], 'texto_contem': ['apresentacao'],
+         'destino': '{BASE}/11_VIDEOS/Apresentacoes'},
+        {'descricao': 'Vídeo', 'tipo': ['video'],
+         'destino': '{BASE}/11_VIDEOS/2025'},
+
+        # ═══ PDFs E DOCUMENTOS ═══
+        {'descricao': 'Comprovante bancário', 'tipo': ['pdf', 'documento'], 'palavras': [['banco'], ['comprovante']],
+         'destino': '{BASE}/05_BANCOS/Comprovantes'},
+        {'descricao': 'Cartão', 'tipo': ['pdf', 'documento'], 'palavras': [['banco'], ['cartao']],
+         'destino': '{BASE}/05_BANCOS/Cartoes'},
+        {'descricao': 'Extrato', 'tipo': ['pdf', 'documento'], 'palavras': ['banco'],
+         'destino': '{BASE}/05_BANCOS/Extratos'},
+        {'descricao': 'Boleto', 'tipo': ['pdf', 'documento'], 'palavras': ['boleto'],
+         'destino': '{BASE}/06_FINANCEIRO/{ano}/{mes}/Contas_Pagar'},
+        {'descricao': 'Nota fiscal', 'tipo': ['pdf', 'documento'], 'palavras': ['nota_fiscal'],
+         'destino': '{BASE}/07_CLIENTES/Notas_Fiscais/2025'},
+        {'descricao': 'Contrato', 'tipo': ['pdf', 'documento'], 'palavras': ['contrato'],
+         'destino': '{BASE}/02_DOCUMENTOS_EMPRESA/Contratos_Socios'},
+        {'descricao': 'Frete', 'tipo': ['pdf', 'documento'], 'palavras': ['frete'],
+         'destino': '{BASE}/04_FRETES/CTEs/2025'},
+        {'descricao': 'Madeira', 'tipo': ['pdf', 'documento'], 'palavras': ['madeira'],
+         'destino': '{BASE}/03_MADEIRAS/Fornecedores_PR/Notas_Fiscais'},
+        {'descricao': 'CPF', 'tipo': ['pdf', 'documento'], 'palavras': ['cpf'],
+         'destino': '{BASE}/01_DOCUMENTOS_PESSOAIS/CPF/Copias'},
+        {'descricao': 'RG', 'tipo': ['pdf', 'documento'], 'palavras': ['rg'],
+         'destino': '{BASE}/01_DOCUMENTOS_PESSOAIS/RG/Copias'},
+        {'descricao': 'CNH', 'tipo': ['pdf', 'documento'], 'palavras': ['cnh'],
+         'destino': '{BASE}/01_DOCUMENTOS_PESSOAIS/CNH/Atual'},
+        {'descricao': 'Documento', 'tipo': ['pdf', 'documento'],
+         'destino': '{BASE}/01_DOCUMENTOS_PESSOAIS'},
+
+        # ═══ PLANILHAS ═══
+        {'descricao': 'Planilha financeira', 'tipo': ['planilha'], 'texto_contem': ['financeiro', 'fluxo', 'conta'],
+         'destino': '{BASE}/06_FINANCEIRO/Relatorios'},
+        {'descricao': 'Planilha de clientes', 'tipo': ['planilha'], 'palavras': ['cliente'],
+         'destino': '{BASE}/07_CLIENTES/Cadastros'},
+        {'descricao': 'Planilha de fornecedores', 'tipo': ['planilha'], 'palavras': ['fornecedor'],
+         'destino': '{BASE}/08_FORNECEDORES/Cadastros'},
+        {'descricao': 'Planilha', 'tipo': ['planilha'],
+         'destino': '{BASE}/06_FINANCEIRO/Relatorios'},
+
+        # ═══ CÓDIGO ═══
+        {'descricao': 'Python', 'tipo': ['codigo'], 'extensao': ['py'],
+         'destino': '{WORKSPACE}/Python'},
+        {'descricao': 'Web', 'tipo': ['codigo'], 'extensao': ['html', 'css', 'js'],
+         'destino': '{WORKSPACE}/HTML'},
+        {'descricao': 'Shell', 'tipo': ['codigo'], 'extensao': ['sh'],
+         'destino': '{WORKSPACE}/Scripts'},
+        {'descricao': 'Código', 'tipo': ['codigo'],
+         'destino': '{WORKSPACE}/Projetos'},
+
+        # ═══ OUTROS ═══
+        {'descricao': 'Imagem', 'tipo': ['imagem'], 'destino': '{WORKSPACE}/Documentos_PDF/Imagens'},
+        {'descricao': 'Áudio', 'tipo': ['audio'], 'destino': '{WORKSPACE}/Documentos_PDF/Audio'},
+        {'descricao': 'Compactado', 'tipo': ['compactado'], 'destino': '{WORKSPACE}/Downloads'},
+        {'descricao': 'Dados', 'tipo': ['dados'], 'destino': '{WORKSPACE}/Config'},
+        {'descricao': 'Log', 'tipo': ['log'], 'destino': '{BASE}/13_SEGURANCA_FRAUDES/Analise_Seguranca/Logs'},
+        {'descricao': 'Outros', 'destino': '{WORKSPACE}/Documentos_PDF'},
+    ]
+
+    # No modo vigia, lotes a partir deste tamanho usam o pipeline
+    LOTE_PIPELINE = 16
+
+    # Confiança conforme a regra escolhida (ver avaliar_camada())
+    CONFIANCA_REGRA = {'evidencia': 0.9, 'campos': 0.6, 'padrao': 0.3}
+
+    # Peso da camada: antes de ler o texto do documento, regras de conteúdo
+    # de prioridade maior ainda podem aparecer com mais frequência
+    PESO_CAMADA = {'nome': 0.9, 'extensao_tamanho': 0.9, 'metadados': 0.9,
+                   'inicio': 1.0, 'texto_completo': 1.0}
+
+    # Tabela de REGRAS_DESTINO (ver tabela())
+    _tabela = None
+
+    def __init__(self, caminho, diario=None, indice=None, duplicatas='pular', eventos=None,
+                 limiar_confianca=LIMIAR_CONFIANCA, registro=None):
+        """
+        Args:
+            caminho: Arquivo ou pasta a importar
+            diario: DiarioImportacao opcional (retoma importações interrompidas)
+            indice: IndiceConteudo opcional (detecta arquivos que já estão no acervo)
+            duplicatas: O que fazer com uma cópia de arquivo do acervo:
+                'pular' (deixa na origem) ou 'link' (no destino fica um link
+                para o arquivo existente e a origem é apagada)
+            eventos: EventosJSONL opcional (uma linha por arquivo processado)
+            limiar_confianca: Confiança que encerra a classificação (ver CAMADAS);
+                acima de LIMIAR_CONFIANCA também lê o texto completo; 1.0 só
+                para quando nada lido depois poderia mudar o destino
+            registro: RegistroOperacoes opcional (diário de cada movimentação,
+                para recuperar quedas e desfazer a execução)
+        """
+        self.caminho = Path(caminho)
+        self.limiar = limiar_confianca
+        self.diario = diario
+        self.indice = indice
+        self.duplicatas = duplicatas
+        self.eventos = eventos if eventos is not None else SEM_EVENTOS
+        self.registro = registro if registro is not None else SEM_REGISTRO
+        # Totais da importação (total, movidos, erros, pulados, duplicatas, por_tipo, por_camada)
+        self.contadores = Contadores()
+        # Destinos já escolhidos e ainda não movidos (pipeline), como EstadoPastas.chave()
+        self._reservados = set()
+        self._lock_reservados = threading.Lock()
+        # Pastas de destino e seus arquivos, para não repetir mkdir/exists
+        self.pastas = EstadoPastas()
+
+    @classmethod
+    def tabela(cls):
+        """Tabela de REGRAS_DESTINO (compilada uma vez por processo)"""
+        if cls.__dict__.get('_tabela') is None:
+            cls._tabela = TabelaRegras(cls.REGRAS_DESTINO, campo_indice='tipo')
+        return cls._tabela
+
+    def analisar_arquivo(self, arquivo, dry_run=False):
         """Analisa um arquivo e determina onde deve ir"""
+        amostra = self._amostrar(arquivo)
+        if amostra is None:
+            return None
+        return self._classificar(amostra, dry_run)
+
+    def _amostrar(self, arquivo, pool_pdf=None):
+        """
+        Classifica o arquivo em camadas, da mais barata para a mais cara
+
+        Uma camada só é lida se a confiança da anterior ficou abaixo do
+        limiar: nome; extensão e tamanho (há texto que valha ler?); para
+        PDFs, metadados /Info e primeira página; para textos, os primeiros
+        5 KB. Com limiar acima de LIMIAR_CONFIANCA, também o texto completo
+        (PDF até MAX_PAGINAS_TEXTO, texto até LIMITE_TEXTO).
+
+        Args:
+            pool_pdf: Pool de processos para ler PDFs (opcional); com ele,
+                o conteúdo de um PDF volta como Future (ver _concluir_amostra())
+
+        Returns:
+            (arquivo, tipo, nome_lower, conteudo, (indice da regra, camada, confianca))
+            ou None se o arquivo sumiu
+        """
         arquivo = Path(arquivo)
 
-        if not arquivo.exists():
+        try:
+            tamanho = arquivo.stat().st_size
+        except OSError:
             return None
 
-        extensao = arquivo.suffix.lower().replace('.', '')
         nome_lower = arquivo.name.lower()
-        tipo_arquivo = self.EXTENSOES.get(extensao, 'outro')
+        inicial = classificar(arquivo.name, tamanho)
+        tipo_arquivo = inicial['tipo']
+
+        # Camada 1: só o nome
+        conteudo = ""
+        camada = 'nome'
+        indice, confianca = self.avaliar_camada(camada, arquivo, tipo_arquivo, nome_lower, conteudo)
+
+        if confianca < self.limiar:
+            # Camada 2: extensão e tamanho dizem se há conteúdo que valha ler
+            camada = 'extensao_tamanho'
+            resultado = None
+            if inicial['ler_conteudo']:
+                if tipo_arquivo != 'pdf':
+                    resultado = self._camadas_texto(arquivo, tipo_arquivo, nome_lower)
+                elif pool_pdf is not None:
+                    # Resolvido na classificação (ver _concluir_amostra()): a
+                    # thread de leitura segue enquanto o pool lê o PDF
+                    futuro = pool_pdf.submit(_camadas_pdf, str(arquivo), nome_lower, self.limiar)
+                    return arquivo, tipo_arquivo, nome_lower, futuro, (indice, camada, confianca)
+                else:
+                    resultado = _camadas_pdf(str(arquivo), nome_lower, self.limiar)
+
+            if resultado is not None:
+                conteudo, camada, indice, confianca = resultado
+
+        return arquivo, tipo_arquivo, nome_lower, conteudo, (indice, camada, confianca)
+
+    @staticmethod
+    def _concluir_amostra(amostra):
+        """Espera as camadas de PDF que _amostrar() deixou no pool (amostra pronta: sem mudança)"""
+        arquivo, tipo_arquivo, nome_lower, conteudo, decisao = amostra
+        if not isinstance(conteudo, Future):
+            return amostra
+        resultado = conteudo.result()
+        if resultado is None:
+            return arquivo, tipo_arquivo, nome_lower, "", decisao
+        conteudo, camada, indice, confianca = resultado
+        return arquivo, tipo_arquivo, nome_lower, conteudo, (indice, camada, confianca)
+
+    def _camadas_texto(self, arquivo, tipo, nome_lower):
+        """Camadas de conteúdo de um arquivo de texto: início (5 KB) e texto completo (ver _camadas_conteudo())"""
+        resultado = None
+        try:
+            with open(arquivo, 'r', encoding='utf-8', errors='ignore') as f:
+                conteudo = f.read(5000).lower()  # Primeiros 5KB
+                for camada in _camadas_conteudo(self.limiar, 'inicio'):
+                    if camada == 'texto_completo':
+                        resto = f.read(LIMITE_TEXTO - len(conteudo))
+                        if not resto:
+                            break  # o arquivo todo já foi lido
+                        conteudo += resto.lower()
+                    indice, confianca = self.avaliar_camada(camada, arquivo, tipo, nome_lower, conteudo)
+                    resultado = (conteudo, camada, indice, confianca)
+                    if confianca >= self.limiar:
+                        break
+        except OSError:
+            pass
+        return resultado
+
+    @classmethod
+    def avaliar_camada(cls, camada, arquivo, tipo, nome_lower, conteudo):
+        """
+        Regra escolhida com o que já foi lido e a confiança nela (0 a 1)
+
+        1.0 quando nenhuma regra de prioridade maior pode passar com mais
+        conteúdo; senão, conforme a regra (CONFIANCA_REGRA: com evidência
+        em palavras/trechos, só por tipo/extensão, ou a regra padrão) vezes o
+        peso da camada (PESO_CAMADA).
 
-        # Análise de conteúdo (para certos tipos)
-        conteudo = self._ler_conteudo(arquivo, tipo_arquivo)
+        Returns:
+            (indice da regra, confianca)
+        """
+        tabela = cls.tabela()
+        indice, aberta = tabela.avaliar_pendencias(
+            *cls._entradas_regras(arquivo, tipo, nome_lower, conteudo), textos_fixos=('nome',))
+        if not aberta:
+            return indice, 1.0
+        return indice, round(cls.CONFIANCA_REGRA[tabela.natureza(indice)] * cls.PESO_CAMADA[camada], 2)
+
+    def _classificar(self, amostra, dry_run=False):
+        """Determina o destino a partir da amostra de _amostrar() (em dry-run, sem anotar no diário)"""
+        arquivo, tipo_arquivo, nome_lower, conteudo, (indice, camada, confianca) = amostra
 
         # Determinar destino
-        destino = self._determinar_destino(arquivo, tipo_arquivo, nome_lower, conteudo)
+        destino = self._destino_regra(arquivo, indice)
+
+        try:
+            tamanho = arquivo.stat().st_size
+        except OSError:
+            return None
+
+        if self.diario is not None and not dry_run:
+            self.diario.registrar(arquivo, ANALISADO, str(destino))
 
         return {
             'origem': str(arquivo),
             'destino': str(destino),
             'tipo': tipo_arquivo,
-            'tamanho': arquivo.stat().st_size,
-            'nome': arquivo.name
+            'tamanho': tamanho,
+            'nome': arquivo.name,
+            'camada': camada,
+            'confianca': confianca
         }
 
-    def _ler_conteudo(self, arquivo, tipo):
-        """Lê conteúdo do arquivo (primeiros bytes)"""
+    def _consultar_diario(self, arquivo, dry_run=False):
+        """
+        O que o diário já sabe do arquivo
+
+        Returns:
+            (pular, info): pular=True se o arquivo já foi movido ou falhou sem
+            mudar depois; info é o resultado da análise anterior (só falta
+            mover) ou None se é preciso analisar
+        """
+        if self.diario is None:
+            return False, None
+
+        registro = self.diario.consultar(arquivo)
+        if registro is None:
+            return False, None
+
+        if registro['estado'] == MOVIDO and registro['destino'] and not os.path.lexists(registro['destino']):
+            # Movido e trazido de volta (ex.: --undo): importar de novo
+            if not dry_run:
+                self.diario.esquecer(arquivo)
+            return False, None
+
+        if registro['estado'] != ANALISADO:
+            self.contadores.somar('pulados')
+            self.eventos.registrar('pulado', origem=str(arquivo), estado=registro['estado'],
+                                   destino=registro['destino'])
+            return True, None
+
+        arquivo = Path(arquivo)
         try:
-            if tipo in ['texto', 'codigo', 'log', 'dados']:
-                with open(arquivo, 'r', encoding='utf-8', errors='ignore') as f:
-                    return f.read(5000).lower()  # Primeiros 5KB
-            elif tipo == 'pdf':
-                # Tentar extrair texto do PDF
-                try:
-                    import PyPDF2
-                    with open(arquivo, 'rb') as f:
-                        reader = PyPDF2.PdfReader(f)
-                        if len(reader.pages) > 0:
-                            return reader.pages[0].extract_text().lower()[:5000]
-                except:
-                    pass
-        except:
-            pass
-        return ""
+            tamanho = arquivo.stat().st_size
+        except OSError:
+            return False, None
+        return False, {
+            'origem': str(arquivo),
+            'destino': registro['destino'],
+            'tipo': tipo_extensao(arquivo.suffix),
+            'tamanho': tamanho,
+            'nome': arquivo.name
+        }
 
     def _determinar_destino(self, arquivo, tipo, nome_lower, conteudo):
-        """Determina o destino correto do arquivo"""
+        """Determina o destino correto do arquivo (ver REGRAS_DESTINO)"""
+        indice = self.tabela().avaliar(*self._entradas_regras(arquivo, tipo, nome_lower, conteudo))
+        return self._destino_regra(arquivo, indice)
 
-        # Pegar extensão
-        extensao = arquivo.suffix.lower().replace('.', '')
+    def _destino_regra(self, arquivo, indice):
+        """Destino dado pela regra indice de REGRAS_DESTINO"""
+        return Path(self.tabela().destino(indice, BASE=BASE, WORKSPACE=WORKSPACE)) / arquivo.name
 
+    @classmethod
+    def _entradas_regras(cls, arquivo, tipo, nome_lower, conteudo):
+        """Campos, textos e categorias avaliados pela tabela de regras"""
         # Combinar nome e conteúdo para análise
         texto_completo = nome_lower + " " + conteudo
 
-        # ═══════════════════════════════════════════════════
-        # SEGURANÇA E FRAUDES (Prioridade máxima!)
-        # ═══════════════════════════════════════════════════
-
-        if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['fraude']):
-            if tipo == 'imagem' or 'screenshot' in nome_lower or 'print' in nome_lower:
-                return BASE / "13_SEGURANCA_FRAUDES" / "Evidencias" / "Screenshots" / arquivo.name
-            elif tipo == 'video':
-                return BASE / "13_SEGURANCA_FRAUDES" / "Evidencias" / "Videos" / arquivo.name
-            else:
-                return BASE / "13_SEGURANCA_FRAUDES" / "Fraudes" / "Investigacao" / arquivo.name
-
-        if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['hacking']):
-            if tipo == 'codigo':
-                return BASE / "13_SEGURANCA_FRAUDES" / "Analise_Seguranca" / "Scripts_Suspeitos" / arquivo.name
-            elif tipo == 'video':
-                return BASE / "11_VIDEOS" / "Seguranca" / "Hackers" / arquivo.name
-            elif tipo == 'log':
-                return BASE / "13_SEGURANCA_FRAUDES" / "Analise_Seguranca" / "Logs" / arquivo.name
-            else:
-                return BASE / "13_SEGURANCA_FRAUDES" / "Hacking" / "Tentativas_Invasao" / arquivo.name
+        campos = {'tipo': tipo, 'extensao': arquivo.suffix.lower().replace('.', '')}
+        textos = {'nome': nome_lower, 'texto': texto_completo}
 
-        if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['log_seguranca']):
-            return BASE / "13_SEGURANCA_FRAUDES" / "Hacking" / "Logs_Acesso" / arquivo.name
+        # ASSUNTOS presentes no nome e no conteúdo (uma passada pelo texto)
+        palavras = classificar(arquivo.name, None, conteudo)['assuntos']
+        return campos, textos, palavras
 
-        # Cheques
-        if 'cheque' in texto_completo:
-            if 'estranho' in texto_completo or 'suspeito' in texto_completo or 'devolvido' in texto_completo:
-                return BASE / "13_SEGURANCA_FRAUDES" / "Cheques" / "Suspeitos" / arquivo.name
-            else:
-                return BASE / "13_SEGURANCA_FRAUDES" / "Cheques" / "Analise" / arquivo.name
-
-        # ═══════════════════════════════════════════════════
-        # SCREENSHOTS / PRINTS
-        # ═══════════════════════════════════════════════════
-
-        if tipo == 'imagem' and ('screenshot' in nome_lower or 'screen shot' in nome_lower or
-                                 'captura' in nome_lower or 'print' in nome_lower):
-            if 'erro' in texto_completo or 'bug' in texto_completo:
-                return BASE / "12_PRINTS_TELA" / "Erros" / arquivo.name
-            elif 'comprovante' in texto_completo:
-                return BASE / "12_PRINTS_TELA" / "Evidencias" / "Comprovantes" / arquivo.name
-            else:
-                return BASE / "12_PRINTS_TELA" / "2025" / arquivo.name
-
-        # ═══════════════════════════════════════════════════
-        # VÍDEOS
-        # ═══════════════════════════════════════════════════
-
-        if tipo == 'video':
-            if any(palavra in texto_completo for palavra in ['tutorial', 'aula', 'curso']):
-                return BASE / "11_VIDEOS" / "Tutoriais" / arquivo.name
-            elif any(palavra in texto_completo for palavra in ['reuniao', 'meeting']):
-                return BASE / "11_VIDEOS" / "Reunioes" / arquivo.name
-            elif 'apresentacao' in texto_completo:
-                return BASE / "11_VIDEOS" / "Apresentacoes" / arquivo.name
-            else:
-                return BASE / "11_VIDEOS" / "2025" / arquivo.name
-
-        # ═══════════════════════════════════════════════════
-        # PDFs E DOCUMENTOS
-        # ═══════════════════════════════════════════════════
-
-        if tipo == 'pdf' or tipo == 'documento':
-            # Bancário
-            if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['banco']):
-                if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['comprovante']):
-                    return BASE / "05_BANCOS" / "Comprovantes" / arquivo.name
-                elif any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['cartao']):
-                    return BASE / "05_BANCOS" / "Cartoes" / arquivo.name
-                else:
-                    return BASE / "05_BANCOS" / "Extratos" / arquivo.name
-
-            # Boleto
-            if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['boleto']):
-                ano = datetime.now().year
-                mes = datetime.now().strftime('%B')
-                return BASE / "06_FINANCEIRO" / str(ano) / mes / "Contas_Pagar" / arquivo.name
-
-            # Nota Fiscal
-            if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['nota_fiscal']):
-                return BASE / "07_CLIENTES" / "Notas_Fiscais" / "2025" / arquivo.name
-
-            # Contrato
-            if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['contrato']):
-                return BASE / "02_DOCUMENTOS_EMPRESA" / "Contratos_Socios" / arquivo.name
-
-            # Frete
-            if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['frete']):
-                return BASE / "04_FRETES" / "CTEs" / "2025" / arquivo.name
-
-            # Madeira
-            if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['madeira']):
-                return BASE / "03_MADEIRAS" / "Fornecedores_PR" / "Notas_Fiscais" / arquivo.name
-
-            # Documentos pessoais
-            if any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['cpf']):
-                return BASE / "01_DOCUMENTOS_PESSOAIS" / "CPF" / "Copias" / arquivo.name
-            elif any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['rg']):
-                return BASE / "01_DOCUMENTOS_PESSOAIS" / "RG" / "Copias" / arquivo.name
-            elif any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['cnh']):
-                return BASE / "01_DOCUMENTOS_PESSOAIS" / "CNH" / "Atual" / arquivo.name
-
-            # Genérico
-            return BASE / "01_DOCUMENTOS_PESSOAIS" / arquivo.name
-
-        # ═══════════════════════════════════════════════════
-        # PLANILHAS
-        # ═══════════════════════════════════════════════════
-
-        if tipo == 'planilha':
-            if 'financeiro' in texto_completo or 'fluxo' in texto_completo or 'conta' in texto_completo:
-                return BASE / "06_FINANCEIRO" / "Relatorios" / arquivo.name
-            elif any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['cliente']):
-                return BASE / "07_CLIENTES" / "Cadastros" / arquivo.name
-            elif any(palavra in texto_completo for palavra in self.PALAVRAS_CHAVE['fornecedor']):
-                return BASE / "08_FORNECEDORES" / "Cadastros" / arquivo.name
-            else:
-                return BASE / "06_FINANCEIRO" / "Relatorios" / arquivo.name
-
-        # ═══════════════════════════════════════════════════
-        # CÓDIGO
-        # ═══════════════════════════════════════════════════
-
-        if tipo == 'codigo':
-            if extensao == 'py':
-                return WORKSPACE / "Python" / arquivo.name
-            elif extensao in ['html', 'css', 'js']:
-                return WORKSPACE / "HTML" / arquivo.name
-            elif extensao == 'sh':
-                return WORKSPACE / "Scripts" / arquivo.name
-            else:
-                return WORKSPACE / "Projetos" / arquivo.name
-
-        # ═══════════════════════════════════════════════════
-        # OUTROS
-        # ═══════════════════════════════════════════════════
-
-        if tipo == 'imagem':
-            return WORKSPACE / "Documentos_PDF" / "Imagens" / arquivo.name
-        elif tipo == 'audio':
-            return WORKSPACE / "Documentos_PDF" / "Audio" / arquivo.name
-        elif tipo == 'compactado':
-            return WORKSPACE / "Downloads" / arquivo.name
-        elif tipo == 'dados':
-            return WORKSPACE / "Config" / arquivo.name
-        elif tipo == 'log':
-            return BASE / "13_SEGURANCA_FRAUDES" / "Analise_Seguranca" / "Logs" / arquivo.name
-        else:
-            return WORKSPACE / "Documentos_PDF" / arquivo.name
+    def explicar_destino(self, arquivo):
+        """Explica qual regra escolheu o destino do arquivo (modo --explicar)"""
+        amostra = self._amostrar(arquivo)
+        if amostra is None:
+            return None
+        indice, camada, confianca = amostra[4]
+        explicacao = self.tabela().explicar(*self._entradas_regras(*amostra[:4]))
+        explicacao['arquivo'] = str(amostra[0])
+        explicacao['destino'] = str(self._destino_regra(amostra[0], indice))
+        explicacao['camada'] = camada
+        explicacao['confianca'] = confianca
+        return explicacao
 
     def importar_arquivo(self, arquivo, dry_run=False):
         """Importa um arquivo para o sistema"""
-        info = self.analisar_arquivo(arquivo)
-
-        if not info:
-            stats['erros'] += 1
+        pular, info = self._consultar_diario(arquivo, dry_run)
+        if pular:
             return False
+        if info is None:
+            info = self.analisar_arquivo(arquivo, dry_run)
+        if info is None:
+            self._erro(arquivo, 'arquivo sumiu ou não pôde ser lido')
+            return False
+        return self._mover(info, dry_run)
+
+    def _erro(self, origem, erro):
+        """Conta e registra um arquivo que não pôde ser importado"""
+        self.contadores.somar('erros')
+        self.eventos.registrar('erro', origem=str(origem), erro=str(erro))
 
-        stats['total'] += 1
+    def _mover(self, info, dry_run=False):
+        """Move um arquivo já analisado (seguro para várias threads)"""
+        arquivo = Path(info['origem'])
+
+        self.contadores.somar('total')
 
         # Criar pasta destino
         destino = Path(info['destino'])
-        destino.parent.mkdir(parents=True, exist_ok=True)
-
-        # Verificar se já existe
-        if destino.exists():
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            nome_base = destino.stem
-            extensao = destino.suffix
-            destino = destino.parent / f"{nome_base}_{timestamp}{extensao}"
-            info['destino'] = str(destino)
+        self.pastas.garantir(destino.parent)
+
+        # Verificar se já existe (ou se outra thread vai mover para lá)
+        with self._lock_reservados:
+            if self.pastas.existe(destino) or self.pastas.chave(destino) in self._reservados:
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                nome_base = destino.stem
+                extensao = destino.suffix
+                destino = destino.parent / f"{nome_base}_{timestamp}{extensao}"
+                contador = 1
+                while self.pastas.existe(destino) or self.pastas.chave(destino) in self._reservados:
+                    destino = destino.parent / f"{nome_base}_{timestamp}_{contador}{extensao}"
+                    contador += 1
+                info['destino'] = str(destino)
+            self._reservados.add(self.pastas.chave(destino))
 
         try:
+            # Conteúdo já existe no acervo?
+            existente = None
+            if self.indice is not None:
+                if dry_run:
+                    existente = self.indice.duplicata(arquivo)
+                else:
+                    existente = self.indice.duplicata_ou_registrar(arquivo, destino)
+            if existente is not None:
+                return self._tratar_duplicata(info, arquivo, destino, existente, dry_run)
+
             if dry_run:
                 print(f"   [DRY RUN] {arquivo.name} → {destino.parent.name}/")
             else:
-                shutil.move(str(arquivo), str(destino))
+                try:
+                    with self.registro.operacao('mover', arquivo, destino):
+                        mover_arquivo(arquivo, destino)
+                except Exception:
+                    if self.indice is not None:
+                        self.indice.remover(destino)
+                    raise
+                self.pastas.registrar(destino)
+                if self.indice is not None:
+                    self.indice.confirmar(destino)
                 print(f"   ✓ {info['tipo']}: {arquivo.name} → {destino.parent.name}/")
-
-            stats['movidos'] += 1
+                if self.diario is not None:
+                    self.diario.registrar(arquivo, MOVIDO, str(destino))
 
             # Contabilizar por tipo
-            tipo = info['tipo']
-            stats['por_tipo'][tipo] = stats['por_tipo'].get(tipo, 0) + 1
-            stats['arquivos'].append(info)
+            self.contadores.somar('movidos')
+            self.contadores.somar('por_tipo', grupo=info['tipo'])
+            if 'camada' in info:
+                self.contadores.somar('por_camada', grupo=info['camada'])
+            self.eventos.registrar('simulado' if dry_run else 'movido', **info)
 
             return True
 
         except Exception as e:
             print(f"   ✗ Erro: {arquivo.name} - {e}")
-            stats['erros'] += 1
+            self._erro(arquivo, e)
+            if self.diario is not None and not dry_run:
+                self.diario.registrar(arquivo, FALHOU, str(destino), str(e))
             return False
 
-    def importar(self, dry_run=False):
-        """Importa arquivo ou pasta"""
+        finally:
+            # Em dry-run o destino continua reservado (nada foi criado)
+            if not dry_run:
+                with self._lock_reservados:
+                    self._reservados.discard(self.pastas.chave(destino))
+
+    def _tratar_duplicata(self, info, arquivo, destino, existente, dry_run):
+        """
+        Pula a cópia ou troca por um link para o arquivo que já está no acervo
+
+        Só há link para um arquivo que já está no lugar: se a cópia achada
+        ainda está sendo movida por outra thread (ou sumiu), a origem fica
+        onde está, como em 'pular'.
+        """
+        existente = Path(existente)
+        linkar = (self.duplicatas == 'link' and not dry_run and
+                  not self.indice.em_movimento(existente) and existente.is_file())
+
+        if dry_run:
+            print(f"   [DRY RUN] = {arquivo.name}: cópia de {existente.parent.name}/{existente.name}")
+        elif linkar:
+            with self.registro.operacao('duplicata', arquivo, destino, existente=str(existente)):
+                try:
+                    os.link(existente, destino)
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                        raise
+                    # Outro sistema de arquivos (ou sem suporte a hard link)
+                    os.symlink(existente, destino)
+                if not os.path.isfile(destino):
+                    # A cópia sumiu entre a conferência e o link: a origem fica
+                    os.remove(destino)
+                    raise FileNotFoundError(errno.ENOENT, "cópia do acervo sumiu", str(existente))
+                os.remove(arquivo)
+            self.pastas.registrar(destino)
+            print(f"   🔗 {arquivo.name} → {destino.parent.name}/ (link para {existente.parent.name}/{existente.name})")
+        else:
+            print(f"   = {arquivo.name}: já está em {existente.parent.name}/{existente.name}")
+
+        self.contadores.somar('duplicatas')
+        self.eventos.registrar('duplicata', existente=str(existente), simulado=dry_run,
+                               link=linkar, **info)
+
+        if self.diario is not None and not dry_run:
+            self.diario.registrar(arquivo, MOVIDO, str(existente))
+        return True
+
+    def importar_pipeline(self, arquivos, dry_run=False, workers_leitura=4, workers_pdf=None,
+                          workers_classificacao=1, workers_mover=4, tamanho_fila=256):
+        """
+        Importa vários arquivos num pipeline: leitura -> classificação -> movimentação
+
+        Os estágios são ligados por filas limitadas (a varredura não corre na
+        frente da movimentação); leitura e movimentação usam threads e o texto
+        dos PDFs é extraído num pool de processos. Com diário, arquivos já
+        analisados vão direto para a movimentação e os já concluídos nem
+        entram no pipeline.
+
+        Args:
+            arquivos: Caminhos dos arquivos (pode ser um gerador)
+            workers_leitura: Threads que leem as amostras de conteúdo
+            workers_pdf: Processos que extraem texto de PDF (padrão: núcleos;
+                0 extrai nas threads de leitura, o padrão com um núcleo só).
+                A leitura só entrega o PDF ao pool e segue; a classificação
+                espera o resultado, então todos os processos trabalham juntos
+            workers_classificacao: Threads de classificação
+            workers_mover: Threads que criam pastas e movem arquivos
+            tamanho_fila: Itens máximos em cada fila entre estágios
+        """
+        if workers_pdf is None:
+            # Com um núcleo só o pool não paraleliza nada e só soma IPC
+            nucleos = os.cpu_count() or 1
+            workers_pdf = nucleos if nucleos > 1 else 0
+
+        fila_leitura = queue.Queue(tamanho_fila)
+        fila_classificacao = queue.Queue(tamanho_fila)
+        fila_mover = queue.Queue(tamanho_fila)
+
+        # Pool de PDFs criado só se aparecer algum PDF
+        pool = {}
+        lock_pool = threading.Lock()
+
+        def pool_pdf():
+            if workers_pdf <= 0:
+                return None
+            with lock_pool:
+                if 'pdf' not in pool:
+                    pool['pdf'] = ProcessPoolExecutor(max_workers=workers_pdf)
+                return pool['pdf']
+
+        def amostrar(arquivo):
+            pdf = Path(arquivo).suffix.lower() == '.pdf'
+            amostra = self._amostrar(arquivo, pool_pdf() if pdf else None)
+            if amostra is None:
+                self._erro(arquivo, 'arquivo sumiu ou não pôde ser lido')
+            return amostra
+
+        def classificar(amostra):
+            info = self._classificar(self._concluir_amostra(amostra), dry_run)
+            if info is None:
+                self._erro(amostra[0], 'arquivo sumiu ou não pôde ser lido')
+            return info
+
+        def ao_errar(item, erro):
+            # item é um caminho (leitura), uma amostra (classificação) ou um info (movimentação)
+            if isinstance(item, dict):
+                origem = item['origem']
+            elif isinstance(item, tuple):
+                origem = item[0]
+            else:
+                origem = item
+            self._erro(origem, erro)
+
+        # Cada lote do --watch cria threads novas: a que termina junta seus
+        # contadores à base, senão os pedaços se acumulariam lote a lote
+        encerrar = self.contadores.encerrar_thread
+
+        threads = (
+            _iniciar_estagio(amostrar, fila_leitura, fila_classificacao, workers_leitura, ao_errar,
+                             encerrar) +
+            _iniciar_estagio(classificar, fila_classificacao, fila_mover, workers_classificacao, ao_errar,
+                             encerrar) +
+            _iniciar_estagio(lambda info: self._mover(info, dry_run), fila_mover, None, workers_mover, ao_errar,
+                             encerrar)
+        )
+
+        try:
+            for arquivo in arquivos:
+                pular, info = self._consultar_diario(arquivo, dry_run)
+                if pular:
+                    continue
+                if info is not None:
+                    fila_mover.put(info)
+                else:
+                    fila_leitura.put(arquivo)
+            fila_leitura.put(_FIM)
+
+            for thread in threads:
+                thread.join()
+        finally:
+            if 'pdf' in pool:
+                pool['pdf'].shutdown(cancel_futures=True)
+
+    def vigiar(self, dry_run=False, excluir=(), espera=0.5, duracao=None, **workers):
+        """
+        Importa continuamente os arquivos que chegam na pasta (Linux, inotify)
+
+        Lotes pequenos são importados um a um; lotes maiores (ex.: um zip
+        descompactado) passam pelo pipeline. Cada lote começa com as pastas
+        de destino relidas e sem reservas: entre um lote e outro o usuário
+        pode ter posto arquivos lá (e, em dry-run, as reservas não acumulam).
+
+        Args:
+            espera: Segundos que um arquivo precisa ficar parado antes de ser importado
+            duracao: Parar depois de tantos segundos (None = até Ctrl-C)
+            workers: Concorrência do pipeline (ver importar_pipeline())
+        """
+        def ao_chegar(lote):
+            with self._lock_reservados:
+                self.pastas = EstadoPastas()
+                self._reservados = set()
+            if len(lote) < self.LOTE_PIPELINE:
+                for arquivo in lote:
+                    self.importar_arquivo(arquivo, dry_run)
+            else:
+                self.importar_pipeline(lote, dry_run, **workers)
+
+        VigiaPasta(self.caminho, ao_chegar, excluir, espera).executar(duracao)
+
+    def importar(self, dry_run=False, paralelo=True, excluir=(), max_profundidade=None, **workers):
+        """
+        Importa arquivo ou pasta
+
+        Args:
+            dry_run: Simular sem mover
+            paralelo: Importar pastas com importar_pipeline() (senão, um a um)
+            excluir: Nomes de pastas a ignorar
+            max_profundidade: Limite de subpastas (ver varrer_arquivos())
+            workers: Concorrência de cada estágio (ver importar_pipeline())
+        """
         if not self.caminho.exists():
             print(f"❌ Caminho não encontrado: {self.caminho}")
             return False
 
+        if self.indice is not None and BASE.exists():
+            # Só o que mudou desde a última importação é reindexado
+            print(f"\n🗂️  Indexando {BASE} para achar duplicatas...")
+            contagem = self.indice.sincronizar(BASE, varrer_arquivos(BASE))
+            print(f"   {contagem['novos']} novos, {contagem['alterados']} alterados, "
+                  f"{contagem['removidos']} removidos")
+
         if self.caminho.is_file():
             # Importar um arquivo
             print(f"\n📄 Importando arquivo: {self.caminho.name}")
@@ -361,19 +877,50 @@ class ImportadorUniversal:
             # Importar pasta inteira
             print(f"\n📁 Importando pasta: {self.caminho.name}")
             print(f"   Escaneando arquivos...")
-
-            arquivos = list(self.caminho.rglob('*'))
-            arquivos = [a for a in arquivos if a.is_file() and not a.name.startswith('.')]
-
-            print(f"   Encontrados {len(arquivos)} arquivos")
             print()
 
-            for arquivo in arquivos:
-                self.importar_arquivo(arquivo, dry_run)
+            # A varredura alimenta a importação enquanto ainda está rodando
+            arquivos = varrer_arquivos(self.caminho, excluir, max_profundidade, _mostrar_progresso)
+
+            if paralelo:
+                self.importar_pipeline(arquivos, dry_run, **workers)
+            else:
+                for arquivo in arquivos:
+                    self.importar_arquivo(arquivo, dry_run)
 
         return True
 
 
+def _imprimir_resumo(stats, registro):
+    """Resumo da importação (só dos contadores: nada por arquivo fica em memória)"""
+    print("\n╔═══════════════════════════════════════════════════╗")
+    print("║          📊 RESUMO DA IMPORTAÇÃO                  ║")
+    print("╚═══════════════════════════════════════════════════╝")
+    print(f"\n   Total de arquivos: {stats.get('total', 0)}")
+    print(f"   ✅ Movidos: {stats.get('movidos', 0)}")
+    print(f"   ❌ Erros: {stats.get('erros', 0)}")
+    if stats.get('duplicatas'):
+        print(f"   ♻️  Duplicatas: {stats['duplicatas']}")
+    if stats.get('pulados'):
+        print(f"   ⏭️  Já importados (diário): {stats['pulados']}")
+
+    if stats.get('por_tipo'):
+        print(f"\n   📂 Por tipo:")
+        for tipo, count in sorted(stats['por_tipo'].items(), key=lambda x: x[1], reverse=True):
+            print(f"      • {tipo}: {count}")
+
+    if stats.get('por_camada'):
+        print(f"\n   🔎 Decididos por camada:")
+        for camada in CAMADAS:
+            if camada in stats['por_camada']:
+                print(f"      • {camada}: {stats['por_camada'][camada]}")
+
+    if registro is not None and stats.get('movidos', 0) + stats.get('duplicatas', 0):
+        print(f"\n   ↩️  Para desfazer: {Path(sys.argv[0]).name} --undo {registro.execucao}")
+
+    print()
+
+
 def main():
     import argparse
 
@@ -390,35 +937,131 @@ Exemplos:
 
   # Simular (não mover)
   %(prog)s ~/Downloads --dry-run
+
+  # Retomar uma importação interrompida (pula o que já foi feito)
+  %(prog)s ~/Downloads --diario
+
+  # Não guardar de novo o que já está no acervo
+  %(prog)s ~/Downloads --deduplicar link
+
+  # Registrar cada arquivo processado (uma linha JSON por evento)
+  %(prog)s ~/Downloads --eventos importacao.jsonl
+
+  # Ficar vigiando e importar cada arquivo assim que o download terminar (Linux)
+  %(prog)s ~/Downloads --watch --diario
+
+  # Desfazer uma importação (o número da execução aparece no resumo)
+  %(prog)s --undo 20250301-101500-4242
         """
     )
 
-    parser.add_argument('caminho', help='Arquivo ou pasta para importar')
+    parser.add_argument('caminho', nargs='?', help='Arquivo ou pasta para importar')
     parser.add_argument('--dry-run', action='store_true', help='Simular sem mover arquivos')
+    parser.add_argument('--explicar', action='store_true',
+                        help='Só mostrar (em JSON) qual regra escolheria o destino de cada arquivo')
+    parser.add_argument('--diario', nargs='?', const='padrao', metavar='ARQ',
+                        help='Usar diário de importação (opcionalmente, caminho do SQLite)')
+    parser.add_argument('--deduplicar', nargs='?', const='pular', choices=['pular', 'link'],
+                        help='Não importar cópias de arquivos que já estão no acervo '
+                             '(pular: deixa na origem; link: cria link no destino)')
+    parser.add_argument('--eventos', metavar='ARQ',
+                        help='Registrar cada arquivo processado em JSONL (- para stdout)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Continuar vigiando a pasta e importar o que chegar (Linux, inotify)')
+    parser.add_argument('--espera', type=float, default=0.5,
+                        help='No --watch, segundos que um arquivo fica parado antes de importar (padrão: 0.5)')
+    parser.add_argument('--undo', metavar='EXECUCAO',
+                        help='Desfazer uma execução anterior (só com o registro de operações)')
+    parser.add_argument('--sem-registro', action='store_true',
+                        help='Não registrar as operações (sem recuperação de quedas nem --undo)')
+    parser.add_argument('--registro-estrito', action='store_true',
+                        help='Gravar no disco (fsync) cada operação antes de fazê-la')
+    parser.add_argument('--confianca', type=float, default=LIMIAR_CONFIANCA, metavar='LIMIAR',
+                        help='Confiança (0 a 1) que dispensa ler mais conteúdo '
+                             f'(padrão: {LIMIAR_CONFIANCA}, até a 1ª página/5 KB; acima disso também '
+                             'lê o texto completo; 1 = sempre ler até ter certeza)')
+    parser.add_argument('--excluir', action='append', default=[], metavar='PASTA',
+                        help='Nome de pasta a ignorar (pode repetir)')
+    parser.add_argument('--profundidade', type=int, help='Máximo de níveis de subpastas')
+    parser.add_argument('--sequencial', action='store_true', help='Importar um arquivo por vez (sem pipeline)')
+    parser.add_argument('--workers-leitura', type=int, default=4, help='Threads de leitura de conteúdo (padrão: 4)')
+    parser.add_argument('--workers-pdf', type=int, help='Processos de extração de PDF (padrão: núcleos)')
+    parser.add_argument('--workers-mover', type=int, default=4, help='Threads de movimentação (padrão: 4)')
 
     args = parser.parse_args()
 
+    if args.undo:
+        try:
+            contagem = desfazer(args.undo)
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"↩️  Execução {args.undo} desfeita: " +
+              ", ".join(f"{estado}: {n}" for estado, n in sorted(contagem.items())))
+        return
+
+    if not args.caminho:
+        parser.error('informe o arquivo ou pasta para importar')
+
+    if args.explicar:
+        import json
+        importador = ImportadorUniversal(args.caminho, limiar_confianca=args.confianca)
+        caminho = Path(args.caminho)
+        arquivos = [caminho] if caminho.is_file() else varrer_arquivos(caminho, args.excluir, args.profundidade)
+        for arquivo in arquivos:
+            explicacao = importador.explicar_destino(arquivo)
+            if explicacao:
+                print(json.dumps(explicacao, ensure_ascii=False, indent=2))
+        return
+
+    # Com --eventos -, os prints daqui em diante vão para o stderr
+    eventos = EventosJSONL(args.eventos) if args.eventos else None
+
     print("╔═══════════════════════════════════════════════════╗")
     print("║   🚀 IMPORTADOR UNIVERSAL - ENSIDE                ║")
     print("╚═══════════════════════════════════════════════════╝")
 
-    importador = ImportadorUniversal(args.caminho)
-    importador.importar(dry_run=args.dry_run)
-
-    # Resumo
-    print("\n╔═══════════════════════════════════════════════════╗")
-    print("║          📊 RESUMO DA IMPORTAÇÃO                  ║")
-    print("╚═══════════════════════════════════════════════════╝")
-    print(f"\n   Total de arquivos: {stats['total']}")
-    print(f"   ✅ Movidos: {stats['movidos']}")
-    print(f"   ❌ Erros: {stats['erros']}")
-
-    if stats['por_tipo']:
-        print(f"\n   📂 Por tipo:")
-        for tipo, count in sorted(stats['por_tipo'].items(), key=lambda x: x[1], reverse=True):
-            print(f"      • {tipo}: {count}")
-
-    print()
+    diario = None
+    if args.diario:
+        diario = DiarioImportacao(None if args.diario == 'padrao' else args.diario)
+
+    indice = IndiceConteudo() if args.deduplicar else None
+
+    registro = None
+    if not args.dry_run and not args.sem_registro:
+        registro = RegistroOperacoes(comando=' '.join(sys.argv), estrito=args.registro_estrito)
+
+    importador = ImportadorUniversal(args.caminho, diario=diario, indice=indice,
+                                     duplicatas=args.deduplicar or 'pular', eventos=eventos,
+                                     limiar_confianca=args.confianca, registro=registro)
+    workers = dict(workers_leitura=args.workers_leitura, workers_pdf=args.workers_pdf,
+                   workers_mover=args.workers_mover)
+    try:
+        if args.watch:
+            if not Path(args.caminho).is_dir():
+                print(f"❌ --watch precisa de uma pasta: {args.caminho}")
+                sys.exit(1)
+            print(f"\n👀 Vigiando {args.caminho} (Ctrl-C para parar)\n")
+            try:
+                importador.vigiar(dry_run=args.dry_run, excluir=args.excluir, espera=args.espera, **workers)
+            except KeyboardInterrupt:
+                pass
+        else:
+            importador.importar(dry_run=args.dry_run, paralelo=not args.sequencial,
+                                excluir=args.excluir, max_profundidade=args.profundidade, **workers)
+
+        # Antes de fechar os eventos: com --eventos -, ainda vai para o stderr
+        _imprimir_resumo(importador.contadores.como_dict(), registro)
+    finally:
+        # Também no Ctrl-C: o que foi registrado fica para a próxima execução
+        if diario is not None:
+            diario.fechar()
+        if indice is not None:
+            indice.fechar()
+        if eventos is not None:
+            eventos.fechar()
+        if registro is not None:
+            registro.fechar(**importador.contadores.como_dict())
 
 if __name__ == "__main__":
     main()
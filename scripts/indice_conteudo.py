@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Índice de Conteúdo - Encontra arquivos repetidos no acervo organizado
+Parte da skill organize-pdfs do Claude Code
+
+Para saber se um arquivo já existe no acervo, compara em três níveis, cada
+um só para quem passou no anterior:
+
+    1. tamanho (consulta no índice, sem ler nada)
+    2. hash parcial (início + fim do arquivo)
+    3. hash completo (arquivos grandes são lidos com mmap)
+
+Os hashes são calculados só quando aparece outro arquivo do mesmo tamanho
+e ficam guardados; o índice é atualizado a cada arquivo que chega.
+"""
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Local padrão do índice
+INDICE_PADRAO = Path.home() / ".cache" / "enside" / "indice_conteudo.sqlite"
+
+
+class IndiceConteudo:
+    """Índice persistente (SQLite) de tamanho e hashes dos arquivos do acervo"""
+
+    # Bytes do início e do fim usados no hash parcial
+    BLOCO_PARCIAL = 64 * 1024
+
+    # A partir deste tamanho o hash completo usa mmap
+    LIMITE_MMAP = 4 * 1024 * 1024
+
+    # Bloco de leitura do hash completo (arquivos menores que LIMITE_MMAP)
+    BLOCO_HASH = 1024 * 1024
+
+    def __init__(self, caminho: Optional[str] = None):
+        """
+        Abre (ou cria) o índice
+
+        Args:
+            caminho: Arquivo SQLite (padrão: ~/.cache/enside/indice_conteudo.sqlite)
+        """
+        self.caminho = Path(caminho) if caminho else INDICE_PADRAO
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+
+        # Protege a conexão e _em_movimento; os hashes são calculados fora
+        # dele, e a consulta é refeita antes de registrar: dois arquivos
+        # iguais chegando ao mesmo tempo não passam os dois como novos
+        self._lock = threading.RLock()
+
+        # destino -> origem dos arquivos registrados e ainda sendo movidos
+        self._em_movimento: Dict[str, str] = {}
+
+        self.conn = sqlite3.connect(str(self.caminho), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS arquivos (
+                caminho TEXT PRIMARY KEY,
+                tamanho INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                parcial TEXT,
+                completo TEXT
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tamanho ON arquivos (tamanho)")
+        self.conn.commit()
+
+    # ── Hashes ─────────────────────────────────────────────
+
+    @classmethod
+    def hash_parcial(cls, caminho, tamanho: int) -> str:
+        """SHA-256 do início e do fim do arquivo (o arquivo todo, se for pequeno)"""
+        h = hashlib.sha256()
+        with open(caminho, 'rb') as f:
+            h.update(f.read(cls.BLOCO_PARCIAL))
+            if tamanho > 2 * cls.BLOCO_PARCIAL:
+                f.seek(-cls.BLOCO_PARCIAL, os.SEEK_END)
+                h.update(f.read(cls.BLOCO_PARCIAL))
+            elif tamanho > cls.BLOCO_PARCIAL:
+                h.update(f.read())
+        return h.hexdigest()
+
+    @classmethod
+    def hash_completo(cls, caminho, tamanho: int) -> str:
+        """SHA-256 do arquivo inteiro"""
+        if tamanho <= 2 * cls.BLOCO_PARCIAL:
+            # O hash parcial já cobre o arquivo todo
+            return cls.hash_parcial(caminho, tamanho)
+
+        h = hashlib.sha256()
+        with open(caminho, 'rb') as f:
+            if tamanho >= cls.LIMITE_MMAP:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    h.update(m)
+            else:
+                for bloco in iter(lambda: f.read(cls.BLOCO_HASH), b''):
+                    h.update(bloco)
+        return h.hexdigest()
+
+    # ── Consulta ───────────────────────────────────────────
+
+    def duplicata(self, arquivo) -> Optional[str]:
+        """
+        Arquivo do acervo com o mesmo conteúdo
+
+        Returns:
+            Caminho do arquivo já indexado ou None se o conteúdo é novo
+        """
+        return self._procurar(arquivo, os.stat(arquivo))
+
+    def _procurar(self, arquivo, st, destino=None) -> Optional[str]:
+        """
+        Procura uma cópia de arquivo; sem cópia e com destino, registra em destino
+
+        Os hashes são calculados fora do lock. Antes de registrar, a consulta
+        é refeita sob o lock: um arquivo do mesmo tamanho registrado por outra
+        thread nesse meio-tempo também é conferido.
+        """
+        hashes = {'parcial': None, 'completo': None}
+        conferidos = set()
+        while True:
+            with self._lock:
+                candidatos = self._candidatos(arquivo, st.st_size, conferidos)
+                if not candidatos:
+                    if destino is not None:
+                        # Os hashes já calculados valem para o arquivo no destino
+                        self._indexar(destino, st, hashes['parcial'], hashes['completo'])
+                        self._em_movimento[str(destino)] = str(arquivo)
+                        self.conn.commit()
+                    return None
+
+            existente, alteracoes = self._comparar(arquivo, st.st_size, candidatos, hashes)
+            conferidos.update(candidato[0] for candidato in candidatos)
+
+            with self._lock:
+                self._aplicar(alteracoes)
+                self.conn.commit()
+            if existente is not None:
+                return existente
+
+    def _candidatos(self, arquivo, tamanho: int, conferidos) -> List[Tuple]:
+        """Arquivos indexados do mesmo tamanho ainda não conferidos (chamar com o lock)"""
+        if tamanho == 0:
+            # Arquivos vazios são todos "iguais"; não vale tratar como cópia
+            return []
+
+        candidatos = []
+        for caminho, mtime_ns, parcial_c, completo_c in self.conn.execute(
+                "SELECT caminho, mtime_ns, parcial, completo FROM arquivos WHERE tamanho = ?", (tamanho,)):
+            if caminho == str(arquivo) or caminho in conferidos:
+                continue
+            # Ainda sendo movido: o conteúdo está na origem ou já no destino
+            origem = self._em_movimento.get(caminho)
+            candidatos.append((caminho, origem, mtime_ns, parcial_c, completo_c))
+        return candidatos
+
+    def _comparar(self, arquivo, tamanho: int, candidatos, hashes) -> Tuple[Optional[str], List[Tuple]]:
+        """
+        Confere os candidatos (sem o lock)
+
+        hashes guarda o hash parcial e o completo de arquivo, calculados só
+        quando preciso.
+
+        Returns:
+            (cópia existente ou None, alterações para _aplicar())
+        """
+        alteracoes = []
+        if hashes['parcial'] is None:
+            hashes['parcial'] = self.hash_parcial(arquivo, tamanho)
+
+        for caminho, origem, mtime_ns, parcial_c, completo_c in candidatos:
+            leitura = origem if origem is not None and os.path.exists(origem) else caminho
+
+            # O arquivo indexado pode ter mudado ou sumido desde que foi visto
+            try:
+                st_c = os.stat(leitura)
+            except OSError:
+                if origem is None:
+                    alteracoes.append((caminho, mtime_ns, None, None, None))
+                continue
+            if st_c.st_size != tamanho or st_c.st_mtime_ns != mtime_ns:
+                parcial_c = completo_c = None
+                if st_c.st_size != tamanho:
+                    alteracoes.append((caminho, mtime_ns, st_c, None, None))
+                    continue
+            conhecidos = (parcial_c, completo_c)
+
+            try:
+                if parcial_c is None:
+                    parcial_c = self.hash_parcial(leitura, tamanho)
+                if parcial_c == hashes['parcial']:
+                    if hashes['completo'] is None:
+                        hashes['completo'] = self.hash_completo(arquivo, tamanho)
+                    if completo_c is None:
+                        completo_c = self.hash_completo(leitura, tamanho)
+            except OSError:
+                pass
+
+            if (parcial_c, completo_c) != conhecidos or st_c.st_mtime_ns != mtime_ns:
+                alteracoes.append((caminho, mtime_ns, st_c, parcial_c, completo_c))
+            if completo_c is not None and completo_c == hashes['completo']:
+                return caminho, alteracoes
+
+        return None, alteracoes
+
+    # ── Atualização ────────────────────────────────────────
+
+    def duplicata_ou_registrar(self, arquivo, destino) -> Optional[str]:
+        """
+        Procura uma cópia de arquivo; se não houver, registra o conteúdo em destino
+
+        Chamado antes de mover: o índice passa a conhecer o arquivo já no
+        destino (tamanho e mtime são preservados ao mover). Depois de mover,
+        chame confirmar(destino); se a movimentação falhar, remover(destino).
+
+        Returns:
+            Caminho da cópia já existente ou None (arquivo registrado)
+        """
+        return self._procurar(arquivo, os.stat(arquivo), destino)
+
+    def _aplicar(self, alteracoes):
+        """
+        Grava o que _comparar() descobriu (chamar com o lock)
+
+        Só altera a linha se ela ainda é a que foi conferida (mesmo mtime):
+        o que outra thread registrou nesse meio-tempo prevalece.
+        """
+        for caminho, mtime_ns, st, parcial, completo in alteracoes:
+            if st is None:
+                self.conn.execute("DELETE FROM arquivos WHERE caminho = ? AND mtime_ns = ?",
+                                  (caminho, mtime_ns))
+            else:
+                self.conn.execute(
+                    "UPDATE arquivos SET tamanho = ?, mtime_ns = ?, parcial = ?, completo = ? "
+                    "WHERE caminho = ? AND mtime_ns = ?",
+                    (st.st_size, st.st_mtime_ns, parcial, completo, caminho, mtime_ns)
+                )
+
+    def em_movimento(self, caminho) -> bool:
+        """Se o arquivo foi registrado mas ainda não chegou (ver duplicata_ou_registrar())"""
+        with self._lock:
+            return str(caminho) in self._em_movimento
+
+    def confirmar(self, destino):
+        """Marca como concluída a movimentação de um arquivo registrado"""
+        with self._lock:
+            self._em_movimento.pop(str(destino), None)
+
+    def remover(self, caminho):
+        """Tira um arquivo do índice"""
+        with self._lock:
+            self._em_movimento.pop(str(caminho), None)
+            self.conn.execute("DELETE FROM arquivos WHERE caminho = ?", (str(caminho),))
+            self.conn.commit()
+
+    def _indexar(self, caminho, st, parcial: Optional[str] = None, completo: Optional[str] = None):
+        """Registra (ou atualiza) um arquivo; hashes ausentes são calculados depois, se preciso"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO arquivos (caminho, tamanho, mtime_ns, parcial, completo) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (str(caminho), st.st_size, st.st_mtime_ns, parcial, completo)
+        )
+
+    def sincronizar(self, raiz, arquivos: Iterable) -> Dict[str, int]:
+        """
+        Atualiza o índice com os arquivos atuais de uma pasta
+
+        Só o stat de cada arquivo é lido: arquivos sem mudança mantêm os
+        hashes, os que mudaram perdem os hashes e os que sumiram de raiz
+        saem do índice.
+
+        Args:
+            raiz: Pasta varrida
+            arquivos: Arquivos encontrados em raiz (ex.: varrer_arquivos(raiz))
+
+        Returns:
+            {'novos', 'alterados', 'removidos'}
+        """
+        raiz = os.fspath(raiz).rstrip(os.sep)
+        # Faixa de caminhos dentro de raiz ('0' é o caractere seguinte a '/')
+        inicio, fim = raiz + os.sep, raiz + chr(ord(os.sep) + 1)
+        contagem = {'novos': 0, 'alterados': 0, 'removidos': 0}
+
+        with self._lock:
+            conhecidos: Dict[str, Tuple[int, int]] = {
+                caminho: (tamanho, mtime_ns)
+                for caminho, tamanho, mtime_ns in self.conn.execute(
+                    "SELECT caminho, tamanho, mtime_ns FROM arquivos WHERE caminho >= ? AND caminho < ?",
+                    (inicio, fim)
+                )
+            }
+
+            for arquivo in arquivos:
+                caminho = str(arquivo)
+                try:
+                    st = os.stat(caminho)
+                except OSError:
+                    continue
+                anterior = conhecidos.pop(caminho, None)
+                if anterior == (st.st_size, st.st_mtime_ns):
+                    continue
+                contagem['novos' if anterior is None else 'alterados'] += 1
+                self._indexar(caminho, st)
+
+            self.conn.executemany("DELETE FROM arquivos WHERE caminho = ?", ((c,) for c in conhecidos))
+            contagem['removidos'] = len(conhecidos)
+            self.conn.commit()
+
+        return contagem
+
+    def fechar(self):
+        """Grava o que estiver pendente e fecha o índice"""
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Métricas - Tempo por etapa e contadores do processamento
+Parte da skill organize-pdfs do Claude Code
+
+Opcional: quem não pede métricas usa SEM_MEDICAO, um contexto vazio
+compartilhado, e não paga nada além de um `with`.
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict
+
+# Contexto usado quando as métricas estão desligadas
+SEM_MEDICAO = nullcontext()
+
+
+class Metricas:
+    """Acumula tempo de parede/CPU por etapa e contadores"""
+
+    def __init__(self):
+        # etapa -> [chamadas, parede_s, cpu_s, max_parede_s]
+        self.etapas: Dict[str, list] = {}
+        self.contadores: Dict[str, int] = {}
+
+    @contextmanager
+    def etapa(self, nome: str):
+        """Mede o bloco `with` como uma chamada da etapa"""
+        parede = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.registrar(nome, time.perf_counter() - parede, time.thread_time() - cpu)
+
+    def registrar(self, nome: str, parede: float, cpu: float, chamadas: int = 1,
+                  max_parede: float = None):
+        """Soma uma medição à etapa"""
+        etapa = self.etapas.get(nome)
+        if etapa is None:
+            etapa = self.etapas[nome] = [0, 0.0, 0.0, 0.0]
+        etapa[0] += chamadas
+        etapa[1] += parede
+        etapa[2] += cpu
+        etapa[3] = max(etapa[3], parede if max_parede is None else max_parede)
+
+    def contar(self, nome: str, n: int = 1):
+        """Soma n ao contador"""
+        self.contadores[nome] = self.contadores.get(nome, 0) + n
+
+    def acumular(self, metricas: Dict):
+        """Soma as métricas de outro documento (formato de como_dict())"""
+        for nome, etapa in metricas.get('etapas', {}).items():
+            self.registrar(nome, etapa['parede_ms'] / 1000, etapa['cpu_ms'] / 1000,
+                           etapa['chamadas'], etapa['max_parede_ms'] / 1000)
+        for nome, n in metricas.get('contadores', {}).items():
+            self.contar(nome, n)
+
+    def como_dict(self) -> Dict:
+        """Métricas em formato JSON (tempos em milissegundos)"""
+        return {
+            'etapas': {
+                nome: {
+                    'chamadas': chamadas,
+                    'parede_ms': round(parede * 1000, 3),
+                    'cpu_ms': round(cpu * 1000, 3),
+                    'max_parede_ms': round(maximo * 1000, 3)
+                }
+                for nome, (chamadas, parede, cpu, maximo) in self.etapas.items()
+            },
+            'contadores': dict(self.contadores)
+        }
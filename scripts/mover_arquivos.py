@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Mover Arquivos - Move arquivos entre pastas e volumes
+Parte da skill organize-pdfs do Claude Code
+
+No mesmo volume, mover é só renomear. Entre volumes (ex.: Downloads num
+disco e /Users/Shared em outro), a cópia:
+
+    - usa cópia no kernel (copy_file_range, senão sendfile, senão pread/pwrite)
+    - vai para um arquivo parcial oculto no destino, retomado se a cópia
+      for interrompida (o nome do parcial inclui tamanho e mtime da origem)
+    - é conferida por hash e gravada no disco (com a entrada na pasta)
+      antes de apagar a origem
+    - limita quantos arquivos grandes são copiados ao mesmo tempo
+
+Para pôr o mesmo arquivo em várias pastas, copiar_arquivo() usa a forma
+mais econômica que o sistema de arquivos aceitar (ESTRATEGIAS_COPIA).
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from indice_conteudo import IndiceConteudo
+
+# Erros que indicam que o método de cópia não serve para esse par de arquivos
+_SEM_SUPORTE = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL,
+                errno.ENOTSOCK, errno.EBADF}
+
+# Formas de pôr mais uma cópia de um arquivo, da mais econômica para a mais cara:
+# reflink (blocos divididos até alguém alterar), hardlink (mesmo inode),
+# symlink (aponta para o original) e cópia completa
+ESTRATEGIAS_COPIA = ('reflink', 'hardlink', 'symlink', 'copia')
+
+# Erros que indicam que a estratégia não serve nesse sistema de arquivos/volume
+_SEM_SUPORTE_COPIA = _SEM_SUPORTE | {errno.ENOTTY, errno.EPERM, errno.EMLINK, errno.ENOTSUP}
+
+# ioctl FICLONE do Linux (<linux/fs.h>)
+_FICLONE = 0x40049409
+
+
+def _sincronizar_pasta(pasta):
+    """fsync da pasta: as entradas criadas ou renomeadas nela vão para o disco"""
+    fd_pasta = os.open(pasta, os.O_RDONLY)
+    try:
+        os.fsync(fd_pasta)
+    finally:
+        os.close(fd_pasta)
+
+
+class MovedorArquivos:
+    """Move arquivos renomeando (mesmo volume) ou copiando com retomada (entre volumes)"""
+
+    # Bytes por chamada de cópia
+    BLOCO = 64 * 1024 * 1024
+
+    # Arquivos a partir deste tamanho contam no limite de cópias simultâneas
+    LIMITE_GRANDE = 256 * 1024 * 1024
+
+    def __init__(self, copias_grandes: int = 2, verificar: bool = True,
+                 progresso: Optional[Callable[[str, int, int], None]] = None):
+        """
+        Args:
+            copias_grandes: Máximo de arquivos grandes copiados ao mesmo tempo
+            verificar: Conferir o hash da cópia antes de apagar a origem
+            progresso: Função chamada com (nome, copiados, total) durante a
+                cópia de arquivos grandes
+        """
+        self.verificar = verificar
+        self.progresso = progresso
+        self._grandes = threading.BoundedSemaphore(copias_grandes)
+
+        # Métodos de cópia ainda disponíveis (desligados no primeiro erro de suporte)
+        self._metodos = [m for m in ('copy_file_range', 'sendfile') if hasattr(os, m)]
+
+    def mover(self, origem, destino) -> str:
+        """
+        Move origem para destino (substitui destino, como shutil.move)
+
+        Returns:
+            'renomeado' ou 'copiado'
+        """
+        origem, destino = Path(origem), Path(destino)
+
+        st = os.lstat(origem)
+        if not os.path.isfile(origem) or os.path.islink(origem):
+            # Pastas e links: o shutil já faz o certo
+            shutil.move(str(origem), str(destino))
+            return 'renomeado'
+
+        if st.st_dev == os.stat(destino.parent).st_dev:
+            try:
+                os.rename(origem, destino)
+                return 'renomeado'
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+
+        if st.st_size >= self.LIMITE_GRANDE:
+            with self._grandes:
+                self._copiar(origem, destino, st)
+        else:
+            self._copiar(origem, destino, st)
+
+        os.unlink(origem)
+        return 'copiado'
+
+    def _copiar(self, origem: Path, destino: Path, st):
+        """Copia para um parcial no destino, confere e troca pelo nome final"""
+        parcial = destino.parent / f".{destino.name}.{st.st_size}-{st.st_mtime_ns}.parcial"
+
+        if st.st_size >= self.LIMITE_GRANDE:
+            # Parciais de versões anteriores da origem não serão retomados
+            for antigo in destino.parent.glob(f".{destino.name}.*.parcial"):
+                if antigo != parcial:
+                    antigo.unlink(missing_ok=True)
+
+        inicio = self._copiar_para(origem, parcial, st.st_size, destino.name, retomar=True)
+
+        if self.verificar and not self._confere(origem, parcial, st.st_size):
+            # Uma retomada pode ter herdado bytes ruins: copiar tudo de novo uma vez
+            if inicio > 0:
+                self._copiar_para(origem, parcial, st.st_size, destino.name, retomar=False)
+            if inicio == 0 or not self._confere(origem, parcial, st.st_size):
+                parcial.unlink()
+                raise OSError(f"Cópia de {origem.name} não confere com a origem (hash diferente)")
+
+        shutil.copystat(origem, parcial)
+        os.replace(parcial, destino)
+        # A troca de nome precisa estar no disco antes de a origem ser apagada
+        _sincronizar_pasta(destino.parent)
+
+    def _copiar_para(self, origem: Path, parcial: Path, total: int, nome: str, retomar: bool) -> int:
+        """Copia origem para parcial, continuando do fim do parcial se retomar; devolve o início"""
+        # Sem O_APPEND: copy_file_range e pwrite precisam escrever na posição pedida
+        fd_out = os.open(parcial, os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            inicio = os.fstat(fd_out).st_size if retomar else 0
+            if inicio > total:
+                inicio = 0
+            os.ftruncate(fd_out, inicio)
+            with open(origem, 'rb') as f_in:
+                self._copiar_dados(f_in.fileno(), fd_out, inicio, total, nome)
+            os.fsync(fd_out)
+        finally:
+            os.close(fd_out)
+        return inicio
+
+    @staticmethod
+    def _confere(origem: Path, copia: Path, tamanho: int) -> bool:
+        """Se a cópia tem o mesmo hash da origem"""
+        return IndiceConteudo.hash_completo(origem, tamanho) == IndiceConteudo.hash_completo(copia, tamanho)
+
+    def _copiar_dados(self, fd_in: int, fd_out: int, inicio: int, total: int, nome: str):
+        """Copia os bytes [inicio, total) de fd_in para a mesma posição em fd_out"""
+        posicao = inicio
+        avisar = self.progresso is not None and total >= self.LIMITE_GRANDE
+
+        while posicao < total:
+            copiados = self._copiar_bloco(fd_in, fd_out, posicao, min(self.BLOCO, total - posicao))
+            if copiados == 0:
+                raise OSError(f"{nome}: origem terminou antes do esperado")
+            posicao += copiados
+            if avisar:
+                self.progresso(nome, posicao, total)
+
+    def _copiar_bloco(self, fd_in: int, fd_out: int, posicao: int, quantidade: int) -> int:
+        """Copia até quantidade bytes a partir de posicao com o melhor método disponível"""
+        while self._metodos:
+            metodo = self._metodos[0]
+            try:
+                if metodo == 'copy_file_range':
+                    return os.copy_file_range(fd_in, fd_out, quantidade, posicao, posicao)
+                os.lseek(fd_out, posicao, os.SEEK_SET)
+                return os.sendfile(fd_out, fd_in, posicao, quantidade)
+            except OSError as e:
+                if e.errno not in _SEM_SUPORTE:
+                    raise
+                # Não serve aqui (outro sistema de arquivos, macOS...): tentar o próximo
+                if self._metodos and self._metodos[0] == metodo:
+                    self._metodos.pop(0)
+
+        dados = os.pread(fd_in, min(quantidade, 1024 * 1024), posicao)
+        os.pwrite(fd_out, dados, posicao)
+        return len(dados)
+
+
+def clonar_arquivo(origem, destino):
+    """
+    Cópia por reflink (Btrfs, XFS, APFS): o destino divide os blocos com a origem
+
+    Raises:
+        OSError: se o sistema de arquivos não suporta (ex.: ext4, volumes diferentes)
+    """
+    if sys.platform == 'darwin':
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        clonefile = getattr(libc, 'clonefile', None)
+        if clonefile is None:
+            raise OSError(errno.ENOTSUP, "clonefile indisponível")
+        # clonefile já copia permissões e datas
+        if clonefile(os.fsencode(origem), os.fsencode(destino), 0) != 0:
+            numero = ctypes.get_errno()
+            raise OSError(numero, f"clonefile: {os.strerror(numero)}")
+        return
+
+    import fcntl
+    with open(origem, 'rb') as f_in:
+        fd_out = os.open(destino, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            fcntl.ioctl(fd_out, _FICLONE, f_in.fileno())
+        except OSError:
+            os.close(fd_out)
+            os.unlink(destino)
+            raise
+        os.close(fd_out)
+    shutil.copystat(origem, destino)
+
+
+def copiar_arquivo(origem, destino, estrategias: Sequence[str] = ('copia',)) -> str:
+    """
+    Põe em destino mais uma cópia de origem
+
+    Tenta as estratégias na ordem dada (ver ESTRATEGIAS_COPIA) e passa para
+    a seguinte quando o sistema de arquivos não aceita a anterior. O
+    symlink aponta para o caminho absoluto de origem.
+
+    Returns:
+        Estratégia usada
+    """
+    for posicao, estrategia in enumerate(estrategias):
+        try:
+            if estrategia == 'reflink':
+                clonar_arquivo(origem, destino)
+            elif estrategia == 'hardlink':
+                os.link(origem, destino)
+            elif estrategia == 'symlink':
+                os.symlink(os.path.abspath(origem), destino)
+            elif estrategia == 'copia':
+                shutil.copy2(origem, destino)
+            else:
+                raise ValueError(f"Estratégia de cópia desconhecida: {estrategia}")
+            return estrategia
+        except OSError as e:
+            if e.errno not in _SEM_SUPORTE_COPIA or posicao == len(estrategias) - 1:
+                raise
+    raise ValueError("Nenhuma estratégia de cópia")
+
+
+def _mostrar_progresso(nome: str, copiados: int, total: int):
+    """Progresso da cópia de um arquivo grande (stderr)"""
+    print(f"   ⏳ {nome}: {copiados * 100 // total}% ({copiados // 2**20}/{total // 2**20} MB)",
+          file=sys.stderr)
+
+
+# Movedor compartilhado pelos organizadores
+_movedor = None
+_lock_movedor = threading.Lock()
+
+
+def movedor() -> MovedorArquivos:
+    """Movedor padrão do processo (com progresso no stderr)"""
+    global _movedor
+    with _lock_movedor:
+        if _movedor is None:
+            _movedor = MovedorArquivos(progresso=_mostrar_progresso)
+        return _movedor
+
+
+def mover_arquivo(origem, destino) -> str:
+    """Move um arquivo com o movedor padrão (ver MovedorArquivos.mover())"""
+    return movedor().mover(origem, destino)
@@ -5,11 +5,15 @@ Parte da skill organize-pdfs do Claude Code
 """
 
 import sys
+import os
 import json
 import re
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import heapq
 
 try:
     import PyPDF2
@@ -17,43 +21,227 @@ except ImportError:
     print("ERRO: PyPDF2 não instalado. Execute: pip install PyPDF2", file=sys.stderr)
     sys.exit(1)
 
+from automato_palavras import AutomatoPalavras
+from classificacao import AUTOMATO, BANCOS, TIPOS_DOCUMENTO, banco_encontrado, tipo_documento_encontrado
+from metricas import Metricas, SEM_MEDICAO
+from validacao_documentos import (
+    cpf_digitos_validos, cnpj_digitos_validos, cpfs_validos, cnpjs_validos
+)
+
+
+# Remove a pontuação de CPF/CNPJ (mais barato que re.sub por candidato)
+_SEM_PONTUACAO = str.maketrans('', '', './-')
+
+
+class ScannerEntidades:
+    """
+    Encontra CPFs, CNPJs, datas e valores numa única passada pelo texto
+
+    Uma regex pré-compilada localiza os blocos numéricos (dígitos com . , / -);
+    os padrões de cada entidade só rodam dentro dos blocos que podem contê-los.
+    Como nenhum padrão atravessa um bloco, o resultado é o mesmo de rodar cada
+    padrão no texto inteiro. Os valores ficam num heap limitado aos N maiores.
+    Os candidatos a CPF/CNPJ são validados em lote (validacao_documentos) quando
+    cpfs/cnpjs são consultados.
+    """
+
+    # Bloco numérico: todo CPF/CNPJ/data/valor cabe inteiro em um
+    BLOCO = re.compile(r'\d[\d./,\-]*')
+
+    CPF = re.compile(r'\b\d{3}\.?\d{3}\.?\d{3}-?\d{2}\b')
+    CNPJ = (
+        re.compile(r'\b\d{2}\.?\d{3}\.?\d{3}/?0001-?\d{2}\b'),
+        re.compile(r'\b\d{14}\b'),
+    )
+    DATAS = (
+        re.compile(r'\b\d{2}/\d{2}/\d{4}\b'),
+        re.compile(r'\b\d{2}-\d{2}-\d{4}\b'),
+        re.compile(r'\b\d{4}-\d{2}-\d{2}\b'),
+    )
+    VALOR = re.compile(r'\d{1,3}(?:\.\d{3})*,\d{2}')
+
+    def __init__(self, max_valores: int = 10):
+        self.max_valores = max_valores
+        self._cpfs = set()
+        self._cnpjs = set()
+        self.datas = set()
+        self._valores = []  # heap de (valor, -sem_prefixo, -posicao, texto)
+
+        # Candidatos (só dígitos) ainda não validados e já vistos
+        self._pendentes_cpf = set()
+        self._pendentes_cnpj = set()
+        self._vistos = set()
+        self.candidatos_cpf = 0
+        self.candidatos_cnpj = 0
+
+    @property
+    def cpfs(self) -> Set[str]:
+        """CPFs válidos encontrados (formatados)"""
+        self._validar_pendentes()
+        return self._cpfs
+
+    @property
+    def cnpjs(self) -> Set[str]:
+        """CNPJs válidos encontrados (formatados)"""
+        self._validar_pendentes()
+        return self._cnpjs
+
+    def _validar_pendentes(self):
+        """Valida de uma vez todos os candidatos acumulados"""
+        if self._pendentes_cpf:
+            pendentes = list(self._pendentes_cpf)
+            self.candidatos_cpf += len(pendentes)
+            for cpf, ok in zip(pendentes, cpfs_validos(pendentes)):
+                if ok:
+                    self._cpfs.add(f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}")
+            self._pendentes_cpf.clear()
+
+        if self._pendentes_cnpj:
+            pendentes = list(self._pendentes_cnpj)
+            self.candidatos_cnpj += len(pendentes)
+            for cnpj, ok in zip(pendentes, cnpjs_validos(pendentes)):
+                if ok:
+                    self._cnpjs.add(f"{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}")
+            self._pendentes_cnpj.clear()
+
+    def varrer(self, texto: str, inicio: int = 0, fim: Optional[int] = None,
+               deslocamento: int = 0):
+        """
+        Varre texto[inicio:fim] acumulando as entidades encontradas
+
+        Args:
+            texto: Texto completo (o contexto fora do intervalo é usado nas bordas)
+            inicio: Posição inicial da varredura
+            fim: Posição final (padrão: fim do texto)
+            deslocamento: Somado às posições (ordem estável entre trechos)
+        """
+        fim = len(texto) if fim is None else fim
+        cpf_finditer = self.CPF.finditer
+        data_barra, data_traco, data_iso = self.DATAS
+        vistos = self._vistos
+
+        for bloco in self.BLOCO.finditer(texto, inicio, fim):
+            ini, fim_bloco = bloco.span()
+            tamanho = fim_bloco - ini
+            if tamanho < 4:
+                continue
+
+            grupo = bloco.group()
+            # Inclui o caractere seguinte para \b enxergar a borda real
+            limite = fim_bloco + 1
+
+            if tamanho >= 11:
+                for m in cpf_finditer(texto, ini, limite):
+                    cpf = m.group().translate(_SEM_PONTUACAO)
+                    if cpf not in vistos:
+                        vistos.add(cpf)
+                        self._pendentes_cpf.add(cpf)
+
+                if tamanho >= 14:
+                    for padrao in self.CNPJ:
+                        for m in padrao.finditer(texto, ini, limite):
+                            cnpj = m.group().translate(_SEM_PONTUACAO)
+                            if cnpj not in vistos:
+                                vistos.add(cnpj)
+                                self._pendentes_cnpj.add(cnpj)
+
+            if tamanho >= 10:
+                if '/' in grupo:
+                    for m in data_barra.finditer(texto, ini, limite):
+                        self.datas.add(m.group())
+                if '-' in grupo:
+                    for m in data_traco.finditer(texto, ini, limite):
+                        self.datas.add(m.group())
+                    for m in data_iso.finditer(texto, ini, limite):
+                        self.datas.add(m.group())
+
+            if ',' in grupo:
+                self._varrer_valores(texto, ini, limite, deslocamento)
+
+    def _varrer_valores(self, texto: str, ini: int, limite: int, deslocamento: int):
+        """Encontra os valores monetários de um bloco"""
+        for m in self.VALOR.finditer(texto, ini, limite):
+            sem_prefixo = 1
+            valor_texto = m.group()
+
+            # "R$" só pode preceder um valor que começa no início do bloco
+            if m.start() == ini:
+                j = ini
+                while j > 0 and texto[j - 1].isspace():
+                    j -= 1
+                if texto[max(0, j - 2):j] == 'R$':
+                    sem_prefixo = 0
+                    valor_texto = texto[j - 2:ini] + valor_texto
+
+            try:
+                valor_float = float(m.group().replace('.', '').replace(',', '.'))
+            except ValueError:
+                continue
+            if valor_float <= 0:  # Ignorar valores zero
+                continue
+
+            item = (valor_float, -sem_prefixo, -(deslocamento + m.start()), valor_texto)
+            if len(self._valores) < self.max_valores:
+                heapq.heappush(self._valores, item)
+            elif item > self._valores[0]:
+                heapq.heapreplace(self._valores, item)
+
+    def valores(self) -> List[Dict]:
+        """Maiores valores encontrados, em ordem decrescente"""
+        return [
+            {'texto': texto, 'valor': valor}
+            for valor, _, _, texto in sorted(self._valores, reverse=True)
+        ]
+
 
 class PDFProcessor:
     """Processa PDFs e extrai informações relevantes"""
 
-    # Bancos brasileiros conhecidos
-    BANCOS = {
-        'itau': ['itau', 'itaú', 'banco itau', 'banco itaú'],
-        'bradesco': ['bradesco', 'banco bradesco'],
-        'santander': ['santander', 'banco santander'],
-        'bb': ['banco do brasil', 'bb', 'banco brasil'],
-        'caixa': ['caixa', 'caixa econômica', 'caixa economica', 'cef'],
-        'nubank': ['nubank', 'nu pagamentos'],
-        'inter': ['inter', 'banco inter'],
-        'sicoob': ['sicoob'],
-        'sicredi': ['sicredi'],
-        'safra': ['safra', 'banco safra']
-    }
-
-    # Tipos de documento
-    TIPOS_DOCUMENTO = {
-        'extrato': ['extrato', 'saldo', 'lançamentos', 'lancamentos', 'movimentação', 'movimentacao'],
-        'comprovante': ['comprovante', 'transferência', 'transferencia', 'pix', 'ted', 'doc'],
-        'cartao': ['cartão', 'cartao', 'fatura', 'crédito', 'credito', 'débito', 'debito'],
-        'contrato': ['contrato', 'partes', 'cláusula', 'clausula', 'contratante', 'contratado'],
-        'nota_fiscal': ['nota fiscal', 'nf-e', 'nfe', 'danfe', 'invoice'],
-        'romaneio': ['romaneio', 'madeira', 'm³', 'm3', 'tora', 'cubagem'],
-        'frete': ['frete', 'transporte', 'carga', 'ctrc', 'conhecimento'],
-        'boleto': ['boleto', 'código de barras', 'codigo de barras', 'linha digitável', 'linha digitavel'],
-        'recibo': ['recibo', 'recebi', 'pagamento']
-    }
-
-    def __init__(self, pdf_path: str):
+    # Versão da extração/identificação (mudar invalida o cache de extração)
+    VERSAO_EXTRATOR = "4"
+
+    # Campos derivados do conteúdo (guardados no cache de extração)
+    CAMPOS_CACHE = ['cpfs', 'cnpjs', 'banco', 'tipo_documento', 'datas',
+                    'valores', 'palavras_chave', 'texto_preview', 'erro',
+                    'paginas_lidas', 'paginas_total', 'triagem', 'fluxo']
+
+    # Triagem: orçamento de páginas e confiança mínima para parar antes
+    TRIAGEM_MAX_PAGINAS = 3
+    TRIAGEM_MIN_OCORRENCIAS_BANCO = 1
+    TRIAGEM_MIN_PALAVRAS_TIPO = 2
+
+    # Fluxo: caracteres da página anterior mantidos como contexto
+    FLUXO_SOBREPOSICAO = 256
+
+    # Bancos e tipos de documento (tabelas comuns, ver classificacao.py)
+    BANCOS = BANCOS
+    TIPOS_DOCUMENTO = TIPOS_DOCUMENTO
+
+    def __init__(self, pdf_path: str, cache=None, triagem: bool = False,
+                 max_paginas: int = None, fluxo: bool = False, metricas: bool = False):
+        """
+        Args:
+            pdf_path: Caminho do PDF
+            cache: CacheExtracao opcional (evita reprocessar PDFs já vistos)
+            triagem: Se True, lê só as primeiras páginas (ver triar())
+            max_paginas: Orçamento de páginas da triagem
+            fluxo: Se True, processa página a página sem guardar o texto
+                inteiro (ver processar_fluxo())
+            metricas: Se True, mede o tempo de cada etapa e adiciona
+                info['metricas']
+        """
         self.pdf_path = Path(pdf_path)
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF não encontrado: {pdf_path}")
 
+        self.cache = cache
+        self.triagem = triagem
+        self.fluxo = fluxo
+        self.max_paginas = max_paginas or self.TRIAGEM_MAX_PAGINAS
         self.text = ""
+        self.motivo_falha = None
+        self._palavras_encontradas = None
+        self.metricas = Metricas() if metricas else None
         self.info = {
             'arquivo': str(self.pdf_path),
             'nome_arquivo': self.pdf_path.name,
@@ -68,228 +256,514 @@ class PDFProcessor:
             'palavras_chave': []
         }
 
-    def extrair_texto(self) -> str:
-        """Extrai todo o texto do PDF"""
+    def _etapa(self, nome: str):
+        """Contexto que mede uma etapa (vazio se as métricas estão desligadas)"""
+        if self.metricas is None:
+            return SEM_MEDICAO
+        return self.metricas.etapa(nome)
+
+    def paginas(self) -> Iterator[str]:
+        """Extrai o texto do PDF página a página, sob demanda"""
+        metricas = self.metricas
         try:
             with open(self.pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
+                with self._etapa('abrir'):
+                    reader = PyPDF2.PdfReader(file)
+                    protegido = reader.is_encrypted
+                    if not protegido:
+                        self.info['paginas_total'] = len(reader.pages)
 
                 # Verificar se está protegido
-                if reader.is_encrypted:
+                if protegido:
                     print(f"AVISO: PDF protegido por senha", file=sys.stderr)
-                    return ""
+                    self.motivo_falha = 'PDF protegido por senha'
+                    return
 
-                # Extrair texto de todas as páginas
-                text_parts = []
                 for page_num, page in enumerate(reader.pages):
+                    self.info['paginas_lidas'] = page_num + 1
                     try:
-                        text_parts.append(page.extract_text())
+                        with self._etapa('extrair_pagina'):
+                            texto = page.extract_text()
                     except Exception as e:
                         print(f"Erro ao extrair página {page_num + 1}: {e}", file=sys.stderr)
-
-                self.text = "\n".join(text_parts)
-                return self.text
+                        continue
+                    if metricas is not None:
+                        metricas.contar('paginas')
+                        metricas.contar('caracteres', len(texto))
+                    yield texto
 
         except Exception as e:
             print(f"ERRO ao processar PDF: {e}", file=sys.stderr)
-            return ""
+            self.motivo_falha = f'Erro ao ler PDF: {e}'
+
+    def extrair_texto(self) -> str:
+        """Extrai todo o texto do PDF"""
+        self.text = "\n".join(self.paginas())
+        return self.text
 
     def validar_cpf(self, cpf: str) -> bool:
         """Valida CPF com dígito verificador"""
-        cpf = re.sub(r'\D', '', cpf)
-        if len(cpf) != 11 or cpf == cpf[0] * 11:
-            return False
-
-        # Cálculo do primeiro dígito
-        soma = sum(int(cpf[i]) * (10 - i) for i in range(9))
-        digito1 = (soma * 10 % 11) % 10
-
-        # Cálculo do segundo dígito
-        soma = sum(int(cpf[i]) * (11 - i) for i in range(10))
-        digito2 = (soma * 10 % 11) % 10
-
-        return cpf[-2:] == f"{digito1}{digito2}"
+        return cpf_digitos_validos(re.sub(r'\D', '', cpf))
 
     def validar_cnpj(self, cnpj: str) -> bool:
         """Valida CNPJ com dígito verificador"""
-        cnpj = re.sub(r'\D', '', cnpj)
-        if len(cnpj) != 14:
-            return False
-
-        # Cálculo do primeiro dígito
-        pesos1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-        soma = sum(int(cnpj[i]) * pesos1[i] for i in range(12))
-        digito1 = (soma % 11)
-        digito1 = 0 if digito1 < 2 else 11 - digito1
-
-        # Cálculo do segundo dígito
-        pesos2 = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-        soma = sum(int(cnpj[i]) * pesos2[i] for i in range(13))
-        digito2 = (soma % 11)
-        digito2 = 0 if digito2 < 2 else 11 - digito2
-
-        return cnpj[-2:] == f"{digito1}{digito2}"
+        return cnpj_digitos_validos(re.sub(r'\D', '', cnpj))
+
+    def escanear_entidades(self) -> ScannerEntidades:
+        """Encontra CPFs, CNPJs, datas e valores numa única passada"""
+        scanner = ScannerEntidades()
+        with self._etapa('escanear_entidades'):
+            scanner.varrer(self.text)
+
+        self._preencher_entidades(scanner)
+        return scanner
+
+    def _preencher_entidades(self, scanner: ScannerEntidades):
+        """Valida os candidatos do scanner e copia as entidades para info"""
+        with self._etapa('validar_documentos'):
+            self.info['cpfs'] = sorted(scanner.cpfs)
+            self.info['cnpjs'] = sorted(scanner.cnpjs)
+        self.info['datas'] = sorted(scanner.datas)
+        self.info['valores'] = scanner.valores()
+
+        if self.metricas is not None:
+            self.metricas.contar('candidatos_cpf', scanner.candidatos_cpf)
+            self.metricas.contar('cpfs_validos', len(self.info['cpfs']))
+            self.metricas.contar('candidatos_cnpj', scanner.candidatos_cnpj)
+            self.metricas.contar('cnpjs_validos', len(self.info['cnpjs']))
 
     def identificar_cpfs(self) -> List[str]:
         """Encontra e valida CPFs no texto"""
-        # Padrões: 123.456.789-00 ou 12345678900
-        patterns = [
-            r'\b\d{3}\.?\d{3}\.?\d{3}-?\d{2}\b'
-        ]
-
-        cpfs_encontrados = set()
-        for pattern in patterns:
-            matches = re.finditer(pattern, self.text)
-            for match in matches:
-                cpf = match.group()
-                if self.validar_cpf(cpf):
-                    cpf_limpo = re.sub(r'\D', '', cpf)
-                    cpf_formatado = f"{cpf_limpo[:3]}.{cpf_limpo[3:6]}.{cpf_limpo[6:9]}-{cpf_limpo[9:]}"
-                    cpfs_encontrados.add(cpf_formatado)
-
-        self.info['cpfs'] = sorted(list(cpfs_encontrados))
+        self.escanear_entidades()
         return self.info['cpfs']
 
     def identificar_cnpjs(self) -> List[str]:
         """Encontra e valida CNPJs no texto"""
-        # Padrões: 12.345.678/0001-00 ou 12345678000100
-        patterns = [
-            r'\b\d{2}\.?\d{3}\.?\d{3}/?0001-?\d{2}\b',
-            r'\b\d{14}\b'
-        ]
-
-        cnpjs_encontrados = set()
-        for pattern in patterns:
-            matches = re.finditer(pattern, self.text)
-            for match in matches:
-                cnpj = match.group()
-                if self.validar_cnpj(cnpj):
-                    cnpj_limpo = re.sub(r'\D', '', cnpj)
-                    cnpj_formatado = f"{cnpj_limpo[:2]}.{cnpj_limpo[2:5]}.{cnpj_limpo[5:8]}/{cnpj_limpo[8:12]}-{cnpj_limpo[12:]}"
-                    cnpjs_encontrados.add(cnpj_formatado)
-
-        self.info['cnpjs'] = sorted(list(cnpjs_encontrados))
+        self.escanear_entidades()
         return self.info['cnpjs']
 
-    def identificar_banco(self) -> Optional[str]:
-        """Identifica qual banco baseado em palavras-chave"""
-        text_lower = self.text.lower()
+    @classmethod
+    def automato(cls) -> AutomatoPalavras:
+        """Autômato de palavras-chave compartilhado (compilado na importação de classificacao.py)"""
+        return AUTOMATO
 
-        for banco, keywords in self.BANCOS.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    self.info['banco'] = banco
-                    return banco
+    def contar_palavras_chave(self) -> Dict:
+        """Conta as palavras-chave de bancos e tipos numa única passada pelo texto"""
+        if self._palavras_encontradas is None:
+            automato = self.automato()
+            with self._etapa('contar_palavras_chave'):
+                self._palavras_encontradas = automato.contar(self.text)
+        return self._palavras_encontradas
 
-        return None
+    def identificar_banco(self) -> Optional[str]:
+        """Identifica qual banco baseado em palavras-chave"""
+        banco = banco_encontrado(self.contar_palavras_chave())
+        if banco is not None:
+            self.info['banco'] = banco
+        return banco
 
     def identificar_tipo_documento(self) -> Optional[str]:
         """Identifica tipo de documento baseado em palavras-chave"""
-        text_lower = self.text.lower()
-
-        # Contar ocorrências de cada tipo
-        scores = {}
-        for tipo, keywords in self.TIPOS_DOCUMENTO.items():
-            count = sum(1 for keyword in keywords if keyword in text_lower)
-            if count > 0:
-                scores[tipo] = count
-
-        if scores:
-            # Retornar tipo com mais ocorrências
-            tipo_mais_provavel = max(scores, key=scores.get)
-            self.info['tipo_documento'] = tipo_mais_provavel
-            self.info['palavras_chave'] = list(self.TIPOS_DOCUMENTO[tipo_mais_provavel])
-            return tipo_mais_provavel
-
-        return None
+        # Tipo com mais palavras-chave diferentes
+        tipo = tipo_documento_encontrado(self.contar_palavras_chave())
+        if tipo is not None:
+            self.info['tipo_documento'] = tipo
+            self.info['palavras_chave'] = list(self.TIPOS_DOCUMENTO[tipo])
+        return tipo
 
     def identificar_datas(self) -> List[str]:
         """Encontra datas no texto"""
-        # Padrões: DD/MM/YYYY, DD-MM-YYYY, YYYY-MM-DD
-        patterns = [
-            r'\b\d{2}/\d{2}/\d{4}\b',
-            r'\b\d{2}-\d{2}-\d{4}\b',
-            r'\b\d{4}-\d{2}-\d{2}\b'
-        ]
-
-        datas_encontradas = set()
-        for pattern in patterns:
-            matches = re.finditer(pattern, self.text)
-            for match in matches:
-                data = match.group()
-                datas_encontradas.add(data)
-
-        self.info['datas'] = sorted(list(datas_encontradas))
+        self.escanear_entidades()
         return self.info['datas']
 
     def identificar_valores(self) -> List[str]:
-        """Encontra valores monetários no texto"""
-        # Padrões: R$ 1.234,56 ou 1234.56
-        patterns = [
-            r'R\$\s*\d{1,3}(?:\.\d{3})*,\d{2}',
-            r'\d{1,3}(?:\.\d{3})*,\d{2}'
-        ]
-
-        valores_encontrados = []
-        for pattern in patterns:
-            matches = re.finditer(pattern, self.text)
-            for match in matches:
-                valor = match.group()
-                # Converter para float
-                valor_limpo = re.sub(r'[R$\s]', '', valor)
-                valor_limpo = valor_limpo.replace('.', '').replace(',', '.')
-                try:
-                    valor_float = float(valor_limpo)
-                    if valor_float > 0:  # Ignorar valores zero
-                        valores_encontrados.append({
-                            'texto': valor,
-                            'valor': valor_float
-                        })
-                except ValueError:
-                    pass
-
-        # Ordenar por valor
-        valores_encontrados = sorted(valores_encontrados, key=lambda x: x['valor'], reverse=True)
-        # Pegar apenas os 10 maiores
-        self.info['valores'] = valores_encontrados[:10]
+        """Encontra valores monetários no texto (os 10 maiores)"""
+        self.escanear_entidades()
         return self.info['valores']
 
     def processar(self) -> Dict:
         """Processa o PDF completo e retorna informações"""
         print(f"Processando: {self.pdf_path.name}", file=sys.stderr)
 
+        # A triagem lê só parte do PDF: resultado guardado com outra versão
+        versao = self.VERSAO_EXTRATOR
+        if self.triagem:
+            versao = f"{versao}-triagem{self.max_paginas}"
+        elif self.fluxo:
+            versao = f"{versao}-fluxo"
+
+        with self._etapa('total'):
+            self._processar_com_cache(versao)
+
+        if self.metricas is not None:
+            self.info['metricas'] = self.metricas.como_dict()
+
+        return self.info
+
+    def _processar_com_cache(self, versao: str):
+        """Consulta o cache; se não houver resultado, processa e grava"""
+        # Consultar cache (um hash por arquivo)
+        hash_conteudo = None
+        if self.cache is not None:
+            with self._etapa('cache'):
+                hash_conteudo = self.cache.hash_arquivo(self.pdf_path)
+                em_cache = self.cache.obter(hash_conteudo, versao)
+            if em_cache is not None:
+                self.text = em_cache['texto']
+                self.motivo_falha = em_cache['erro']
+                self.info.update(em_cache['info'])
+                if self.metricas is not None:
+                    self.metricas.contar('cache_acertos')
+                return
+
+        if self.triagem:
+            self.triar()
+        elif self.fluxo:
+            self.processar_fluxo()
+        else:
+            self._processar_conteudo()
+
+        if hash_conteudo is not None:
+            with self._etapa('cache'):
+                self.cache.gravar(
+                    hash_conteudo, versao, self.text,
+                    {campo: self.info[campo] for campo in self.CAMPOS_CACHE if campo in self.info},
+                    erro=self.motivo_falha
+                )
+
+    def _processar_conteudo(self):
+        """Extrai o texto e identifica as informações (sem cache)"""
         # Extrair texto
         self.extrair_texto()
 
         if not self.text:
             print("AVISO: Nenhum texto extraído (PDF pode ser imagem)", file=sys.stderr)
             self.info['erro'] = 'Sem texto extraído'
-            return self.info
+            self.motivo_falha = self.motivo_falha or 'Sem texto extraído'
+            return
 
         # Identificar informações
-        self.identificar_cpfs()
-        self.identificar_cnpjs()
+        self.escanear_entidades()
         self.identificar_banco()
         self.identificar_tipo_documento()
-        self.identificar_datas()
-        self.identificar_valores()
 
         # Adicionar preview do texto (primeiras 500 caracteres)
         self.info['texto_preview'] = self.text[:500].replace('\n', ' ')
 
-        return self.info
+    def triar(self):
+        """
+        Triagem: lê páginas sob demanda e para assim que banco, tipo de
+        documento e pelo menos um CPF/CNPJ estiverem identificados com
+        confiança, ou quando o orçamento de páginas acabar
+        """
+        self.info['triagem'] = True
+        automato = self.automato()
+        scanner = ScannerEntidades()
+        contagens = {}
+        lidas = 0
+
+        paginas = self.paginas()
+        try:
+            for texto_pagina in paginas:
+                inicio = len(self.text) + 1 if lidas else 0
+                self.text = self.text + "\n" + texto_pagina if lidas else texto_pagina
+                lidas += 1
+
+                # Classificação incremental: só a página nova é varrida
+                with self._etapa('escanear_entidades'):
+                    scanner.varrer(self.text, inicio)
+                with self._etapa('contar_palavras_chave'):
+                    encontradas = automato.contar(texto_pagina)
+                for categoria, palavras in encontradas.items():
+                    acumulado = contagens.setdefault(categoria, {})
+                    for palavra, total in palavras.items():
+                        acumulado[palavra] = acumulado.get(palavra, 0) + total
+
+                if lidas >= self.max_paginas or self._triagem_confiavel(scanner, contagens):
+                    break
+        finally:
+            paginas.close()
+
+        if not self.text:
+            print("AVISO: Nenhum texto extraído (PDF pode ser imagem)", file=sys.stderr)
+            self.info['erro'] = 'Sem texto extraído'
+            self.motivo_falha = self.motivo_falha or 'Sem texto extraído'
+            return
+
+        self._preencher_entidades(scanner)
+
+        self._palavras_encontradas = {c: contagens[c] for c in automato.categorias if c in contagens}
+        self.identificar_banco()
+        self.identificar_tipo_documento()
+
+        self.info['texto_preview'] = self.text[:500].replace('\n', ' ')
+
+    def processar_fluxo(self):
+        """
+        Processa o PDF página a página sem montar o texto inteiro
+
+        A memória fica limitada a uma página mais FLUXO_SOBREPOSICAO
+        caracteres da anterior, o bastante para achar um "R$" ou uma palavra-chave
+        que atravessa a quebra de página. O resultado é o mesmo do modo completo,
+        mas self.text fica vazio.
+        """
+        self.info['fluxo'] = True
+        scanner = ScannerEntidades()
+        contador = self.automato().contador()
+
+        contexto = ""
+        preview = ""
+        inicio_pagina = 0  # posição da página no texto completo (equivalente)
+        lidas = 0
+
+        for texto_pagina in self.paginas():
+            if lidas:
+                janela = contexto + "\n" + texto_pagina
+                inicio = len(contexto) + 1
+                pedaco = "\n" + texto_pagina
+            else:
+                janela = texto_pagina
+                inicio = 0
+                pedaco = texto_pagina
+
+            with self._etapa('contar_palavras_chave'):
+                contador.alimentar(pedaco)
+
+            with self._etapa('escanear_entidades'):
+                scanner.varrer(janela, inicio, deslocamento=inicio_pagina - inicio)
+
+            if len(preview) < 500:
+                preview = (preview + "\n" + texto_pagina if lidas else texto_pagina)[:500]
+
+            inicio_pagina += len(texto_pagina) + 1
+            contexto = janela[-self.FLUXO_SOBREPOSICAO:]
+            lidas += 1
+
+        # Mesmo critério do modo completo ("\n".join das páginas vazio)
+        if inicio_pagina - 1 <= 0:
+            print("AVISO: Nenhum texto extraído (PDF pode ser imagem)", file=sys.stderr)
+            self.info['erro'] = 'Sem texto extraído'
+            self.motivo_falha = self.motivo_falha or 'Sem texto extraído'
+            return
+
+        self._preencher_entidades(scanner)
+
+        with self._etapa('contar_palavras_chave'):
+            self._palavras_encontradas = contador.finalizar()
+        self.identificar_banco()
+        self.identificar_tipo_documento()
+
+        self.info['texto_preview'] = preview.replace('\n', ' ')
+
+    def _triagem_confiavel(self, scanner: ScannerEntidades, contagens: Dict) -> bool:
+        """Banco, tipo e CPF/CNPJ já identificados com confiança suficiente?"""
+        if not (scanner.cpfs or scanner.cnpjs):
+            return False
+
+        banco = max((sum(p.values()) for (g, _), p in contagens.items() if g == 'banco'), default=0)
+        tipo = max((len(p) for (g, _), p in contagens.items() if g == 'tipo'), default=0)
+
+        return banco >= self.TRIAGEM_MIN_OCORRENCIAS_BANCO and tipo >= self.TRIAGEM_MIN_PALAVRAS_TIPO
+
+
+# Cache de extração do processo worker (aberto em _iniciar_worker)
+_cache_worker = None
+
+
+# Opções do PDFProcessor no worker (triagem, max_paginas)
+_opcoes_worker = {}
+
+
+def _iniciar_worker(caminho_cache: Optional[str], opcoes: Optional[Dict] = None):
+    """Inicializa um worker do lote (abre o cache, se configurado)"""
+    global _cache_worker, _opcoes_worker
+    if caminho_cache:
+        _cache_worker = abrir_cache(caminho_cache)
+    _opcoes_worker = opcoes or {}
+
+
+def _processar_arquivo(pdf_path: str) -> Dict:
+    """Processa um PDF dentro de um worker do lote (nunca levanta exceção)"""
+    try:
+        return PDFProcessor(pdf_path, cache=_cache_worker, **_opcoes_worker).processar()
+    except Exception as e:
+        return {'erro': str(e), 'arquivo': pdf_path}
+
+
+def abrir_cache(caminho: Optional[str] = None):
+    """Abre o cache de extração ('padrao' usa o local padrão)"""
+    from cache_extracao import CacheExtracao
+    return CacheExtracao(None if caminho in (None, 'padrao') else caminho)
+
+
+def listar_pdfs(entradas: Iterable[str]) -> Iterator[str]:
+    """
+    Expande as entradas do lote em caminhos de PDF
+
+    Args:
+        entradas: Arquivos PDF e/ou pastas (pastas são percorridas recursivamente)
+    """
+    for entrada in entradas:
+        caminho = Path(entrada)
+        if caminho.is_dir():
+            for raiz, pastas, arquivos in os.walk(caminho):
+                pastas[:] = sorted(p for p in pastas if not p.startswith('.'))
+                for nome in sorted(arquivos):
+                    if nome.lower().endswith('.pdf') and not nome.startswith('.'):
+                        yield os.path.join(raiz, nome)
+        else:
+            yield str(caminho)
+
+
+def ler_lista_arquivos(lista: str) -> Iterator[str]:
+    """Lê uma lista de caminhos (um por linha); '-' lê da entrada padrão"""
+    arquivo = sys.stdin if lista == '-' else open(lista, 'r', encoding='utf-8')
+    try:
+        for linha in arquivo:
+            linha = linha.strip()
+            if linha:
+                yield linha
+    finally:
+        if arquivo is not sys.stdin:
+            arquivo.close()
+
+
+def processar_lote(caminhos: Iterable[str], workers: Optional[int] = None,
+                   manter_ordem: bool = False,
+                   caminho_cache: Optional[str] = None,
+                   opcoes: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Processa vários PDFs em paralelo num pool de processos
+
+    Args:
+        caminhos: Caminhos dos PDFs (pode ser um gerador)
+        workers: Número de processos (padrão: número de núcleos)
+        manter_ordem: Se True, devolve na ordem de entrada; senão, na ordem de conclusão
+        caminho_cache: Cache de extração usado pelos workers ('padrao' ou caminho)
+        opcoes: Argumentos extras do PDFProcessor (ex.: triagem, max_paginas)
+
+    Yields:
+        Dict de resultado de cada PDF, assim que fica pronto
+    """
+    workers = workers or os.cpu_count() or 1
+    # Limita os PDFs em voo para não materializar listas enormes de futures
+    max_pendentes = workers * 4
+    caminhos = iter(caminhos)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker,
+                             initargs=(caminho_cache, opcoes)) as executor:
+        pendentes = {}
+        prontos = {}
+        proximo_envio = 0
+        proximo_emitir = 0
+        esgotado = False
+
+        while True:
+            while not esgotado and len(pendentes) < max_pendentes:
+                try:
+                    caminho = next(caminhos)
+                except StopIteration:
+                    esgotado = True
+                    break
+                future = executor.submit(_processar_arquivo, caminho)
+                pendentes[future] = proximo_envio
+                proximo_envio += 1
+
+            if not pendentes:
+                break
+
+            concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for future in concluidos:
+                indice = pendentes.pop(future)
+                if not manter_ordem:
+                    yield future.result()
+                else:
+                    prontos[indice] = future.result()
+
+            while proximo_emitir in prontos:
+                yield prontos.pop(proximo_emitir)
+                proximo_emitir += 1
+
+
+def main_lote(argv: List[str]) -> int:
+    """Modo lote: uma linha JSON por documento"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='pdf_processor.py --lote',
+        description='Processa vários PDFs em paralelo (saída JSONL)'
+    )
+    parser.add_argument('entradas', nargs='*', help='PDFs e/ou pastas')
+    parser.add_argument('--lista', help="Arquivo com um caminho por linha ('-' para stdin)")
+    parser.add_argument('--workers', type=int, help='Número de processos (padrão: núcleos)')
+    parser.add_argument('--ordenado', action='store_true', help='Emitir na ordem de entrada')
+    parser.add_argument('--cache', nargs='?', const='padrao',
+                        help='Usar cache de extração (opcionalmente, caminho do SQLite)')
+    parser.add_argument('--triagem', action='store_true',
+                        help='Ler só as primeiras páginas (parada antecipada)')
+    parser.add_argument('--fluxo', action='store_true',
+                        help='Processar página a página com memória limitada (PDFs muito grandes)')
+    parser.add_argument('--max-paginas', type=int,
+                        help=f'Orçamento de páginas da triagem (padrão: {PDFProcessor.TRIAGEM_MAX_PAGINAS})')
+    parser.add_argument('--metricas', action='store_true',
+                        help='Medir tempo por etapa (por PDF e total do lote, no stderr)')
+
+    args = parser.parse_args(argv)
+
+    if not args.entradas and not args.lista:
+        parser.error('informe PDFs, pastas ou --lista')
+
+    entradas = list(args.entradas)
+    caminhos = listar_pdfs(entradas)
+    if args.lista:
+        caminhos = chain(caminhos, ler_lista_arquivos(args.lista))
+
+    falhas = 0
+    metricas_lote = Metricas() if args.metricas else None
+    for info in processar_lote(caminhos, workers=args.workers, manter_ordem=args.ordenado,
+                               caminho_cache=args.cache,
+                               opcoes={'triagem': args.triagem, 'max_paginas': args.max_paginas,
+                                       'fluxo': args.fluxo, 'metricas': args.metricas}):
+        if 'erro' in info and 'nome_arquivo' not in info:
+            falhas += 1
+        if metricas_lote is not None:
+            metricas_lote.contar('documentos')
+            metricas_lote.acumular(info.get('metricas', {}))
+        print(json.dumps(info, ensure_ascii=False), flush=True)
+
+    if metricas_lote is not None:
+        print(json.dumps({'metricas_lote': metricas_lote.como_dict()}, ensure_ascii=False),
+              file=sys.stderr)
+
+    return 1 if falhas else 0
 
 
 def main():
     """Função principal"""
-    if len(sys.argv) != 2:
-        print("Uso: python3 pdf_processor.py <caminho_do_pdf>")
+    if len(sys.argv) >= 2 and sys.argv[1] == '--lote':
+        sys.exit(main_lote(sys.argv[2:]))
+
+    args = sys.argv[1:]
+    opcoes = {}
+    for opcao in ('--triagem', '--fluxo', '--metricas'):
+        if opcao in args:
+            args.remove(opcao)
+            opcoes[opcao[2:]] = True
+
+    if len(args) != 1:
+        print("Uso: python3 pdf_processor.py <caminho_do_pdf> [--triagem | --fluxo] [--metricas]")
+        print("     python3 pdf_processor.py --lote <pastas_ou_pdfs...> [--lista ARQ] [--workers N] [--ordenado]")
+        print("                              [--cache [ARQ]] [--triagem [--max-paginas N] | --fluxo] [--metricas]")
         sys.exit(1)
 
-    pdf_path = sys.argv[1]
+    pdf_path = args[0]
 
     try:
-        processor = PDFProcessor(pdf_path)
+        # Cache opcional também no modo de um arquivo
+        caminho_cache = os.environ.get('ENSIDE_CACHE_EXTRACAO')
+        cache = abrir_cache(caminho_cache) if caminho_cache else None
+
+        processor = PDFProcessor(pdf_path, cache=cache, **opcoes)
         info = processor.processar()
 
         # Imprimir resultado como JSON
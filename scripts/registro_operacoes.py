@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Registro de Operações - Diário de tudo que os organizadores movem/copiam
+Parte da skill organize-pdfs do Claude Code
+
+Cada execução grava um arquivo JSONL só de acréscimo, com uma linha de
+intenção antes de cada operação e uma de conclusão (ou falha) depois.
+Assim, se o processo cair no meio de 20 mil arquivos:
+
+    - a próxima execução recupera as operações que ficaram pela metade
+      (conclui ou desfaz, conforme o que encontrar no disco)
+    - desfazer(execucao) (--undo) reverte uma execução inteira só com o
+      diário, sem varrer pastas
+
+Cada linha vai para o sistema operacional na hora (um processo morto não
+perde nada); o fsync é feito em grupo, a cada LOTE_FSYNC linhas ou
+SEGUNDOS_FSYNC segundos, como o synchronous=NORMAL do SQLite. Com
+estrito=True, cada intenção está no disco antes da operação começar, e
+as threads que registram ao mesmo tempo dividem o mesmo fsync.
+
+    python3 registro_operacoes.py listar
+    python3 registro_operacoes.py desfazer 20250301-101500-4242
+"""
+
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from indice_conteudo import IndiceConteudo
+from mover_arquivos import mover_arquivo
+
+# Pasta padrão dos registros (um arquivo por execução)
+REGISTROS_PADRAO = Path.home() / ".cache" / "enside" / "operacoes"
+
+# Estados finais de uma operação
+FEITO = 'feito'
+FALHOU = 'falhou'
+ABORTADO = 'abortado'     # a operação não chegou a mexer em nada
+DESFEITO = 'desfeito'
+CONFLITO = 'conflito'     # o disco não bate com o registro; nada foi tocado
+
+
+class RegistroOperacoes:
+    """Diário de operações de uma execução (seguro para várias threads)"""
+
+    # fsync em grupo: a cada tantas linhas ou segundos
+    LOTE_FSYNC = 256
+    SEGUNDOS_FSYNC = 0.2
+
+    def __init__(self, pasta: Optional[str] = None, comando: str = '', estrito: bool = False,
+                 execucao: Optional[str] = None, recuperar_pendentes: bool = True):
+        """
+        Começa uma execução nova (ou reabre uma existente para acrescentar)
+
+        Args:
+            pasta: Pasta dos registros (padrão: ~/.cache/enside/operacoes)
+            comando: Linha de comando, guardada no início do registro
+            estrito: Intenção no disco (fsync) antes de cada operação
+            execucao: Reabrir esta execução em vez de começar outra
+            recuperar_pendentes: Recuperar antes as execuções interrompidas
+        """
+        self.pasta = Path(pasta) if pasta else REGISTROS_PADRAO
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.estrito = estrito
+
+        nova = execucao is None
+        if nova:
+            if recuperar_pendentes:
+                recuperados = recuperar(self.pasta)
+                if recuperados:
+                    print(f"   ↩️  Execuções interrompidas recuperadas: {recuperados}", file=sys.stderr)
+            execucao = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.execucao = execucao
+        self.caminho = self.pasta / f"{execucao}.jsonl"
+
+        self._fd = os.open(self.caminho, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        if not nova and _termina_cortado(self.caminho):
+            # Última linha cortada pela queda: não grudar a próxima nela
+            os.write(self._fd, b'\n')
+        self._cond = threading.Condition()
+        self._seq = _maior_seq(self.caminho) if not nova else 0
+        self._escritas = 0      # linhas escritas
+        self._duraveis = 0      # linhas cobertas por um fsync
+        self._sincronizando = False
+        self._ultimo_fsync = time.monotonic()
+        self.fsyncs = 0
+
+        if nova:
+            self._escrever({'tipo': 'inicio', 'execucao': execucao, 'pid': os.getpid(),
+                            'hora': datetime.now().isoformat(timespec='seconds'), 'comando': comando})
+            self._sincronizar(self._escritas)
+            # A entrada do arquivo novo na pasta também precisa ir para o disco
+            fd_pasta = os.open(self.pasta, os.O_RDONLY)
+            try:
+                os.fsync(fd_pasta)
+            finally:
+                os.close(fd_pasta)
+
+    # ── Escrita ────────────────────────────────────────────
+
+    def _escrever(self, registro: Dict) -> int:
+        """Acrescenta uma linha (O_APPEND: linhas de threads diferentes não se misturam)"""
+        linha = (json.dumps(registro, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._cond:
+            os.write(self._fd, linha)
+            self._escritas += 1
+            return self._escritas
+
+    def _sincronizar(self, ate: int):
+        """fsync até a linha ate; quem chega durante um fsync espera o próximo, que vale para todos"""
+        with self._cond:
+            while self._duraveis < ate:
+                if self._sincronizando:
+                    self._cond.wait()
+                    continue
+                self._sincronizando = True
+                alvo = self._escritas
+                self._cond.release()
+                try:
+                    os.fsync(self._fd)
+                finally:
+                    self._cond.acquire()
+                    self._sincronizando = False
+                self._duraveis = max(self._duraveis, alvo)
+                self._ultimo_fsync = time.monotonic()
+                self.fsyncs += 1
+                self._cond.notify_all()
+
+    def _talvez_sincronizar(self, linha: int):
+        if (linha - self._duraveis >= self.LOTE_FSYNC
+                or time.monotonic() - self._ultimo_fsync >= self.SEGUNDOS_FSYNC):
+            self._sincronizar(linha)
+
+    # ── Operações ──────────────────────────────────────────
+
+    def intencao(self, acao: str, origem, destino, **campos) -> int:
+        """Registra que uma operação vai começar; devolve o número dela"""
+        with self._cond:
+            self._seq += 1
+            seq = self._seq
+        linha = self._escrever({'seq': seq, 'fase': 'intencao', 'acao': acao,
+                                'origem': str(origem), 'destino': str(destino), **campos})
+        if self.estrito:
+            self._sincronizar(linha)
+        else:
+            self._talvez_sincronizar(linha)
+        return seq
+
+    def marcar(self, seq: int, fase: str, **campos):
+        """Registra o desfecho de uma operação (feito, falhou, desfeito...)"""
+        self._talvez_sincronizar(self._escrever({'seq': seq, 'fase': fase, **campos}))
+
+    @contextmanager
+    def operacao(self, acao: str, origem, destino, **campos) -> Iterator[Dict]:
+        """
+        Registra a operação feita dentro do bloco
+
+        O dict devolvido pode receber campos para a linha de conclusão
+        (ex.: o método de cópia usado). Uma exceção marca a operação como
+        falha e continua subindo.
+
+            with registro.operacao('mover', origem, destino):
+                mover_arquivo(origem, destino)
+        """
+        seq = self.intencao(acao, origem, destino, **campos)
+        conclusao: Dict = {}
+        try:
+            yield conclusao
+        except BaseException as e:
+            self.marcar(seq, FALHOU, erro=str(e))
+            raise
+        self.marcar(seq, FEITO, **conclusao)
+
+    def fechar(self, **resumo):
+        """Marca o fim da execução e grava tudo no disco"""
+        linha = self._escrever({'tipo': 'fim', 'hora': datetime.now().isoformat(timespec='seconds'), **resumo})
+        self._sincronizar(linha)
+        os.close(self._fd)
+
+
+class _SemRegistro:
+    """Registro de operações desligado (ex.: dry-run)"""
+
+    execucao = None
+
+    @contextmanager
+    def operacao(self, acao: str, origem, destino, **campos) -> Iterator[Dict]:
+        yield {}
+
+    def fechar(self, **resumo):
+        pass
+
+
+# Usado quando ninguém pediu registro
+SEM_REGISTRO = _SemRegistro()
+
+
+# ── Leitura ────────────────────────────────────────────────
+
+def _linhas(caminho: Path) -> Iterator[Dict]:
+    """Linhas do registro; uma última linha cortada por queda é ignorada"""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            try:
+                yield json.loads(linha)
+            except json.JSONDecodeError:
+                continue
+
+
+def _maior_seq(caminho: Path) -> int:
+    return max((r.get('seq', 0) for r in _linhas(caminho)), default=0)
+
+
+def ler_execucao(caminho: Path) -> Dict:
+    """
+    Estado de uma execução a partir do registro
+
+    Returns:
+        {'inicio': {...} | None, 'encerrada': bool,
+         'operacoes': {seq: {..intenção.., 'estado': último desfecho ou None}}}
+    """
+    inicio = None
+    encerrada = False
+    operacoes: Dict[int, Dict] = {}
+    for registro in _linhas(caminho):
+        if registro.get('tipo') == 'inicio':
+            inicio = registro
+        elif registro.get('tipo') == 'fim':
+            encerrada = True
+        elif registro.get('fase') == 'intencao':
+            operacoes[registro['seq']] = dict(registro, estado=None)
+            encerrada = False
+        elif registro.get('seq') in operacoes:
+            operacoes[registro['seq']]['estado'] = registro['fase']
+    return {'inicio': inicio, 'encerrada': encerrada, 'operacoes': operacoes}
+
+
+def _em_andamento(execucao: Dict) -> bool:
+    """Se o processo dono da execução ainda está rodando"""
+    pid = (execucao['inicio'] or {}).get('pid')
+    if not pid or execucao['encerrada']:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def listar_execucoes(pasta: Optional[str] = None) -> List[Dict]:
+    """Resumo de cada execução registrada (mais recente primeiro)"""
+    pasta = Path(pasta) if pasta else REGISTROS_PADRAO
+    resumos = []
+    for caminho in sorted(pasta.glob('*.jsonl'), reverse=True):
+        execucao = ler_execucao(caminho)
+        estados: Dict[str, int] = {}
+        for operacao in execucao['operacoes'].values():
+            estado = operacao['estado'] or 'pendente'
+            estados[estado] = estados.get(estado, 0) + 1
+        resumos.append({
+            'execucao': caminho.stem,
+            'hora': (execucao['inicio'] or {}).get('hora'),
+            'comando': (execucao['inicio'] or {}).get('comando'),
+            'encerrada': execucao['encerrada'],
+            'operacoes': estados,
+        })
+    return resumos
+
+
+# ── Recuperação ────────────────────────────────────────────
+
+def _mesmo_conteudo(a, b) -> bool:
+    try:
+        tamanho = os.path.getsize(a)
+        return tamanho == os.path.getsize(b) and \
+            IndiceConteudo.hash_completo(a, tamanho) == IndiceConteudo.hash_completo(b, tamanho)
+    except OSError:
+        return False
+
+
+def _resolver(operacao: Dict) -> str:
+    """Conclui ou desfaz uma operação que ficou sem desfecho; devolve o estado final"""
+    origem, destino = operacao['origem'], operacao['destino']
+    tem_origem, tem_destino = os.path.lexists(origem), os.path.lexists(destino)
+    acao = operacao['acao']
+
+    if not tem_destino:
+        # Nada chegou ao destino: a operação não aconteceu (parciais de cópia ficam para retomar)
+        return ABORTADO if tem_origem else CONFLITO
+
+    if acao == 'mover':
+        if not tem_origem:
+            return FEITO
+        # Copiado entre volumes, mas a origem não foi apagada: terminar a movimentação
+        if _mesmo_conteudo(origem, destino):
+            os.remove(origem)
+            return FEITO
+        return CONFLITO
+
+    if acao == 'copiar':
+        if os.path.islink(destino) or _mesmo_conteudo(origem, destino):
+            return FEITO
+        # Cópia incompleta: desfazer
+        if operacao.get('tamanho') is not None and os.path.getsize(destino) != operacao['tamanho']:
+            os.remove(destino)
+            return DESFEITO
+        return CONFLITO
+
+    if acao == 'duplicata':
+        # Link criado; falta tirar a origem (o conteúdo já foi conferido no índice)
+        if tem_origem:
+            os.remove(origem)
+        return FEITO
+
+    return CONFLITO
+
+
+def recuperar(pasta: Optional[str] = None) -> Dict[str, int]:
+    """
+    Resolve as operações pendentes das execuções interrompidas (processo já encerrado)
+
+    Returns:
+        Contagem por estado final (vazia se não havia nada pendente)
+    """
+    pasta = Path(pasta) if pasta else REGISTROS_PADRAO
+    contagem: Dict[str, int] = {}
+    for caminho in sorted(pasta.glob('*.jsonl')):
+        if _ultima_linha_fim(caminho):
+            continue
+        execucao = ler_execucao(caminho)
+        if execucao['encerrada'] or _em_andamento(execucao):
+            continue
+
+        registro = RegistroOperacoes(pasta, execucao=caminho.stem)
+        for seq, operacao in sorted(execucao['operacoes'].items()):
+            if operacao['estado'] is not None:
+                continue
+            try:
+                estado = _resolver(operacao)
+            except OSError as e:
+                estado = CONFLITO
+                registro.marcar(seq, estado, recuperado=True, erro=str(e))
+            else:
+                registro.marcar(seq, estado, recuperado=True)
+            contagem[estado] = contagem.get(estado, 0) + 1
+        registro.fechar(recuperada=True)
+    return contagem
+
+
+def _termina_cortado(caminho: Path) -> bool:
+    """Se o registro não termina em fim de linha (escrita interrompida no meio)"""
+    with open(caminho, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b'\n'
+
+
+def _ultima_linha_fim(caminho: Path) -> bool:
+    """Se o registro termina com a linha de fim (sem ler o arquivo todo)"""
+    with open(caminho, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - 4096, 0))
+        linhas = f.read().splitlines()
+    try:
+        return bool(linhas) and json.loads(linhas[-1]).get('tipo') == 'fim'
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return False
+
+
+# ── Desfazer ───────────────────────────────────────────────
+
+def _desfazer_operacao(operacao: Dict) -> str:
+    """Reverte uma operação concluída; devolve o estado final"""
+    origem, destino = operacao['origem'], operacao['destino']
+    tem_origem, tem_destino = os.path.lexists(origem), os.path.lexists(destino)
+    acao = operacao['acao']
+
+    if acao == 'mover':
+        if tem_origem and not tem_destino:
+            return DESFEITO  # já desfeita (desfazer interrompido)
+        if tem_origem or not tem_destino:
+            return CONFLITO
+        os.makedirs(os.path.dirname(origem), exist_ok=True)
+        mover_arquivo(destino, origem)
+        return DESFEITO
+
+    if acao == 'copiar':
+        if not tem_destino:
+            return DESFEITO
+        if not os.path.islink(destino) and operacao.get('tamanho') is not None \
+                and os.path.getsize(destino) != operacao['tamanho']:
+            return CONFLITO  # alterado depois da execução
+        os.remove(destino)
+        return DESFEITO
+
+    if acao == 'duplicata':
+        if tem_origem and not tem_destino:
+            return DESFEITO
+        if tem_origem or not tem_destino:
+            return CONFLITO
+        # O destino é um link para a cópia que já estava no acervo: devolver o conteúdo
+        os.makedirs(os.path.dirname(origem), exist_ok=True)
+        shutil.copy2(destino, origem)
+        os.remove(destino)
+        return DESFEITO
+
+    return CONFLITO
+
+
+def desfazer(execucao: str, pasta: Optional[str] = None) -> Dict[str, int]:
+    """
+    Reverte uma execução inteira, da última operação para a primeira
+
+    Usa só o registro: arquivos movidos voltam para a origem, cópias e
+    links são apagados. Pode ser repetido (um desfazer interrompido
+    continua de onde parou); o que mudou no disco depois da execução é
+    deixado como está e contado como conflito.
+
+    Returns:
+        Contagem por estado final
+    """
+    pasta = Path(pasta) if pasta else REGISTROS_PADRAO
+    caminho = pasta / f"{execucao}.jsonl"
+    if not caminho.exists():
+        raise FileNotFoundError(f"Execução não encontrada: {execucao}")
+
+    estado_execucao = ler_execucao(caminho)
+    if _em_andamento(estado_execucao):
+        raise RuntimeError(f"A execução {execucao} ainda está rodando")
+    if not estado_execucao['encerrada']:
+        recuperar(pasta)
+        estado_execucao = ler_execucao(caminho)
+
+    registro = RegistroOperacoes(pasta, execucao=execucao)
+    contagem: Dict[str, int] = {}
+    try:
+        for seq, operacao in sorted(estado_execucao['operacoes'].items(), reverse=True):
+            if operacao['estado'] != FEITO:
+                continue
+            try:
+                estado = _desfazer_operacao(operacao)
+            except OSError as e:
+                estado = CONFLITO
+                registro.marcar(seq, estado, desfazer=True, erro=str(e))
+            else:
+                if estado == DESFEITO:
+                    registro.marcar(seq, DESFEITO)
+                else:
+                    registro.marcar(seq, FEITO, desfazer=True, conflito=True)
+            contagem[estado] = contagem.get(estado, 0) + 1
+    finally:
+        registro.fechar(desfeita=True)
+    return contagem
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Registro de operações dos organizadores')
+    parser.add_argument('--pasta', help='Pasta dos registros (padrão: ~/.cache/enside/operacoes)')
+    sub = parser.add_subparsers(dest='acao', required=True)
+    sub.add_parser('listar', help='Listar as execuções registradas')
+    sub.add_parser('recuperar', help='Resolver operações pendentes de execuções interrompidas')
+    desfazer_parser = sub.add_parser('desfazer', help='Reverter uma execução')
+    desfazer_parser.add_argument('execucao')
+
+    args = parser.parse_args()
+
+    if args.acao == 'listar':
+        for resumo in listar_execucoes(args.pasta):
+            print(json.dumps(resumo, ensure_ascii=False))
+    elif args.acao == 'recuperar':
+        print(json.dumps(recuperar(args.pasta), ensure_ascii=False))
+    else:
+        try:
+            contagem = desfazer(args.execucao, args.pasta)
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(contagem, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
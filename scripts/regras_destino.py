@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Regras de Destino - Tabela declarativa que decide para onde vai cada arquivo
+Parte da skill organize-pdfs do Claude Code
+
+Cada regra é um dict com 'destino' (modelo de caminho) e condições; vale a
+primeira regra (na ordem da tabela) cujas condições forem todas satisfeitas:
+
+    'palavras': categorias do AutomatoPalavras encontradas no texto
+    '<texto>_contem': trechos procurados como substring em textos['<texto>']
+    qualquer outra chave: valor exato de campos['<chave>'] (ex.: 'tipo')
+
+Cada condição é uma lista (basta um item); uma lista de listas exige um
+item de cada lista. Na compilação, as regras são indexadas por um campo
+(só as que podem casar são testadas). As palavras vêm de uma única passada
+do autômato; os trechos são procurados só quando uma regra candidata
+precisa deles, e cada um no máximo uma vez por arquivo (o `in` do Python
+é bem mais rápido que uma regex com todos os trechos).
+
+    {'tipo': ['video'], 'texto_contem': ['reuniao', 'meeting'],
+     'destino': '{BASE}/11_VIDEOS/Reunioes'}
+"""
+
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+# Sufixo das condições de substring
+_CONTEM = '_contem'
+
+
+def _grupos(valor) -> List[frozenset]:
+    """Normaliza uma condição em lista de grupos (todos exigidos)"""
+    if valor and isinstance(valor[0], (list, tuple, set, frozenset)):
+        return [frozenset(g) for g in valor]
+    return [frozenset(valor)]
+
+
+class TabelaRegras:
+    """Tabela de regras compilada"""
+
+    def __init__(self, regras: List[Dict], campo_indice: Optional[str] = None):
+        """
+        Compila a tabela
+
+        Args:
+            regras: Regras em ordem de prioridade
+            campo_indice: Campo usado para pré-filtrar as regras (ex.: 'tipo')
+        """
+        self.regras = regras
+        self.campo_indice = campo_indice
+
+        # Regra compilada: (indice, campos, palavras, trechos por texto)
+        self._compiladas = []
+        self._trechos: Dict[str, Set[str]] = {}
+        for indice, regra in enumerate(regras):
+            campos, palavras, trechos = {}, [], {}
+            for chave, valor in regra.items():
+                if chave in ('destino', 'descricao'):
+                    continue
+                if chave == 'palavras':
+                    palavras = _grupos(valor)
+                elif chave.endswith(_CONTEM):
+                    texto = chave[:-len(_CONTEM)]
+                    trechos[texto] = _grupos(valor)
+                    for grupo in trechos[texto]:
+                        self._trechos.setdefault(texto, set()).update(grupo)
+                else:
+                    campos[chave] = frozenset(valor)
+            self._compiladas.append((indice, campos, palavras, trechos))
+
+        self._por_valor: Dict[Hashable, list] = {}
+
+    def _candidatas(self, campos: Dict) -> list:
+        """Regras que podem casar com o valor do campo de índice (em cache)"""
+        if self.campo_indice is None:
+            return self._compiladas
+        valor = campos.get(self.campo_indice)
+        candidatas = self._por_valor.get(valor)
+        if candidatas is None:
+            candidatas = [
+                r for r in self._compiladas
+                if self.campo_indice not in r[1] or valor in r[1][self.campo_indice]
+            ]
+            self._por_valor[valor] = candidatas
+        return candidatas
+
+    def trechos_encontrados(self, texto: str, conteudo: str) -> Set[str]:
+        """Todos os trechos da tabela presentes em textos[texto]"""
+        return {t for t in self._trechos.get(texto, ()) if t in conteudo}
+
+    def _avaliar(self, campos: Dict, textos: Dict[str, str], palavras: Set, explicar: bool = False):
+        """Primeira regra satisfeita (e, em modo explicação, as rejeitadas)"""
+        vistos: Dict[tuple, bool] = {}
+
+        def contem(texto, trecho):
+            chave = (texto, trecho)
+            achou = vistos.get(chave)
+            if achou is None:
+                achou = vistos[chave] = trecho in textos.get(texto, '')
+            return achou
+
+        rejeitadas = []
+
+        for indice, exigidos, grupos_palavras, grupos_trechos in self._candidatas(campos):
+            falhou = None
+            for campo, valores in exigidos.items():
+                if campos.get(campo) not in valores:
+                    falhou = campo
+                    break
+            if falhou is None:
+                for grupo in grupos_palavras:
+                    if grupo.isdisjoint(palavras):
+                        falhou = 'palavras'
+                        break
+            if falhou is None:
+                for texto, grupos in grupos_trechos.items():
+                    if not all(any(contem(texto, t) for t in grupo) for grupo in grupos):
+                        falhou = texto + _CONTEM
+                        break
+
+            if falhou is None:
+                return indice, rejeitadas
+            if explicar:
+                rejeitadas.append((indice, falhou))
+
+        return None, rejeitadas
+
+    def avaliar(self, campos: Dict, textos: Dict[str, str], palavras: Set) -> Optional[int]:
+        """
+        Índice da primeira regra satisfeita (None se nenhuma)
+
+        Args:
+            campos: Valores exatos (ex.: {'tipo': 'pdf', 'extensao': 'pdf'})
+            textos: Textos para as condições '_contem' (ex.: {'nome': ..., 'texto': ...})
+            palavras: Categorias do AutomatoPalavras encontradas
+        """
+        return self._avaliar(campos, textos, palavras)[0]
+
+    def avaliar_pendencias(self, campos: Dict, textos: Dict[str, str], palavras: Set,
+                           textos_fixos=()) -> Tuple[Optional[int], bool]:
+        """
+        Como avaliar(), dizendo também se a escolha ainda pode mudar com mais texto
+
+        Campos e os textos em textos_fixos (ex.: 'nome') não mudam; 'palavras'
+        e os demais '_contem' podem passar a valer quando mais conteúdo for
+        lido, e então uma regra anterior à escolhida ganharia.
+
+        Returns:
+            (índice da regra, se alguma regra anterior ainda está em aberto)
+        """
+        indice, rejeitadas = self._avaliar(campos, textos, palavras, explicar=True)
+        fixos = {texto + _CONTEM for texto in textos_fixos}
+        aberta = any(
+            motivo == 'palavras' or (motivo.endswith(_CONTEM) and motivo not in fixos)
+            for _, motivo in rejeitadas
+        )
+        return indice, aberta
+
+    def natureza(self, indice: int) -> str:
+        """'evidencia' (palavras/trechos), 'campos' (só tipo/extensão...) ou 'padrao' (sem condições)"""
+        _, campos, palavras, trechos = self._compiladas[indice]
+        if palavras or trechos:
+            return 'evidencia'
+        return 'campos' if campos else 'padrao'
+
+    def destino(self, indice: int, **variaveis) -> str:
+        """Modelo de destino da regra preenchido ({ano} e {mes} são automáticos)"""
+        modelo = self.regras[indice]['destino']
+        if '{ano}' in modelo or '{mes}' in modelo:
+            agora = datetime.now()
+            variaveis.setdefault('ano', agora.year)
+            variaveis.setdefault('mes', agora.strftime('%B'))
+        return modelo.format(**variaveis)
+
+    def explicar(self, campos: Dict, textos: Dict[str, str], palavras: Set) -> Dict:
+        """
+        Mostra como o destino foi escolhido
+
+        Returns:
+            Dict com a regra escolhida, o que foi encontrado no texto e, para
+            cada regra testada antes dela, a primeira condição que falhou
+        """
+        indice, rejeitadas = self._avaliar(campos, textos, palavras, explicar=True)
+        regra = self.regras[indice] if indice is not None else None
+        encontrados = {t: self.trechos_encontrados(t, textos.get(t, '')) for t in self._trechos}
+        return {
+            'regra': indice,
+            'descricao': regra.get('descricao') if regra else None,
+            'condicoes': {k: v for k, v in regra.items() if k not in ('destino', 'descricao')} if regra else None,
+            'campos': campos,
+            'palavras': sorted(palavras),
+            'trechos': {t: sorted(e) for t, e in encontrados.items() if e},
+            'rejeitadas': [
+                {'regra': i, 'descricao': self.regras[i].get('descricao'), 'falhou': motivo}
+                for i, motivo in rejeitadas
+            ]
+        }
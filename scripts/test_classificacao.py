@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Teste do organizador geral sobre o núcleo de classificação compartilhado
+Parte da skill organize-pdfs do Claude Code
+
+GeneralOrganizer passou a classificar por classificacao.py. Categoria e
+tipo precisam continuar saindo como em _identificar_categoria() e
+_identificar_tipo() (copiados abaixo) numa lista fixa de nomes.
+
+Uso:
+    python3 -m pytest scripts/test_classificacao.py
+    python3 scripts/test_classificacao.py
+"""
+
+from pathlib import Path
+
+from general_organizer import GeneralOrganizer
+
+# EXTENSOES e PALAVRAS_CHAVE do GeneralOrganizer antes de classificacao.py
+EXTENSOES_ANTIGAS = {
+    'documentos': ['.pdf', '.doc', '.docx', '.odt', '.txt', '.rtf'],
+    'planilhas': ['.xls', '.xlsx', '.ods', '.csv'],
+    'apresentacoes': ['.ppt', '.pptx', '.odp'],
+    'imagens': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.heic'],
+    'videos': ['.mp4', '.mov', '.avi', '.mkv', '.wmv', '.flv', '.webm'],
+    'audio': ['.mp3', '.wav', '.aac', '.flac', '.m4a', '.ogg'],
+    'codigo': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.sh', '.rb', '.go'],
+    'compactados': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2'],
+    'dados': ['.json', '.xml', '.yaml', '.yml', '.sql', '.db'],
+}
+
+PALAVRAS_CHAVE_ANTIGAS = {
+    'contrato': ['contrato', 'acordo', 'termo'],
+    'nota_fiscal': ['nota fiscal', 'nf-e', 'nfe', 'danfe'],
+    'extrato': ['extrato', 'saldo', 'movimentação'],
+    'comprovante': ['comprovante', 'recibo', 'pagamento'],
+    'fatura': ['fatura', 'boleto'],
+    'relatorio': ['relatório', 'relatorio', 'report'],
+}
+
+NOMES = [
+    # Tipos pelo nome
+    'Acordo de socios.pdf', 'Termo de adesao.pdf', 'Contratos_2025.pdf', 'contrato-aluguel.pdf',
+    'Termos de uso.docx', 'ACORDO_TRABALHISTA.pdf', 'Nota Fiscal 1234.pdf', 'NF-e_35250101.pdf',
+    'nfe123456.xml', 'DANFE-000123.pdf', 'Extrato_Itau_Jan.pdf', 'extratos bancarios.pdf',
+    'Saldo conta.pdf', 'movimentação financeira.xlsx', 'Comprovante PIX.pdf', 'comprovantes_2024.zip',
+    'Recibo aluguel.pdf', 'recibos.pdf', 'Pagamento fornecedor.pdf', 'pagamentos_marco.csv',
+    'Fatura cartao.pdf', 'faturas.pdf', 'Boleto condominio.pdf', 'boletos_abril.pdf',
+    'Relatório mensal.docx', 'relatorio_vendas.xlsx', 'Report Q3.pptx', 'reports.pdf',
+
+    # Nada que indique o tipo (inclusive palavras só do importador/processador de PDFs)
+    'DOC_RG_scan.pdf', 'pix_joao.pdf', 'cartao_credito.pdf', 'romaneio madeira.pdf',
+    'frete_sp.pdf', 'IMG_2031.jpg', 'foto perfil.png', 'logo_empresa.svg', 'apresentacao.pptx',
+    'main.py', 'index.html', 'backup.tar.gz', 'config.yaml', 'Documento.pdf', 'sem_extensao',
+
+    # Mais de um tipo no nome: vale a ordem da tabela
+    'Contrato e recibo.pdf', 'Recibo do contrato.pdf', 'Extrato e comprovante.pdf',
+    'Boleto pagamento.pdf', 'Relatorio de notas fiscais.pdf', 'Termo - nota fiscal.pdf',
+]
+
+# Palavra-chave no meio de outra palavra: o nome antigo casava por
+# substring, o autômato só no começo de palavra (diferença intencional)
+DIFERENCAS = {
+    'confere_valores.pdf': ('nota_fiscal', None),
+    'subcontrato.pdf': ('contrato', None),
+}
+
+
+def identificar_categoria_antiga(extensao):
+    """GeneralOrganizer._identificar_categoria antes de classificacao.py"""
+    for categoria, extensoes in EXTENSOES_ANTIGAS.items():
+        if extensao in extensoes:
+            return categoria
+    return 'outros'
+
+
+def identificar_tipo_antigo(nome):
+    """GeneralOrganizer._identificar_tipo antes de classificacao.py"""
+    nome_lower = Path(nome).stem.lower()
+    for tipo, palavras in PALAVRAS_CHAVE_ANTIGAS.items():
+        for palavra in palavras:
+            if palavra in nome_lower:
+                return tipo
+    return None
+
+
+def test_tipo_igual_ao_antigo():
+    for nome in NOMES:
+        assert GeneralOrganizer(nome).info['tipo'] == identificar_tipo_antigo(nome), nome
+
+
+def test_diferencas_intencionais():
+    for nome, (antigo, novo) in DIFERENCAS.items():
+        assert identificar_tipo_antigo(nome) == antigo
+        assert GeneralOrganizer(nome).info['tipo'] == novo, nome
+
+
+def test_categoria_igual_a_antiga():
+    for extensoes in EXTENSOES_ANTIGAS.values():
+        for extensao in extensoes:
+            nome = 'arquivo' + extensao
+            assert GeneralOrganizer(nome).info['categoria'] == identificar_categoria_antiga(extensao), nome
+
+
+if __name__ == "__main__":
+    test_tipo_igual_ao_antigo()
+    test_diferencas_intencionais()
+    test_categoria_igual_a_antiga()
+    print("✅ Organizador geral classifica como antes")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Teste das tabelas REGRAS_DESTINO contra as cascatas if/elif que elas substituíram
+Parte da skill organize-pdfs do Claude Code
+
+As cascatas antigas de ImportadorUniversal._determinar_destino e
+GeneralOrganizer.determinar_destino estão copiadas abaixo como
+referência. As duas recebem as mesmas entradas já classificadas (tipo,
+extensão, nome, conteúdo, categorias de palavras), geradas com semente
+fixa, e precisam dar o mesmo destino.
+
+Uso:
+    python3 -m pytest scripts/test_regras_destino.py
+    python3 scripts/test_regras_destino.py
+"""
+
+import random
+from datetime import datetime
+from pathlib import Path
+
+from classificacao import ASSUNTOS, GRUPOS, TIPOS_EXTENSAO
+from general_organizer import GeneralOrganizer
+from importador_universal import BASE, WORKSPACE, ImportadorUniversal
+
+SEMENTE = 2025
+CASOS_IMPORTADOR = 20_000
+CASOS_GERAL = 5_000
+
+# Trechos que as condições '_contem' procuram (mais ruído)
+_TRECHOS = ['screenshot', 'screen shot', 'captura', 'print', 'cheque', 'estranho', 'suspeito',
+            'devolvido', 'erro', 'bug', 'comprovante', 'tutorial', 'aula', 'curso', 'reuniao',
+            'meeting', 'apresentacao', 'financeiro', 'fluxo', 'conta', 'logo', 'banner',
+            'cliente', 'fornecedor', 'relatorio', 'foto', 'arquivo', '2025']
+
+
+# ═══════════════════════════════════════════════════
+# CASCATAS DE REFERÊNCIA (código anterior às tabelas)
+# ═══════════════════════════════════════════════════
+
+def destino_importador_antigo(arquivo, tipo, nome_lower, conteudo, encontradas):
+    """ImportadorUniversal._determinar_destino antes de REGRAS_DESTINO"""
+    extensao = arquivo.suffix.lower().replace('.', '')
+    texto_completo = nome_lower + " " + conteudo
+
+    if 'fraude' in encontradas:
+        if tipo == 'imagem' or 'screenshot' in nome_lower or 'print' in nome_lower:
+            return BASE / "13_SEGURANCA_FRAUDES" / "Evidencias" / "Screenshots" / arquivo.name
+        elif tipo == 'video':
+            return BASE / "13_SEGURANCA_FRAUDES" / "Evidencias" / "Videos" / arquivo.name
+        else:
+            return BASE / "13_SEGURANCA_FRAUDES" / "Fraudes" / "Investigacao" / arquivo.name
+
+    if 'hacking' in encontradas:
+        if tipo == 'codigo':
+            return BASE / "13_SEGURANCA_FRAUDES" / "Analise_Seguranca" / "Scripts_Suspeitos" / arquivo.name
+        elif tipo == 'video':
+            return BASE / "11_VIDEOS" / "Seguranca" / "Hackers" / arquivo.name
+        elif tipo == 'log':
+            return BASE / "13_SEGURANCA_FRAUDES" / "Analise_Seguranca" / "Logs" / arquivo.name
+        else:
+            return BASE / "13_SEGURANCA_FRAUDES" / "Hacking" / "Tentativas_Invasao" / arquivo.name
+
+    if 'log_seguranca' in encontradas:
+        return BASE / "13_SEGURANCA_FRAUDES" / "Hacking" / "Logs_Acesso" / arquivo.name
+
+    if 'cheque' in texto_completo:
+        if 'estranho' in texto_completo or 'suspeito' in texto_completo or 'devolvido' in texto_completo:
+            return BASE / "13_SEGURANCA_FRAUDES" / "Cheques" / "Suspeitos" / arquivo.name
+        else:
+            return BASE / "13_SEGURANCA_FRAUDES" / "Cheques" / "Analise" / arquivo.name
+
+    if tipo == 'imagem' and ('screenshot' in nome_lower or 'screen shot' in nome_lower or
+                             'captura' in nome_lower or 'print' in nome_lower):
+        if 'erro' in texto_completo or 'bug' in texto_completo:
+            return BASE / "12_PRINTS_TELA" / "Erros" / arquivo.name
+        elif 'comprovante' in texto_completo:
+            return BASE / "12_PRINTS_TELA" / "Evidencias" / "Comprovantes" / arquivo.name
+        else:
+            return BASE / "12_PRINTS_TELA" / "2025" / arquivo.name
+
+    if tipo == 'video':
+        if any(palavra in texto_completo for palavra in ['tutorial', 'aula', 'curso']):
+            return BASE / "11_VIDEOS" / "Tutoriais" / arquivo.name
+        elif any(palavra in texto_completo for palavra in ['reuniao', 'meeting']):
+            return BASE / "11_VIDEOS" / "Reunioes" / arquivo.name
+        elif 'apresentacao' in texto_completo:
+            return BASE / "11_VIDEOS" / "Apresentacoes" / arquivo.name
+        else:
+            return BASE / "11_VIDEOS" / "2025" / arquivo.name
+
+    if tipo == 'pdf' or tipo == 'documento':
+        if 'banco' in encontradas:
+            if 'comprovante' in encontradas:
+                return BASE / "05_BANCOS" / "Comprovantes" / arquivo.name
+            elif 'cartao' in encontradas:
+                return BASE / "05_BANCOS" / "Cartoes" / arquivo.name
+            else:
+                return BASE / "05_BANCOS" / "Extratos" / arquivo.name
+        if 'boleto' in encontradas:
+            ano = datetime.now().year
+            mes = datetime.now().strftime('%B')
+            return BASE / "06_FINANCEIRO" / str(ano) / mes / "Contas_Pagar" / arquivo.name
+        if 'nota_fiscal' in encontradas:
+            return BASE / "07_CLIENTES" / "Notas_Fiscais" / "2025" / arquivo.name
+        if 'contrato' in encontradas:
+            return BASE / "02_DOCUMENTOS_EMPRESA" / "Contratos_Socios" / arquivo.name
+        if 'frete' in encontradas:
+            return BASE / "04_FRETES" / "CTEs" / "2025" / arquivo.name
+        if 'madeira' in encontradas:
+            return BASE / "03_MADEIRAS" / "Fornecedores_PR" / "Notas_Fiscais" / arquivo.name
+        if 'cpf' in encontradas:
+            return BASE / "01_DOCUMENTOS_PESSOAIS" / "CPF" / "Copias" / arquivo.name
+        elif 'rg' in encontradas:
+            return BASE / "01_DOCUMENTOS_PESSOAIS" / "RG" / "Copias" / arquivo.name
+        elif 'cnh' in encontradas:
+            return BASE / "01_DOCUMENTOS_PESSOAIS" / "CNH" / "Atual" / arquivo.name
+        return BASE / "01_DOCUMENTOS_PESSOAIS" / arquivo.name
+
+    if tipo == 'planilha':
+        if 'financeiro' in texto_completo or 'fluxo' in texto_completo or 'conta' in texto_completo:
+            return BASE / "06_FINANCEIRO" / "Relatorios" / arquivo.name
+        elif 'cliente' in encontradas:
+            return BASE / "07_CLIENTES" / "Cadastros" / arquivo.name
+        elif 'fornecedor' in encontradas:
+            return BASE / "08_FORNECEDORES" / "Cadastros" / arquivo.name
+        else:
+            return BASE / "06_FINANCEIRO" / "Relatorios" / arquivo.name
+
+    if tipo == 'codigo':
+        if extensao == 'py':
+            return WORKSPACE / "Python" / arquivo.name
+        elif extensao in ['html', 'css', 'js']:
+            return WORKSPACE / "HTML" / arquivo.name
+        elif extensao == 'sh':
+            return WORKSPACE / "Scripts" / arquivo.name
+        else:
+            return WORKSPACE / "Projetos" / arquivo.name
+
+    if tipo == 'imagem':
+        return WORKSPACE / "Documentos_PDF" / "Imagens" / arquivo.name
+    elif tipo == 'audio':
+        return WORKSPACE / "Documentos_PDF" / "Audio" / arquivo.name
+    elif tipo == 'compactado':
+        return WORKSPACE / "Downloads" / arquivo.name
+    elif tipo == 'dados':
+        return WORKSPACE / "Config" / arquivo.name
+    elif tipo == 'log':
+        return BASE / "13_SEGURANCA_FRAUDES" / "Analise_Seguranca" / "Logs" / arquivo.name
+    else:
+        return WORKSPACE / "Documentos_PDF" / arquivo.name
+
+
+def destino_geral_antigo(extensao, categoria, tipo, nome):
+    """GeneralOrganizer.determinar_destino antes de REGRAS_DESTINO"""
+    base, workspace = GeneralOrganizer.BASE_PATH, GeneralOrganizer.WORKSPACE
+
+    if extensao == '.pdf':
+        if tipo == 'nota_fiscal':
+            return base / "07_CLIENTES" / "Notas_Fiscais" / str(datetime.now().year)
+        elif tipo == 'extrato':
+            return base / "05_BANCOS" / "Extratos"
+        elif tipo == 'comprovante':
+            return base / "05_BANCOS" / "Comprovantes"
+        elif tipo == 'contrato':
+            return base / "02_DOCUMENTOS_EMPRESA" / "Contratos"
+        else:
+            return base / "01_DOCUMENTOS_PESSOAIS"
+    elif categoria == 'planilhas':
+        if 'financeiro' in nome.lower() or 'fluxo' in nome.lower():
+            return base / "06_FINANCEIRO" / "Relatorios"
+        elif 'cliente' in nome.lower():
+            return base / "07_CLIENTES" / "Cadastros"
+        elif 'fornecedor' in nome.lower():
+            return base / "08_FORNECEDORES" / "Cadastros"
+        else:
+            return workspace / "Documentos_PDF"
+    elif categoria == 'imagens':
+        if 'logo' in nome.lower() or 'banner' in nome.lower():
+            return workspace / "Projetos" / "Assets"
+        else:
+            return workspace / "Documentos_PDF" / "Imagens"
+    elif categoria == 'codigo':
+        if extensao == '.py':
+            return workspace / "Python"
+        elif extensao in ['.html', '.css', '.js']:
+            return workspace / "HTML"
+        elif extensao == '.sh':
+            return workspace / "Scripts"
+        else:
+            return workspace / "Projetos"
+    elif categoria == 'dados':
+        if extensao in ['.json', '.yaml', '.yml']:
+            return workspace / "Config"
+        else:
+            return workspace / "Projetos"
+    elif categoria == 'compactados':
+        return workspace / "Downloads"
+    else:
+        return workspace / "Documentos_PDF"
+
+
+# ═══════════════════════════════════════════════════
+# ENTRADAS SORTEADAS
+# ═══════════════════════════════════════════════════
+
+def _texto(rnd, maximo):
+    return ' '.join(rnd.choice(_TRECHOS) for _ in range(rnd.randrange(maximo + 1)))
+
+
+def _entradas_importador(rnd):
+    tipos = list(TIPOS_EXTENSAO) + ['outro']
+    for _ in range(CASOS_IMPORTADOR):
+        tipo = rnd.choice(tipos)
+        extensoes = TIPOS_EXTENSAO.get(tipo, ['bin', 'dat', ''])
+        extensao = rnd.choice(extensoes)
+        nome_lower = (_texto(rnd, 3).replace(' ', '_') or 'arquivo') + (f'.{extensao}' if extensao else '')
+        conteudo = _texto(rnd, 6)
+        encontradas = {c for c in ASSUNTOS if rnd.random() < 0.12}
+        yield Path('/tmp/entrada') / nome_lower, tipo, nome_lower, conteudo, encontradas
+
+
+def _entradas_geral(rnd):
+    extensoes = ['.' + e for lista in TIPOS_EXTENSAO.values() for e in lista] + ['.bin', '']
+    categorias = list(GRUPOS) + ['outros']
+    tipos = ['nota_fiscal', 'extrato', 'comprovante', 'contrato', 'fatura', 'relatorio', None]
+    for _ in range(CASOS_GERAL):
+        nome = _texto(rnd, 3).title().replace(' ', '_') or 'Arquivo'
+        yield rnd.choice(extensoes), rnd.choice(categorias), rnd.choice(tipos), nome
+
+
+# ═══════════════════════════════════════════════════
+# TESTES
+# ═══════════════════════════════════════════════════
+
+def test_regras_importador_iguais_a_cascata():
+    rnd = random.Random(SEMENTE)
+    tabela = ImportadorUniversal.tabela()
+    for arquivo, tipo, nome_lower, conteudo, encontradas in _entradas_importador(rnd):
+        campos = {'tipo': tipo, 'extensao': arquivo.suffix.lower().replace('.', '')}
+        textos = {'nome': nome_lower, 'texto': nome_lower + " " + conteudo}
+        indice = tabela.avaliar(campos, textos, encontradas)
+        novo = Path(tabela.destino(indice, BASE=BASE, WORKSPACE=WORKSPACE)) / arquivo.name
+        antigo = destino_importador_antigo(arquivo, tipo, nome_lower, conteudo, encontradas)
+        assert novo == antigo, (tipo, nome_lower, conteudo, sorted(encontradas))
+
+
+def test_regras_geral_iguais_a_cascata():
+    rnd = random.Random(SEMENTE)
+    tabela = GeneralOrganizer.tabela()
+    for extensao, categoria, tipo, nome in _entradas_geral(rnd):
+        campos = {'extensao': extensao, 'categoria': categoria, 'tipo': tipo}
+        indice = tabela.avaliar(campos, {'nome': nome.lower()}, set())
+        novo = Path(tabela.destino(indice, BASE=GeneralOrganizer.BASE_PATH, WORKSPACE=GeneralOrganizer.WORKSPACE))
+        antigo = destino_geral_antigo(extensao, categoria, tipo, nome)
+        assert novo == antigo, (extensao, categoria, tipo, nome)
+
+
+if __name__ == "__main__":
+    test_regras_importador_iguais_a_cascata()
+    test_regras_geral_iguais_a_cascata()
+    print("✅ Tabelas de regras iguais às cascatas")
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Validação de Documentos - Valida CPFs e CNPJs em lote
+Parte da skill organize-pdfs do Claude Code
+
+Valida milhares de candidatos de uma vez: com NumPy, os dígitos viram uma
+matriz e os dígitos verificadores saem de produtos escalares com os pesos;
+sem NumPy, cai para o cálculo em Python puro. Também pode ser usado direto
+na linha de comando para conferir planilhas de cadastro.
+"""
+
+import sys
+import re
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    TEM_NUMPY = True
+except ImportError:
+    TEM_NUMPY = False
+
+# Abaixo disso o custo de montar a matriz não compensa
+LIMIAR_NUMPY = 64
+
+# Pesos dos dígitos verificadores
+PESOS_CPF_1 = tuple(range(10, 1, -1))
+PESOS_CPF_2 = tuple(range(11, 1, -1))
+PESOS_CNPJ_1 = (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+PESOS_CNPJ_2 = (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+
+_NAO_DIGITO = re.compile(r'\D')
+
+
+def _ascii(digitos: str) -> str:
+    """Converte dígitos Unicode ('٣') para ASCII; o resto fica como está"""
+    if digitos.isascii():
+        return digitos
+    return ''.join(str(int(c)) if c.isdecimal() else c for c in digitos)
+
+
+def cpf_digitos_validos(cpf: str) -> bool:
+    """Valida os dígitos verificadores de um CPF só com dígitos (11 caracteres)"""
+    cpf = _ascii(cpf)
+    if len(cpf) != 11 or not cpf.isdigit() or cpf == cpf[0] * 11:
+        return False
+
+    d = [ord(c) - 48 for c in cpf]
+    soma = sum(d[i] * PESOS_CPF_1[i] for i in range(9))
+    digito1 = (soma * 10 % 11) % 10
+    soma = sum(d[i] * PESOS_CPF_2[i] for i in range(10))
+    digito2 = (soma * 10 % 11) % 10
+
+    return d[9] == digito1 and d[10] == digito2
+
+
+def cnpj_digitos_validos(cnpj: str) -> bool:
+    """Valida os dígitos verificadores de um CNPJ só com dígitos (14 caracteres)"""
+    cnpj = _ascii(cnpj)
+    if len(cnpj) != 14 or not cnpj.isdigit():
+        return False
+
+    d = [ord(c) - 48 for c in cnpj]
+    digito1 = sum(d[i] * PESOS_CNPJ_1[i] for i in range(12)) % 11
+    digito1 = 0 if digito1 < 2 else 11 - digito1
+    digito2 = sum(d[i] * PESOS_CNPJ_2[i] for i in range(13)) % 11
+    digito2 = 0 if digito2 < 2 else 11 - digito2
+
+    return d[12] == digito1 and d[13] == digito2
+
+
+def _matriz(digitos: Sequence[str], tamanho: int):
+    """Matriz (n, tamanho) de dígitos; linhas inválidas ficam zeradas"""
+    digitos = [_ascii(d) for d in digitos]
+    ok = np.array([len(d) == tamanho and d.isdigit() for d in digitos], dtype=bool)
+    texto = ''.join(d if v else '0' * tamanho for d, v in zip(digitos, ok))
+    matriz = np.frombuffer(texto.encode('ascii'), dtype=np.uint8).reshape(-1, tamanho)
+    return matriz.astype(np.int64) - 48, ok
+
+
+def cpfs_validos(digitos: Sequence[str]) -> List[bool]:
+    """
+    Valida vários CPFs de uma vez
+
+    Args:
+        digitos: CPFs só com dígitos (outros formatos são inválidos)
+
+    Returns:
+        Lista de bool, na mesma ordem
+    """
+    if not TEM_NUMPY or len(digitos) < LIMIAR_NUMPY:
+        return [cpf_digitos_validos(d) for d in digitos]
+
+    m, ok = _matriz(digitos, 11)
+    digito1 = (m[:, :9] @ np.array(PESOS_CPF_1) * 10 % 11) % 10
+    digito2 = (m[:, :10] @ np.array(PESOS_CPF_2) * 10 % 11) % 10
+    repetido = (m == m[:, :1]).all(axis=1)
+
+    valido = ok & ~repetido & (m[:, 9] == digito1) & (m[:, 10] == digito2)
+    return valido.tolist()
+
+
+def cnpjs_validos(digitos: Sequence[str]) -> List[bool]:
+    """
+    Valida vários CNPJs de uma vez
+
+    Args:
+        digitos: CNPJs só com dígitos (outros formatos são inválidos)
+
+    Returns:
+        Lista de bool, na mesma ordem
+    """
+    if not TEM_NUMPY or len(digitos) < LIMIAR_NUMPY:
+        return [cnpj_digitos_validos(d) for d in digitos]
+
+    m, ok = _matriz(digitos, 14)
+    resto1 = m[:, :12] @ np.array(PESOS_CNPJ_1) % 11
+    digito1 = np.where(resto1 < 2, 0, 11 - resto1)
+    resto2 = m[:, :13] @ np.array(PESOS_CNPJ_2) % 11
+    digito2 = np.where(resto2 < 2, 0, 11 - resto2)
+
+    valido = ok & (m[:, 12] == digito1) & (m[:, 13] == digito2)
+    return valido.tolist()
+
+
+def formatar_cpf(cpf: str) -> str:
+    """'52998224725' -> '529.982.247-25'"""
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+
+def formatar_cnpj(cnpj: str) -> str:
+    """'11222333000181' -> '11.222.333/0001-81'"""
+    return f"{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}"
+
+
+def somente_digitos(valor, tamanho: int = 0) -> str:
+    """
+    Remove a pontuação de um candidato
+
+    Args:
+        valor: Texto ou número (células de planilha perdem os zeros à esquerda)
+        tamanho: Completa números com zeros à esquerda até este tamanho
+    """
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    if isinstance(valor, int):
+        return str(valor).zfill(tamanho)
+    return _NAO_DIGITO.sub('', str(valor))
+
+
+def validar_cpfs(candidatos: Iterable) -> List[Optional[str]]:
+    """
+    Valida e formata vários CPFs
+
+    Returns:
+        CPF formatado (000.000.000-00) ou None, na mesma ordem
+    """
+    digitos = [somente_digitos(c, 11) for c in candidatos]
+    return [formatar_cpf(d) if ok else None for d, ok in zip(digitos, cpfs_validos(digitos))]
+
+
+def validar_cnpjs(candidatos: Iterable) -> List[Optional[str]]:
+    """
+    Valida e formata vários CNPJs
+
+    Returns:
+        CNPJ formatado (00.000.000/0000-00) ou None, na mesma ordem
+    """
+    digitos = [somente_digitos(c, 14) for c in candidatos]
+    return [formatar_cnpj(d) if ok else None for d, ok in zip(digitos, cnpjs_validos(digitos))]
+
+
+def validar_documentos(candidatos: Sequence) -> List[dict]:
+    """
+    Valida uma lista mista de CPFs e CNPJs (o tipo sai do número de dígitos)
+
+    Returns:
+        Lista de {'original', 'tipo', 'formatado', 'valido'}
+    """
+    digitos = [somente_digitos(c) for c in candidatos]
+    idx_cpf = [i for i, d in enumerate(digitos) if len(d) <= 11]
+    idx_cnpj = [i for i, d in enumerate(digitos) if len(d) > 11]
+
+    resultado = [None] * len(digitos)
+    for indices, tipo, validar in ((idx_cpf, 'cpf', validar_cpfs), (idx_cnpj, 'cnpj', validar_cnpjs)):
+        formatados = validar([candidatos[i] for i in indices])
+        for i, formatado in zip(indices, formatados):
+            resultado[i] = {
+                'original': str(candidatos[i]),
+                'tipo': tipo,
+                'formatado': formatado,
+                'valido': formatado is not None
+            }
+    return resultado
+
+
+def ler_planilha(caminho: Path, coluna: Optional[str] = None) -> List:
+    """
+    Lê os valores de uma coluna de planilha (.csv, .xlsx) ou de um .txt
+
+    Args:
+        caminho: Arquivo
+        coluna: Nome da coluna (padrão: a primeira)
+    """
+    if caminho.suffix.lower() in ('.xlsx', '.csv'):
+        colunas, linhas = ler_linhas_planilha(caminho)
+        coluna = coluna or colunas[0]
+        return [linha[coluna] for linha in linhas if linha.get(coluna) not in (None, '')]
+
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return [linha.strip() for linha in f if linha.strip()]
+
+
+def ler_linhas_planilha(caminho: Path) -> Tuple[List[str], Iterator[Dict]]:
+    """
+    Lê uma planilha (.csv, .xlsx) linha a linha
+
+    Returns:
+        (nomes das colunas, iterador de {coluna: valor} por linha)
+    """
+    sufixo = caminho.suffix.lower()
+
+    if sufixo == '.xlsx':
+        try:
+            import openpyxl
+        except ImportError:
+            raise RuntimeError("Para ler .xlsx instale o openpyxl: pip install openpyxl")
+        planilha = openpyxl.load_workbook(caminho, read_only=True, data_only=True).active
+        linhas = planilha.iter_rows(values_only=True)
+        cabecalho = [str(c or '') for c in next(linhas, [])]
+        return cabecalho, (dict(zip(cabecalho, linha)) for linha in linhas)
+
+    if sufixo == '.csv':
+        f = open(caminho, 'r', encoding='utf-8-sig', newline='')
+        amostra = f.read(4096)
+        f.seek(0)
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t')
+        leitor = csv.DictReader(f, dialect=dialeto)
+        cabecalho = list(leitor.fieldnames or [])
+
+        def linhas():
+            with f:
+                yield from leitor
+
+        return cabecalho, linhas()
+
+    raise ValueError(f"Formato de planilha não suportado: {caminho.suffix} (use .csv ou .xlsx)")
+
+
+def main():
+    """Função principal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Valida CPFs/CNPJs de uma planilha ou lista')
+    parser.add_argument('arquivo', help='Planilha (.csv, .xlsx) ou lista (.txt, um por linha)')
+    parser.add_argument('--coluna', help='Coluna com os documentos (padrão: a primeira)')
+    parser.add_argument('--invalidos', action='store_true', help='Mostrar só os inválidos')
+
+    args = parser.parse_args()
+
+    try:
+        valores = ler_planilha(Path(args.arquivo), args.coluna)
+    except Exception as e:
+        print(f"Erro ao ler {args.arquivo}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    resultados = validar_documentos(valores)
+    validos = sum(1 for r in resultados if r['valido'])
+
+    for r in resultados:
+        if not (args.invalidos and r['valido']):
+            print(json.dumps(r, ensure_ascii=False))
+
+    print(f"\n📊 {len(resultados)} documentos: {validos} válidos, {len(resultados) - validos} inválidos"
+          f"{' (NumPy)' if TEM_NUMPY else ''}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Vigia de Pastas - Organiza arquivos assim que chegam (Linux, inotify)
+Parte da skill organize-pdfs do Claude Code
+
+Usa o inotify do kernel direto pela libc (ctypes), sem serviço extra:
+parado, o processo fica bloqueado no select e não gasta CPU. Um arquivo
+só é entregue depois de ficar `espera` segundos sem eventos e sem mudar
+de tamanho/mtime, então downloads em andamento não são tocados. Os
+arquivos prontos são entregues em lotes.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Eventos que interessam numa pasta vigiada
+MASCARA = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM |
+           IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+# Cabeçalho de struct inotify_event (wd, mask, cookie, len) + nome
+_EVENTO = struct.Struct('iIII')
+
+# Arquivos temporários de download/edição (o nome final chega por IN_MOVED_TO)
+SUFIXOS_PARCIAIS = ('.crdownload', '.part', '.partial', '.download', '.tmp', '.opdownload', '.parcial')
+
+
+class Inotify:
+    """Acesso mínimo ao inotify pela libc"""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify só existe no Linux")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            numero = ctypes.get_errno()
+            raise OSError(numero, f"inotify_init1: {os.strerror(numero)}")
+
+    def adicionar(self, pasta, mascara: int = MASCARA) -> int:
+        """Começa a vigiar uma pasta; devolve o descritor (wd)"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(pasta), mascara)
+        if wd < 0:
+            numero = ctypes.get_errno()
+            raise OSError(numero, f"inotify_add_watch({pasta}): {os.strerror(numero)}")
+        return wd
+
+    def remover(self, wd: int):
+        """Para de vigiar (ignora descritores que o kernel já removeu)"""
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def ler(self, timeout: Optional[float]) -> List[Tuple[int, int, str]]:
+        """
+        Eventos disponíveis, esperando até timeout segundos (None = sem limite)
+
+        Returns:
+            Lista de (wd, mascara, nome)
+        """
+        prontos, _, _ = select.select([self.fd], [], [], timeout)
+        if not prontos:
+            return []
+
+        eventos = []
+        while True:
+            try:
+                dados = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            posicao = 0
+            while posicao < len(dados):
+                wd, mascara, _, tamanho = _EVENTO.unpack_from(dados, posicao)
+                posicao += _EVENTO.size
+                nome = dados[posicao:posicao + tamanho].rstrip(b'\0')
+                posicao += tamanho
+                eventos.append((wd, mascara, os.fsdecode(nome)))
+        return eventos
+
+    def fechar(self):
+        os.close(self.fd)
+
+
+class VigiaPasta:
+    """Vigia uma pasta (e subpastas) e entrega os arquivos que ficaram estáveis"""
+
+    def __init__(self, raiz, ao_chegar: Callable[[List[Path]], None], excluir=(),
+                 espera: float = 0.5, lote_max: int = 64):
+        """
+        Args:
+            raiz: Pasta vigiada
+            ao_chegar: Função chamada com cada lote de arquivos prontos
+            excluir: Nomes de subpastas a ignorar
+            espera: Segundos sem eventos e sem mudar antes de entregar um arquivo
+            lote_max: Máximo de arquivos por lote
+        """
+        self.raiz = Path(raiz)
+        self.ao_chegar = ao_chegar
+        self.excluir = set(excluir)
+        self.espera = espera
+        self.lote_max = lote_max
+
+        self.inotify = Inotify()
+        self._pastas: Dict[int, str] = {}  # wd -> pasta
+
+        # caminho -> (último evento, (tamanho, mtime) visto nesse momento)
+        self._pendentes: Dict[str, Tuple[float, Optional[Tuple[int, int]]]] = {}
+
+    def _ignorar(self, nome: str) -> bool:
+        return nome.startswith('.') or nome.startswith('~$') or nome.lower().endswith(SUFIXOS_PARCIAIS)
+
+    def _vigiar_arvore(self, pasta: str):
+        """Vigia a pasta e as subpastas, e marca os arquivos já existentes como pendentes"""
+        try:
+            wd = self.inotify.adicionar(pasta)
+        except OSError as e:
+            print(f"   ⚠️  Não foi possível vigiar {pasta}: {e}", file=sys.stderr)
+            return
+        self._pastas[wd] = pasta
+
+        # Arquivos criados antes do watch existir não geram evento
+        try:
+            with os.scandir(pasta) as it:
+                entradas = list(it)
+        except OSError:
+            return
+        for entrada in entradas:
+            if self._ignorar(entrada.name):
+                continue
+            try:
+                if entrada.is_dir(follow_symlinks=False):
+                    if entrada.name not in self.excluir:
+                        self._vigiar_arvore(entrada.path)
+                elif entrada.is_file():
+                    self._marcar(entrada.path)
+            except OSError:
+                continue
+
+    def _marcar(self, caminho: str):
+        """Registra atividade num arquivo (reinicia a espera)"""
+        try:
+            st = os.stat(caminho)
+            assinatura = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            assinatura = None
+        self._pendentes[caminho] = (time.monotonic(), assinatura)
+
+    def _tratar(self, wd: int, mascara: int, nome: str):
+        if mascara & IN_Q_OVERFLOW:
+            # Fila do kernel estourou: eventos perdidos, revarrer tudo
+            print("   ⚠️  Muitos eventos de uma vez; varrendo a pasta de novo", file=sys.stderr)
+            for wd_antigo in list(self._pastas):
+                self.inotify.remover(wd_antigo)
+            self._pastas.clear()
+            self._vigiar_arvore(str(self.raiz))
+            return
+
+        if mascara & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+            # Pasta apagada ou movida para outro lugar: o caminho guardado não vale mais
+            if mascara & IN_MOVE_SELF:
+                self.inotify.remover(wd)
+            self._pastas.pop(wd, None)
+            return
+
+        pasta = self._pastas.get(wd)
+        if pasta is None or not nome or self._ignorar(nome):
+            return
+        caminho = os.path.join(pasta, nome)
+
+        if mascara & IN_ISDIR:
+            if mascara & (IN_CREATE | IN_MOVED_TO) and nome not in self.excluir:
+                self._vigiar_arvore(caminho)
+        elif mascara & (IN_DELETE | IN_MOVED_FROM):
+            self._pendentes.pop(caminho, None)
+        else:
+            self._marcar(caminho)
+
+    def _prontos(self) -> List[Path]:
+        """Arquivos quietos há `espera` segundos e com tamanho/mtime estáveis"""
+        agora = time.monotonic()
+        prontos = []
+        for caminho, (ultimo, assinatura) in list(self._pendentes.items()):
+            if agora - ultimo < self.espera:
+                continue
+            try:
+                st = os.stat(caminho)
+            except OSError:
+                del self._pendentes[caminho]
+                continue
+            if (st.st_size, st.st_mtime_ns) != assinatura:
+                # Ainda mudando sem gerar evento (ex.: rede): esperar mais
+                self._pendentes[caminho] = (agora, (st.st_size, st.st_mtime_ns))
+                continue
+            del self._pendentes[caminho]
+            prontos.append(Path(caminho))
+        return prontos
+
+    def executar(self, duracao: Optional[float] = None):
+        """Vigia até Ctrl-C (ou por duracao segundos)"""
+        fim = None if duracao is None else time.monotonic() + duracao
+        self._vigiar_arvore(str(self.raiz))
+        try:
+            while fim is None or time.monotonic() < fim:
+                # Sem pendentes, bloqueia até o próximo evento (CPU parada)
+                timeout = min(self.espera / 2, 0.25) if self._pendentes else None
+                if fim is not None:
+                    restante = max(fim - time.monotonic(), 0)
+                    timeout = restante if timeout is None else min(timeout, restante)
+                for wd, mascara, nome in self.inotify.ler(timeout):
+                    self._tratar(wd, mascara, nome)
+
+                prontos = self._prontos()
+                for inicio in range(0, len(prontos), self.lote_max):
+                    self.ao_chegar(prontos[inicio:inicio + self.lote_max])
+        finally:
+            self.inotify.fechar()